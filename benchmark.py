@@ -0,0 +1,327 @@
+'''
+Offline benchmark suite.
+
+Builds synthetic training tables of several sizes (same columns as data.csv) and
+times every stage of the pipeline: reading the CSV, feature engineering,
+training, loading the model and predicting. Nothing touches the NBA API.
+Results are written as JSON so runs from different commits can be compared:
+
+    python benchmark.py --sizes 1000 100000 --output bench_results.json
+    python benchmark.py --sizes 1000 100000 --baseline old_results.json
+    python benchmark.py --startup
+'''
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+import contributions
+from flat_ensemble import read_flat_model
+import model
+from roster_tensor import load_roster_tensor
+import season_sim
+
+
+#Typical per-game ranges (low, high) used to draw synthetic player stats
+STAT_RANGES = {
+    "GP": (20, 82),
+    "MIN": (12, 38),
+    "PTS": (4, 30),
+    "AST": (0.5, 9),
+    "REB": (1.5, 12),
+    "STL": (0.2, 2),
+    "BLK": (0.1, 2.5),
+    "TOV": (0.5, 4),
+    "FGM": (1.5, 10),
+    "FGA": (4, 20),
+    "FG3M": (0, 4),
+    "FG3A": (0, 10),
+    "FTM": (0.5, 7),
+    "FTA": (0.7, 8),
+}
+
+
+def make_synthetic_dataset(n_rows: int, players_per_roster: int = 5, seed: int = 0) -> pd.DataFrame:
+    """Random team rows with data.csv's layout, with wins loosely driven by the stats"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        "TeamName": [f"Team {i % 30}" for i in range(n_rows)],
+        "Season": [f"{2000 + (i // 30) % 25}-{str(2001 + (i // 30) % 25)[-2:]}" for i in range(n_rows)],
+    }
+
+    strength = np.zeros(n_rows)
+    player_cols = {}
+    for i in range(1, players_per_roster + 1):
+        player_cols[f"P{i}_NAME"] = np.array([f"Player {i}"] * n_rows, dtype=object)
+        for stat, (low, high) in STAT_RANGES.items():
+            values = rng.uniform(low, high, n_rows).round(1)
+            player_cols[f"P{i}_{stat}"] = values
+            if stat in ("PTS", "AST", "REB"):
+                strength += (values - low) / (high - low)
+
+    wins = 41 + 12 * (strength - strength.mean()) / strength.std() + rng.normal(0, 6, n_rows)
+    columns["Wins"] = np.clip(wins, 5, 75).round()
+    columns.update(player_cols)
+    return pd.DataFrame(columns)
+
+
+def time_call(fn: Callable, repeats: int = 3) -> dict:
+    """Runs fn `repeats` times and returns min/median wall-clock seconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "repeats": repeats,
+    }
+
+
+def run_size(n_rows: int, workdir: str, repeats: int, train_max_rows: int, train_mode: str,
+             train_budget: float) -> List[dict]:
+    """Benchmarks every stage on one synthetic dataset size"""
+    results = []
+
+    def record(name, timing, **extra):
+        entry = {"benchmark": name, "rows": n_rows, **timing, **extra}
+        results.append(entry)
+        print(f"  {name:<28} {entry['seconds_min']:10.4f}s (min of {entry['repeats']})")
+
+    print(f"\n{n_rows} team-rows")
+    data_path = os.path.join(workdir, f"data_{n_rows}.csv")
+    make_synthetic_dataset(n_rows).to_csv(data_path, index=False)
+
+    #Ingestion
+    record("read_csv", time_call(lambda: pd.read_csv(data_path), repeats))
+    df = pd.read_csv(data_path)
+
+    #Feature engineering
+    record("compute_advanced_metrics", time_call(lambda: model.compute_advanced_metrics(df.copy()), repeats))
+    record("compute_team_features", time_call(lambda: model.compute_team_features(df.copy()), repeats))
+
+    #Same features from the float32 tensor form
+    tensor = load_roster_tensor(data_path)
+    record("load_roster_tensor", time_call(lambda: load_roster_tensor(data_path), repeats),
+           tensor_bytes=tensor.nbytes, frame_bytes=int(df.memory_usage(deep=True).sum()))
+    record("compute_team_features_tensor", time_call(lambda: model.compute_team_features(tensor), repeats))
+
+    #Cached feature matrix: first call builds the cache entry, the rest are hits
+    feature_cache = os.path.join(workdir, "features")
+    record("load_training_matrix_cold", time_call(
+        lambda: model.load_training_matrix(data_path, cache_dir=feature_cache, use_cache=False), 1
+    ))
+    model.load_training_matrix(data_path, cache_dir=feature_cache)
+    record("load_training_matrix_cached", time_call(
+        lambda: model.load_training_matrix(data_path, cache_dir=feature_cache), repeats
+    ))
+
+    #Training (only on sizes small enough to be practical)
+    if n_rows > train_max_rows:
+        print(f"  train_model                  skipped (> {train_max_rows} rows)")
+        return results
+
+    model_path = os.path.join(workdir, f"win_model_{n_rows}.pkl")
+    report = {}
+
+    def train():
+        report.update(model.train_model(
+            data_path=data_path, model_path=model_path, mode=train_mode, time_budget=train_budget,
+            use_feature_cache=False,
+        ))
+
+    record("train_model", time_call(train, 1), mode=train_mode)
+    results[-1]["search_seconds"] = report["phases"]["search"]
+
+    #Cold load (registry cleared every time) and warm load
+    def cold_load():
+        model.get_registry().clear()
+        model.load_model(model_path)
+
+    record("load_model_cold", time_call(cold_load, repeats))
+    record("load_model_warm", time_call(lambda: model.load_model(model_path), repeats))
+
+    #Inference
+    fitted, feature_cols, alpha, beta = model.load_model(model_path)
+    X = model.compute_team_features(df.copy())[feature_cols].astype(float)
+    single = X.iloc[[0]]
+    batch = X.iloc[:min(len(X), 100_000)]
+
+    record("predict_single_row", time_call(lambda: fitted.predict(single), max(repeats, 20)))
+    record("predict_batch", time_call(lambda: fitted.predict(batch), repeats), batch_rows=len(batch))
+
+    #Same predictions through the flat NumPy export
+    flat = read_flat_model(model.export_flat_model(model_path))
+    single_array, batch_array = single.to_numpy(), batch.to_numpy()
+    record("predict_single_row_flat", time_call(lambda: flat.predict(single_array), max(repeats, 20)))
+    record("predict_batch_flat", time_call(lambda: flat.predict(batch_array), repeats), batch_rows=len(batch))
+
+    #League season simulation, 30 teams
+    league_wins = np.linspace(20, 62, 30)
+    record("simulate_10k_seasons", time_call(
+        lambda: season_sim.simulate_seasons(league_wins, [f"team_{i}" for i in range(30)], n_seasons=10_000), repeats
+    ), teams=30, seasons=10_000)
+
+    #Per-roster explanations (tree contributions), on up to 10k rows
+    if contributions.supports_contributions(fitted):
+        explain_rows = batch.iloc[:10_000]
+        record("feature_contributions", time_call(
+            lambda: contributions.tree_contributions(fitted, explain_rows), repeats
+        ), batch_rows=len(explain_rows))
+
+    return results
+
+
+#Time-to-menu budget for `python main.py` (interpreter start, imports, menu, quit)
+STARTUP_TARGET_MS = 150
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Parses `python -X importtime` output into [{"module", "self_us", "cumulative_us"}]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append({
+            "module": module.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return rows
+
+
+def measure_startup(repeats: int = 5, target_ms: float = STARTUP_TARGET_MS) -> dict:
+    """
+    Time-to-menu for main.py: starts `python main.py`, answers "q" at the menu
+    and takes the fastest wall-clock time of `repeats` runs. A separate
+    `-X importtime` run lists the slowest imports under main.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script], input="q\n", capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+
+    profile = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, cwd=os.path.dirname(script), check=True,
+    )
+    imports = parse_importtime(profile.stderr)
+    main_import = next((row for row in imports if row["module"] == "main"), None)
+    slowest = sorted(imports, key=lambda row: row["self_us"], reverse=True)[:10]
+
+    return {
+        "benchmark": "startup_time_to_menu",
+        "rows": 0,
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "repeats": repeats,
+        "import_main_seconds": main_import["cumulative_us"] / 1e6 if main_import else None,
+        "target_seconds": target_ms / 1000,
+        "within_target": min(times) * 1000 <= target_ms,
+        "slowest_imports": slowest,
+    }
+
+
+def print_startup(result: dict):
+    status = "OK" if result["within_target"] else "OVER TARGET"
+    print(
+        f"\nStartup: time-to-menu {result['seconds_min'] * 1000:.0f} ms "
+        f"(import main {result['import_main_seconds'] * 1000:.0f} ms, "
+        f"target {result['target_seconds'] * 1000:.0f} ms) {status}"
+    )
+    for row in result["slowest_imports"][:5]:
+        print(f"  {row['module']:<40} {row['self_us'] / 1000:8.1f} ms self")
+
+
+def environment_info() -> dict:
+    """Versions and commit, so results from different machines/commits can be told apart"""
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def compare_to_baseline(results: List[dict], baseline_path: str, threshold: float = 1.2):
+    """Prints each benchmark's ratio to a previous run and flags slowdowns above threshold"""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    previous = {(r["benchmark"], r["rows"]): r["seconds_min"] for r in baseline["results"]}
+    print(f"\nCompared to {baseline_path} (commit {baseline['environment'].get('commit')}):")
+    regressions = 0
+    for r in results:
+        old = previous.get((r["benchmark"], r["rows"]))
+        if not old:
+            continue
+        ratio = r["seconds_min"] / old
+        flag = "  <-- REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"  {r['benchmark']:<28} {r['rows']:>9} rows  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--train-max-rows", type=int, default=100_000, help="Skip training above this size")
+    parser.add_argument("--train-mode", choices=["fast", "full"], default="fast")
+    parser.add_argument("--train-budget", type=float, default=None, help="Search time budget in seconds")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--startup", action="store_true",
+                        help="Only run the time-to-menu benchmark (exit code 1 when over target)")
+    parser.add_argument("--startup-target-ms", type=float, default=STARTUP_TARGET_MS)
+    args = parser.parse_args(argv)
+
+    startup = measure_startup(target_ms=args.startup_target_ms)
+    print_startup(startup)
+    if args.startup:
+        return 0 if startup["within_target"] else 1
+
+    results = [startup]
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.sizes:
+            results += run_size(n_rows, workdir, args.repeats, args.train_max_rows, args.train_mode, args.train_budget)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment_info(), "results": results}, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        return 1 if compare_to_baseline(results, args.baseline) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
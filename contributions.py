@@ -0,0 +1,139 @@
+'''
+Per-roster feature contributions for the gradient boosting models.
+
+For every prediction, the model output is split into a bias (the average
+prediction) plus one additive contribution per feature, following each tree's
+decision path (Saabas-style tree contributions): every split a roster passes
+through moves the running node value, and that change is credited to the
+feature the split was on. Summed over the path and over all trees:
+
+    prediction = bias + contributions.sum(axis=1)
+
+Everything is vectorized: the per-node value changes of all trees are packed
+into one sparse (nodes x features) table once per model, the decision paths of
+a batch are one sparse (rows x nodes) matrix, and the contributions are their
+product. Thousands of rosters are explained in one call.
+
+HistGradientBoostingRegressor models and the flat NumPy export
+(flat_ensemble.FlatEnsemble) get the same contributions from a walk over the
+flat node arrays, so every engine explains a roster the same way.
+'''
+import weakref
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+#Packed path tables per fitted model, built on first use
+_tables = weakref.WeakKeyDictionary()
+
+
+def _is_gbr(model) -> bool:
+    """Fitted GradientBoostingRegressor-style model (estimators_ of DecisionTreeRegressors)"""
+    return hasattr(model, "estimators_") and hasattr(model, "learning_rate")
+
+
+def supports_contributions(model) -> bool:
+    """True for fitted GradientBoostingRegressor/HistGradientBoostingRegressor models and flat exports with node values"""
+    return _is_gbr(model) or hasattr(model, "_predictors") or getattr(model, "supports_contributions", False)
+
+
+def _build_table(model):
+    """
+    Packs every tree into one sparse (total_nodes x n_features) table holding
+    learning_rate * (value[node] - value[parent]) in the column of the parent's
+    split feature, plus the constant part of the prediction.
+    """
+    from scipy.sparse import csr_matrix
+
+    trees = [est.tree_ for est in np.ravel(model.estimators_)]
+    n_features = model.n_features_in_
+
+    rows, cols, deltas = [], [], []
+    offset = 0
+    root_total = 0.0
+    for tree in trees:
+        value = tree.value[:, 0, 0]
+        left, right = tree.children_left, tree.children_right
+
+        parent = np.full(tree.node_count, -1, dtype=np.int64)
+        internal = np.flatnonzero(left >= 0)
+        parent[left[internal]] = internal
+        parent[right[internal]] = internal
+
+        child = np.flatnonzero(parent >= 0)
+        rows.append(child + offset)
+        cols.append(tree.feature[parent[child]])
+        deltas.append(value[child] - value[parent[child]])
+
+        root_total += value[0]
+        offset += tree.node_count
+
+    table = csr_matrix(
+        (model.learning_rate * np.concatenate(deltas), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(offset, n_features),
+    )
+
+    #Constant part: the init estimator's prediction plus every tree's root value
+    if isinstance(model.init_, str) and model.init_ == "zero":
+        init = 0.0
+    else:
+        init = float(np.ravel(model.init_.predict(np.zeros((1, n_features))))[0])
+    bias = init + model.learning_rate * root_total
+
+    return trees, table, bias
+
+
+def _get_table(model):
+    entry = _tables.get(model)
+    if entry is None:
+        entry = _tables[model] = _build_table(model)
+    return entry
+
+
+def _get_flat(model):
+    """A HistGradientBoostingRegressor flattened once (see flat_ensemble.py)"""
+    from flat_ensemble import FlatEnsemble, flatten_ensemble
+
+    flat = _tables.get(model)
+    if flat is None:
+        flat = _tables[model] = FlatEnsemble(flatten_ensemble(model), [])
+    return flat
+
+
+def tree_contributions(model, X) -> Tuple[np.ndarray, float]:
+    """
+    Returns (contributions, bias) for a batch: contributions is (rows x features)
+    in raw model units, and bias + contributions.sum(axis=1) == model.predict(X).
+    """
+    if not _is_gbr(model):
+        flat = model if hasattr(model, "contributions") else _get_flat(model)
+        return flat.contributions(X)
+
+    from scipy.sparse import hstack
+
+    trees, table, bias = _get_table(model)
+
+    #The trees compare in float32, so the paths have to be computed on float32 input
+    X32 = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    paths = hstack([tree.decision_path(X32) for tree in trees], format="csr")
+
+    contributions = paths @ table
+    return np.asarray(contributions.todense()), bias
+
+
+def feature_contributions(model, feature_cols, X, alpha: float = 0.0, beta: float = 1.0) -> Optional[pd.DataFrame]:
+    """
+    Per-roster contributions as a DataFrame (one row per roster, one column per
+    feature) in calibrated wins, i.e. scaled by beta. Its attrs["bias"] holds
+    the calibrated bias. Returns None for models without tree contributions.
+    """
+    if not supports_contributions(model):
+        return None
+
+    contributions, bias = tree_contributions(model, X)
+    index = X.index if hasattr(X, "index") else None
+    df = pd.DataFrame(beta * contributions, columns=list(feature_cols), index=index)
+    df.attrs["bias"] = alpha + beta * bias
+    return df
@@ -1,6 +1,14 @@
+import argparse
+import json
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 from nba_api.stats.endpoints import leaguedashteamstats, leaguedashplayerstats
+import tracing
 
 
 #Function that Fetches all data for a given season
@@ -40,113 +48,285 @@ def get_player_season_stats(season: str, timeout: int = 60) -> pd.DataFrame:
     #Return data frame
     return df
 
-#Helper Function to build a row of the CSV
-def build_feature_row(season: str, team_row: pd.Series, starters_df: pd.DataFrame) -> dict:
+class RateLimiter:
+    """
+    Token bucket shared by every fetch thread.
+    Allows `rate` calls per second on average with bursts of up to `burst` calls.
+    """
 
-    #Extract team name and wins
-    team_name = team_row["TEAM_NAME"]
-    wins = team_row["W"]
+    def __init__(self, rate: float = 1.0, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
 
-    #initailize row
-    row = {
-        "TeamName": team_name,
-        "Season": season,
-        "Wins": wins,
-    }
-
-    #stats we care about per player
-    stat_cols = {
-        "GP": "GP",
-        "MIN": "MIN",
-        "PTS": "PTS",
-        "AST": "AST",
-        "REB": "REB",
-        "STL": "STL",
-        "BLK": "BLK",
-        "TOV": "TOV",
-        # Advanced shooting stats for efficiency metrics
-        "FGM": "FGM",
-        "FGA": "FGA",
-        "FG3M": "FG3M",
-        "FG3A": "FG3A",
-        "FTM": "FTM",
-        "FTA": "FTA",
-    }
-
-    # Ensure we always have exactly 5 slots: if fewer than 5 players, pad with NaN
-    starters_df = starters_df.copy()
-    if len(starters_df) < 5:
-        # pad with empty rows
-        for _ in range(5 - len(starters_df)):
-            starters_df = pd.concat(
-                [starters_df, pd.Series(dtype=object).to_frame().T],
-                ignore_index=True,
-            )
-
-    # Fill P1_*, P2_*, ..., P5_* columns
-    for i, (_, p) in enumerate(starters_df.iterrows(), start=1):
-        prefix = f"P{i}_"
-        row[prefix + "NAME"] = p.get("PLAYER_NAME", None)
-
-        for stat_key, col in stat_cols.items():
-            row[prefix + stat_key] = p.get(col, None)
-
-        if i == 5:
-            break
-
-    #Return the row
-    return row
+    def acquire(self):
+        """Blocks until a token is available, then takes it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
 
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
 
-# Main Function Build the Dataset and save to the CSV provided
-def build_dataset(filename: str, year_start: int, year_end: int, players_per_roster: int):
+                wait = (1.0 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def call_with_retries(fetch: Callable, *args, limiter: RateLimiter = None, retries: int = 4,
+                      base_delay: float = 1.0, max_delay: float = 30.0, **kwargs):
     """
-    Build the full dataset for multiple seasons and save to CSV.
+    Calls fetch(*args, **kwargs) through the rate limiter, retrying failures with
+    exponential backoff and full jitter. Re-raises the last error once retries run out.
     """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
 
-    #Initialize list of seasons based on provided years
-    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(year_start, year_end)]
+        try:
+            tracing.incr("api_calls")
+            with tracing.span(f"api.{getattr(fetch, '__name__', 'fetch')}", attempt=attempt):
+                return fetch(*args, **kwargs)
+        except Exception as e:
+            if attempt == retries:
+                raise
 
-    all_rows = []
+            tracing.incr("api_retries")
 
-    #Iterate over each season
-    for season in seasons:
-        print(f"\nProcessing season: {season}")
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            print(f"WARNING - {getattr(fetch, '__name__', 'fetch')}{args} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def fetch_seasons(seasons: List[str], workers: int = 1, rate: float = 1.0, retries: int = 4,
+                  team_fetcher: Callable = get_team_season_stats,
+                  player_fetcher: Callable = get_player_season_stats,
+                  on_fetched: Optional[Callable] = None) -> Dict[str, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Fetches (team_df, player_df) for every season using a pool of `workers` threads.
+
+    All threads share one token bucket so the API sees at most `rate` calls per second.
+    The fetchers can be swapped for a local stand-in (any function season -> DataFrame).
+    When on_fetched is given it is called with (season, team_df, player_df) as soon as
+    each season arrives, and its return value is stored instead of the DataFrames.
+    """
+    #No burst: extra workers overlap slow responses, they don't add calls per second
+    limiter = RateLimiter(rate=rate, burst=1)
+
+    def fetch_one(season):
+        team_df = call_with_retries(team_fetcher, season, limiter=limiter, retries=retries)
+        player_df = call_with_retries(player_fetcher, season, limiter=limiter, retries=retries)
+        if on_fetched is not None:
+            return on_fetched(season, team_df, player_df)
+        return team_df, player_df
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = pool.map(fetch_one, seasons)
+        return dict(zip(seasons, results))
+
+
+#stats we care about per player
+PLAYER_STAT_COLS = [
+    "GP", "MIN", "PTS", "AST", "REB", "STL", "BLK", "TOV",
+    # Advanced shooting stats for efficiency metrics
+    "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA",
+]
+
+
+#Helper Function that builds every team row (one CSV row per team) for one season
+def build_season_rows(season: str, team_df: pd.DataFrame, player_df: pd.DataFrame,
+                      players_per_roster: int) -> pd.DataFrame:
+    """
+    Turns a season's team and player tables into wide rows:
+    TeamName, Season, Wins, then P1_NAME, P1_GP, ... for the top `players_per_roster`
+    players by minutes. Done with one sort/rank/pivot over the whole player table;
+    short rosters are padded with NaN.
+    """
+    slot_cols = ["NAME"] + PLAYER_STAT_COLS
+
+    #Rank every player within their team by minutes played
+    ranked = player_df.reindex(columns=["TEAM_ID", "PLAYER_NAME"] + PLAYER_STAT_COLS)
+    ranked = ranked[ranked["TEAM_ID"].isin(team_df["TEAM_ID"])]
+    ranked = ranked.sort_values(["TEAM_ID", "MIN"], ascending=[True, False], kind="stable")
+    ranked["SLOT"] = ranked.groupby("TEAM_ID").cumcount() + 1
+    ranked = ranked[ranked["SLOT"] <= players_per_roster].rename(columns={"PLAYER_NAME": "NAME"})
+
+    #One row per team, one column per (slot, stat)
+    wide = ranked.pivot(index="TEAM_ID", columns="SLOT", values=slot_cols)
+    slots = range(1, players_per_roster + 1)
+    wide = wide.reindex(columns=[(stat, slot) for slot in slots for stat in slot_cols])
+    wide.columns = [f"P{slot}_{stat}" for stat, slot in wide.columns]
+
+    #Edge case for teams with no player data
+    missing = team_df[~team_df["TEAM_ID"].isin(wide.index)]
+    for team_name in missing["TEAM_NAME"]:
+        print(f"No player stats for {team_name} in {season}, skipping row")
+
+    teams = team_df[team_df["TEAM_ID"].isin(wide.index)]
+    rows = pd.DataFrame({
+        "TeamName": teams["TEAM_NAME"].to_numpy(),
+        "Season": season,
+        "Wins": teams["W"].to_numpy(),
+    })
+    tracing.incr("rows_processed", len(rows))
+    return pd.concat([rows, wide.loc[teams["TEAM_ID"]].reset_index(drop=True)], axis=1)
+
+
+def season_checkpoint_path(checkpoint_dir: str, season: str, players_per_roster: int) -> str:
+    """Where one season's rows are checkpointed"""
+    return os.path.join(checkpoint_dir, f"{season}_p{players_per_roster}.csv")
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str):
+    """Writes to a temp file and renames it, so a crash never leaves a half-written file"""
+    tmp_path = path + ".tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def assemble_dataset(filename: str, checkpoint_dir: str, seasons: List[str], players_per_roster: int,
+                     changed: Iterable[str] = ()):
+    """
+    Builds the training CSV from the season checkpoints.
+
+    If the existing CSV already holds an unchanged prefix of the seasons (according to
+    the manifest written last time), only the new seasons are appended to it.
+    Otherwise the CSV is rebuilt from every checkpoint.
+    """
+    manifest_path = os.path.join(checkpoint_dir, "manifest.json")
+    changed = set(changed)
+
+    manifest = None
+    if os.path.exists(manifest_path) and os.path.exists(filename):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+    #Can we just append? The CSV must be exactly what we wrote last time
+    done = []
+    if manifest is not None:
+        stat = os.stat(filename)
+        same_file = manifest.get("file") == os.path.abspath(filename) and manifest.get("size") == stat.st_size \
+            and manifest.get("mtime_ns") == stat.st_mtime_ns and manifest.get("players_per_roster") == players_per_roster
+        prefix = manifest.get("seasons", [])
+        if same_file and prefix == seasons[:len(prefix)] and not changed.intersection(prefix):
+            done = prefix
+
+    new_seasons = seasons[len(done):]
+    frames = [
+        pd.read_csv(season_checkpoint_path(checkpoint_dir, season, players_per_roster))
+        for season in new_seasons
+    ]
+
+    if done:
+        with open(filename, "r") as f:
+            header = f.readline().strip().split(",")
+        if any(list(frame.columns) != header for frame in frames):
+            done, new_seasons = [], seasons
+            frames = [
+                pd.read_csv(season_checkpoint_path(checkpoint_dir, season, players_per_roster))
+                for season in seasons
+            ]
+
+    if done:
+        if frames:
+            pd.concat(frames, ignore_index=True).to_csv(filename, mode="a", header=False, index=False)
+        print(f"\nAppended {len(new_seasons)} season(s) to {filename}")
+    else:
+        write_csv_atomic(pd.concat(frames, ignore_index=True), filename)
+        print(f"\nRebuilt {filename} from {len(seasons)} season checkpoint(s)")
+
+    stat = os.stat(filename)
+    with open(manifest_path, "w") as f:
+        json.dump({
+            "file": os.path.abspath(filename),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "players_per_roster": players_per_roster,
+            "seasons": seasons,
+        }, f, indent=2)
 
-        # 1) Team stats for this season (includes wins)
-        team_df = get_team_season_stats(season)
-        time.sleep(1.0)  #Rate Limiting Avoidence
 
-        # 2) Player stats for this season
-        player_df = get_player_season_stats(season)
-        time.sleep(1.0)  #Rate Limiting Avoidence
+# Main Function Build the Dataset and save to the CSV provided
+def build_dataset(filename: str, year_start: int, year_end: int, players_per_roster: int,
+                  workers: int = 1, rate: float = 1.0, retries: int = 4,
+                  team_fetcher: Callable = get_team_season_stats,
+                  player_fetcher: Callable = get_player_season_stats,
+                  checkpoint_dir: str = "season_data", invalidate: Iterable[str] = ()):
+    """
+    Build the full dataset for multiple seasons and save to CSV.
 
-        #iterate over each team in this season
-        for _, team_row in team_df.iterrows():
-            #Extract team name and ID
-            team_id = team_row["TEAM_ID"]
-            team_name = team_row["TEAM_NAME"]
+    Each season is checkpointed to its own file in checkpoint_dir as soon as it is
+    fetched, so only missing seasons (or ones listed in `invalidate`, "all" for
+    every season) are fetched, and a crashed build picks up where it left off.
+    Seasons are fetched by `workers` threads sharing a `rate` calls/second limit,
+    and failed calls are retried with backoff instead of aborting the run.
+    """
 
-            #Filter to players on this team
-            team_players = player_df[player_df["TEAM_ID"] == team_id]
+    #Initialize list of seasons based on provided years
+    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(year_start, year_end)]
 
-            #Edge case for empty data
-            if team_players.empty:
-                print(f"No player stats for {team_name} in {season}, skipping row")
-                continue
+    os.makedirs(checkpoint_dir, exist_ok=True)
 
-            #Select the top X amount of players per roster to be included
-            starters = team_players.sort_values("MIN", ascending=False).head(players_per_roster)
+    #Drop checkpoints that were explicitly invalidated
+    invalidate = seasons if invalidate == "all" else list(invalidate)
+    for season in invalidate:
+        path = season_checkpoint_path(checkpoint_dir, season, players_per_roster)
+        if os.path.exists(path):
+            os.remove(path)
 
-            #Call to helper and append
-            feature_row = build_feature_row(season, team_row, starters)
-            all_rows.append(feature_row)
+    missing = [
+        season for season in seasons
+        if not os.path.exists(season_checkpoint_path(checkpoint_dir, season, players_per_roster))
+    ]
+    print(f"{len(seasons) - len(missing)} season(s) already checkpointed, fetching {len(missing)}")
 
-    #Convert to DataFrame and save
-    out_df = pd.DataFrame(all_rows)
-    out_df.to_csv(filename, index=False)
-    print(f"\nSaved {len(out_df)} rows to {filename}")
+    def save_season(season, team_df, player_df):
+        print(f"\nProcessing season: {season}")
+        rows = build_season_rows(season, team_df, player_df, players_per_roster)
+        write_csv_atomic(rows, season_checkpoint_path(checkpoint_dir, season, players_per_roster))
+        return len(rows)
+
+    #Fetch, build and checkpoint each missing season
+    fetch_seasons(
+        missing,
+        workers=workers,
+        rate=rate,
+        retries=retries,
+        team_fetcher=team_fetcher,
+        player_fetcher=player_fetcher,
+        on_fetched=save_season,
+    )
+
+    #Put the training table together from the checkpoints
+    assemble_dataset(filename, checkpoint_dir, seasons, players_per_roster, changed=missing)
 
 
 if __name__ == "__main__":
-    build_dataset(filename="data.csv", year_start=2001, year_end=2025, players_per_roster=5)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build the season dataset from stats.nba.com")
+    parser.add_argument("--output", default="data.csv")
+    parser.add_argument("--start", type=int, default=2001, help="First season start year")
+    parser.add_argument("--end", type=int, default=2025, help="Last season start year (exclusive)")
+    parser.add_argument("--players", type=int, default=5, help="Players per roster")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent fetch threads")
+    parser.add_argument("--rate", type=float, default=1.0, help="Max API calls per second across all threads")
+    parser.add_argument("--retries", type=int, default=4, help="Retries per API call")
+    parser.add_argument("--checkpoint-dir", default="season_data", help="Where per-season checkpoints are kept")
+    parser.add_argument("--invalidate", nargs="*", default=[], help="Seasons to refetch (e.g. 2024-25), or 'all'")
+    args = parser.parse_args()
+
+    build_dataset(
+        filename=args.output,
+        year_start=args.start,
+        year_end=args.end,
+        players_per_roster=args.players,
+        workers=args.workers,
+        rate=args.rate,
+        retries=args.retries,
+        checkpoint_dir=args.checkpoint_dir,
+        invalidate="all" if args.invalidate == ["all"] else args.invalidate,
+    )
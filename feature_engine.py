@@ -0,0 +1,249 @@
+'''
+Vectorized team-feature engine.
+
+Works on a (rows x players x stats) array instead of a wide DataFrame, so every
+team aggregate is a handful of NumPy reductions. compute_team_features in
+model.py is a thin DataFrame wrapper around this, and anything that scores
+lots of candidate rosters (search, simulation) can call it directly.
+Only needs NumPy.
+'''
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+
+#Player stat features (I took out games played because it seemed to create strange predictions)
+FEATURE_STATS = ["MIN", "PTS", "AST", "REB", "STL", "BLK", "TOV"]
+
+#Advanced shooting stats for efficiency metrics
+SHOOTING_STATS = ["FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
+
+#Efficiency metrics derived from the shooting stats
+ADVANCED_STATS = ["EFG", "TS"]
+
+#How many players count towards the "star power" TOP2 features
+TOP_K = 2
+
+
+def effective_fg(fgm, fga, fg3m):
+    """eFG% = (FGM + 0.5 * FG3M) / FGA, 0 when there are no attempts, NaN when they're missing"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((fga > 0) | np.isnan(fga), (fgm + 0.5 * fg3m) / fga, 0.0)
+
+
+def true_shooting(pts, fga, fta):
+    """TS% = PTS / (2 * (FGA + 0.44 * FTA)), 0 when there are no attempts, NaN when they're missing"""
+    attempts = fga + 0.44 * fta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((attempts > 0) | np.isnan(attempts), pts / (2 * attempts), 0.0)
+
+
+def add_advanced_stats(values: np.ndarray, stat_names: Sequence[str]):
+    """
+    Appends EFG/TS to the stat axis when they can be derived from the shooting stats.
+    Returns (values, stat_names).
+    """
+    stat_names = list(stat_names)
+    index = {stat: j for j, stat in enumerate(stat_names)}
+    extra = []
+
+    if "EFG" not in index and all(s in index for s in ("FGM", "FGA", "FG3M")):
+        extra.append(("EFG", effective_fg(
+            values[..., index["FGM"]], values[..., index["FGA"]], values[..., index["FG3M"]]
+        )))
+
+    if "TS" not in index and all(s in index for s in ("PTS", "FGA", "FTA")):
+        extra.append(("TS", true_shooting(
+            values[..., index["PTS"]], values[..., index["FGA"]], values[..., index["FTA"]]
+        )))
+
+    if not extra:
+        return values, stat_names
+
+    stacked = np.stack([arr.astype(values.dtype, copy=False) for _, arr in extra], axis=-1)
+    return np.concatenate([values, stacked], axis=-1), stat_names + [name for name, _ in extra]
+
+
+def team_feature_names(stat_names: Sequence[str]) -> List[str]:
+    """The TEAM_* columns produced for the given stats, in the same order as compute_team_features"""
+    available = set(stat_names)
+    names = []
+
+    for stat in FEATURE_STATS:
+        if stat not in available:
+            continue
+        names += [f"TEAM_AVG_{stat}", f"TEAM_TOTAL_{stat}", f"TEAM_TOP2_{stat}"]
+        if stat != "MIN" and "MIN" in available:
+            names.append(f"TEAM_AVG_{stat}_P36")
+
+    for adv_stat in ADVANCED_STATS:
+        if adv_stat in available:
+            names += [f"TEAM_AVG_{adv_stat}", f"TEAM_TOTAL_{adv_stat}", f"TEAM_TOP2_{adv_stat}"]
+
+    return names
+
+
+def top_k_sum(values: np.ndarray, k: int = TOP_K) -> np.ndarray:
+    """
+    Sum of the k largest values along the player axis (axis 1), ignoring NaN.
+    Works on (rows, players) or (rows, players, stats) arrays.
+    """
+    n_players = values.shape[1]
+    filled = np.where(np.isnan(values), -np.inf, values)
+
+    if k < n_players:
+        filled = np.partition(filled, n_players - k, axis=1)[:, n_players - k:]
+
+    return np.where(np.isinf(filled), 0.0, filled).sum(axis=1)
+
+
+def compute_team_feature_arrays(values: np.ndarray, stat_names: Sequence[str],
+                                top_k: int = TOP_K, mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Computes every TEAM_* aggregate for a (rows x players x stats) array.
+
+    Padded/missing players are NaN and are skipped the same way pandas skips
+    them (averages over the players present, totals treat them as 0). EFG/TS are
+    derived from the shooting stats when they aren't already on the stat axis.
+    mask (rows x players, True where a player fills the slot) keeps the EFG/TS
+    of empty slots out of the aggregates too, they would count as 0% otherwise.
+    Returns an ordered dict of column name -> (rows,) array.
+    """
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(np.float64)
+
+    #Only aggregate the stats that become features (shooting stats just feed EFG/TS)
+    values, stat_names = _used_stats(values, stat_names)
+    if mask is not None:
+        values = np.where(np.asarray(mask, dtype=bool)[..., np.newaxis], values, np.nan)
+
+    #All the reductions happen once over the whole array
+    present = ~np.isnan(values)
+    count = present.sum(axis=1)
+    total = np.where(present, values, 0.0).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where(count > 0, total / count, np.nan)
+    top = top_k_sum(values, top_k)
+
+    return _assemble_features(stat_names, total, avg, top)
+
+
+def _assemble_features(stat_names: Sequence[str], total: np.ndarray, avg: np.ndarray,
+                       top: np.ndarray) -> Dict[str, np.ndarray]:
+    """TEAM_* columns from (rows x stats) totals, averages and top-k sums"""
+    index = {stat: j for j, stat in enumerate(stat_names)}
+    total_min = total[:, index["MIN"]] if "MIN" in index else None
+
+    features = {}
+    for name in team_feature_names(stat_names):
+        kind, stat = name[len("TEAM_"):].split("_", 1)
+        if stat.endswith("_P36"):
+            stat = stat[:-len("_P36")]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                features[name] = np.where(
+                    total_min != 0, total[:, index[stat]] / total_min, np.nan
+                ) * 36
+        elif kind == "AVG":
+            features[name] = avg[:, index[stat]]
+        elif kind == "TOTAL":
+            features[name] = total[:, index[stat]]
+        else:
+            features[name] = top[:, index[stat]]
+
+    return features
+
+
+def _used_stats(values: np.ndarray, stat_names: Sequence[str]):
+    """Adds EFG/TS and keeps only the stats that become features. Returns (values, stat_names)."""
+    values, stat_names = add_advanced_stats(values, stat_names)
+    used = [j for j, stat in enumerate(stat_names) if stat in FEATURE_STATS or stat in ADVANCED_STATS]
+    if len(used) < len(stat_names):
+        values = values[..., used]
+        stat_names = [stat_names[j] for j in used]
+    return values, stat_names
+
+
+def partial_team_aggregates(fixed_values: np.ndarray, stat_names: Sequence[str],
+                            top_k: int = TOP_K) -> Dict[str, np.ndarray]:
+    """
+    Precomputes the aggregates of the players that stay on a roster, for
+    swap_feature_matrix. fixed_values is (players x stats), NaN for missing.
+    """
+    values = np.asarray(fixed_values, dtype=np.float64)[np.newaxis]
+    values, stat_names = _used_stats(values, stat_names)
+    values = values[0]
+
+    present = ~np.isnan(values)
+    #Best top_k values per stat, largest first, -inf where there are fewer players
+    top = np.full((top_k, values.shape[1]), -np.inf)
+    ordered = -np.sort(-np.where(present, values, -np.inf), axis=0)[:top_k]
+    top[:len(ordered)] = ordered
+
+    return {
+        "stat_names": list(stat_names),
+        "count": present.sum(axis=0),
+        "total": np.where(present, values, 0.0).sum(axis=0),
+        "top_sum": np.where(np.isinf(top), 0.0, top).sum(axis=0),
+        "top_kth": top[-1],
+    }
+
+
+def swap_feature_matrix(partial: Dict[str, np.ndarray], candidate_values: np.ndarray, stat_names: Sequence[str],
+                        feature_cols: Sequence[str], fill_value: float = 0.0, dtype=np.float64) -> np.ndarray:
+    """
+    (candidates x features) team features of the fixed players (see
+    partial_team_aggregates) plus each candidate, given as (candidates x stats).
+    Same values as team_feature_matrix on the full rosters, but every aggregate is
+    the fixed part updated with one player, so there is no per-roster reduction.
+    """
+    values = np.asarray(candidate_values, dtype=np.float64)[:, np.newaxis]
+    values, _ = _used_stats(values, stat_names)
+    values = values[:, 0]
+
+    present = ~np.isnan(values)
+    count = partial["count"] + present
+    total = partial["total"] + np.where(present, values, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg = np.where(count > 0, total / count, np.nan)
+
+    #The candidate enters the top-k when it beats the k-th best fixed player (or there are fewer than k)
+    kth = partial["top_kth"]
+    gain = np.where(np.isinf(kth), values, np.maximum(values - kth, 0.0))
+    top = partial["top_sum"] + np.where(present, gain, 0.0)
+
+    features = _assemble_features(partial["stat_names"], total, avg, top)
+    out = np.full((len(values), len(feature_cols)), fill_value, dtype=dtype)
+    for j, name in enumerate(feature_cols):
+        if name in features:
+            out[:, j] = features[name]
+    return out
+
+
+def team_feature_matrix(values: np.ndarray, stat_names: Sequence[str], feature_cols: Sequence[str],
+                        fill_value: float = 0.0, dtype=np.float64) -> np.ndarray:
+    """
+    Team features lined up with a model's feature columns, as one (rows x features) array.
+    Columns the stats can't produce are filled with fill_value (like DataFrame.reindex).
+    """
+    features = compute_team_feature_arrays(values, stat_names)
+    out = np.full((values.shape[0], len(feature_cols)), fill_value, dtype=dtype)
+    for j, name in enumerate(feature_cols):
+        if name in features:
+            out[:, j] = features[name]
+    return out
+
+
+def player_columns(n_players: int, stat_names: Sequence[str]) -> List[str]:
+    """Wide P{i}_{stat} column names in player-major order"""
+    return [f"P{i}_{stat}" for i in range(1, n_players + 1) for stat in stat_names]
+
+
+def count_players(columns: Sequence[str], default: Optional[int] = None) -> int:
+    """Number of consecutive P1_, P2_, ... player slots present in the columns"""
+    prefixes = {col.split("_", 1)[0] for col in columns if col.startswith("P") and "_" in col}
+    n_players = 0
+    while f"P{n_players + 1}" in prefixes:
+        n_players += 1
+    if n_players == 0 and default is not None:
+        return default
+    return n_players
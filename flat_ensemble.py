@@ -0,0 +1,289 @@
+'''
+Flat-array tree ensemble for fast inference.
+
+The fitted ensemble (GradientBoostingRegressor or HistGradientBoostingRegressor)
+is flattened into a handful of contiguous arrays over all nodes of all trees:
+
+    feature, threshold, left, right, value, missing_left, roots, node_value
+
+Leaves point back at themselves, so evaluation walks every tree of every row at
+once for max_depth steps with plain NumPy indexing and then sums the leaf
+values. node_value keeps every node's value (internal nodes too), so the same
+walk also splits a prediction into per-feature path contributions. The arrays plus the alpha/beta calibration are saved as one .npz (see
+model.export_flat_model); loading and evaluating it needs only NumPy, no
+sklearn import.
+'''
+import os
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+
+#Rows evaluated per step, keeps the (rows x trees) node index array small
+CHUNK_ROWS = 4096
+
+
+def _gbr_trees(model):
+    """(feature, threshold, left, right, value, missing_left) per tree of a GradientBoostingRegressor"""
+    for est in np.ravel(model.estimators_):
+        tree = est.tree_
+        yield (
+            tree.feature, tree.threshold, tree.children_left, tree.children_right,
+            model.learning_rate * tree.value[:, 0, 0],
+            #GradientBoostingRegressor can't take NaN, send them left like a leaf
+            np.ones(tree.node_count, dtype=bool),
+        )
+
+
+def _hist_trees(model):
+    """Same for a HistGradientBoostingRegressor (leaf values already include the learning rate)"""
+    for predictors in model._predictors:
+        for predictor in predictors:
+            nodes = predictor.nodes
+            if np.any(nodes["is_categorical"]):
+                raise ValueError("Categorical splits can't be flattened")
+            is_leaf = nodes["is_leaf"].astype(bool)
+            yield (
+                np.where(is_leaf, -1, nodes["feature_idx"].astype(np.int64)),
+                nodes["num_threshold"],
+                np.where(is_leaf, -1, nodes["left"].astype(np.int64)),
+                np.where(is_leaf, -1, nodes["right"].astype(np.int64)),
+                nodes["value"],
+                nodes["missing_go_to_left"].astype(bool),
+            )
+
+
+def flatten_ensemble(model) -> Dict[str, np.ndarray]:
+    """
+    Flattens a fitted gradient boosting regressor into contiguous arrays.
+    Only reads the fitted attributes, so sklearn doesn't need to be imported here.
+    """
+    if hasattr(model, "estimators_"):
+        trees = list(_gbr_trees(model))
+        #GradientBoostingRegressor's trees compare float32 copies of the input
+        cast_float32 = True
+        if isinstance(model.init_, str) and model.init_ == "zero":
+            base = 0.0
+        else:
+            base = float(np.ravel(model.init_.predict(np.zeros((1, model.n_features_in_))))[0])
+    elif hasattr(model, "_predictors"):
+        trees = list(_hist_trees(model))
+        cast_float32 = False
+        base = float(np.ravel(model._baseline_prediction)[0])
+    else:
+        raise TypeError(f"Can't flatten a {type(model).__name__}")
+
+    features, thresholds, lefts, rights, values, missing, roots, depths = [], [], [], [], [], [], [], []
+    node_values = []
+    offset = 0
+    for feature, threshold, left, right, value, missing_left in trees:
+        n_nodes = len(feature)
+        own = np.arange(offset, offset + n_nodes)
+        is_leaf = np.asarray(left) < 0
+
+        #Leaves loop back to themselves: feature 0, threshold +inf, both children = self
+        features.append(np.where(is_leaf, 0, feature))
+        thresholds.append(np.where(is_leaf, np.inf, threshold))
+        lefts.append(np.where(is_leaf, own, np.asarray(left) + offset))
+        rights.append(np.where(is_leaf, own, np.asarray(right) + offset))
+        values.append(np.where(is_leaf, value, 0.0))
+        node_values.append(value)
+        missing.append(np.where(is_leaf, True, missing_left))
+        roots.append(offset)
+        depths.append(_tree_depth(np.asarray(left), np.asarray(right)))
+        offset += n_nodes
+
+    return {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "value": np.concatenate(values).astype(np.float64),
+        "missing_left": np.concatenate(missing).astype(bool),
+        "node_value": np.concatenate(node_values).astype(np.float64),
+        "roots": np.array(roots, dtype=np.int32),
+        "max_depth": np.int32(max(depths) if depths else 0),
+        "base": np.float64(base),
+        "cast_float32": np.bool_(cast_float32),
+        "n_features": np.int32(model.n_features_in_),
+    }
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Depth of a tree given its child arrays (-1 marks a leaf)"""
+    depth = np.zeros(len(left), dtype=np.int64)
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max()) if len(depth) else 0
+
+
+class FlatEnsemble:
+    """Pure-NumPy evaluator for a flattened ensemble plus its win calibration"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], feature_cols: List[str],
+                 alpha: float = 0.0, beta: float = 1.0):
+        self.feature = np.ascontiguousarray(arrays["feature"])
+        self.threshold = np.ascontiguousarray(arrays["threshold"])
+        self.left = np.ascontiguousarray(arrays["left"])
+        self.right = np.ascontiguousarray(arrays["right"])
+        self.value = np.ascontiguousarray(arrays["value"])
+        self.missing_left = np.ascontiguousarray(arrays["missing_left"])
+        self.roots = np.ascontiguousarray(arrays["roots"])
+        #Exports from before contributions existed (and interval ensembles) don't have it
+        self.node_value = np.ascontiguousarray(arrays["node_value"]) if "node_value" in arrays else None
+        self.n_nodes = len(self.feature)
+        self.children = np.concatenate([self.right, self.left])
+        self.max_depth = int(arrays["max_depth"])
+        self.base = float(arrays["base"])
+        self.cast_float32 = bool(arrays["cast_float32"])
+        self.feature_cols = list(feature_cols)
+        self.alpha = alpha
+        self.beta = beta
+
+    def _step(self, flat_X: np.ndarray, row_offsets: np.ndarray, node: np.ndarray, has_nan: bool) -> np.ndarray:
+        """Moves every (row, tree) node one level down, leaves stay put"""
+        x = flat_X.take(row_offsets + self.feature.take(node))
+        go_left = x <= self.threshold.take(node)
+        if has_nan:
+            go_left = np.where(np.isnan(x), self.missing_left.take(node), go_left)
+        #children holds [right..., left...], so go_left picks the second half
+        return self.children.take(node + go_left * self.n_nodes)
+
+    def _leaf_values(self, X: np.ndarray, has_nan: bool) -> np.ndarray:
+        """(rows x trees) value of the leaf each row lands in, for one chunk of rows"""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+
+        #Every row walks every tree one level per step; leaves stay put
+        for _ in range(self.max_depth):
+            node = self._step(flat_X, row_offsets, node, has_nan)
+
+        return self.value.take(node)
+
+    @property
+    def supports_contributions(self) -> bool:
+        return self.node_value is not None
+
+    def contributions(self, X):
+        """
+        Returns (contributions, bias): contributions is (rows x features) in raw
+        model units, every step down a tree credited to the feature it split on,
+        and bias + contributions.sum(axis=1) == predict(X).
+        """
+        X = self._prepare(X)
+        has_nan = bool(np.isnan(X).any())
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, np.newaxis]
+        rows = np.broadcast_to(np.arange(n_rows)[:, np.newaxis], (n_rows, len(self.roots)))
+
+        out = np.zeros(n_rows * n_features)
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        for _ in range(self.max_depth):
+            child = self._step(flat_X, row_offsets, node, has_nan)
+            #Leaves step to themselves, which adds nothing
+            delta = self.node_value.take(child) - self.node_value.take(node)
+            out += np.bincount((rows * n_features + self.feature.take(node)).ravel(),
+                               weights=delta.ravel(), minlength=n_rows * n_features)
+            node = child
+
+        return out.reshape(n_rows, n_features), self.base + float(self.node_value[self.roots].sum())
+
+    def _prepare(self, X) -> np.ndarray:
+        """X as a contiguous 2-D float64 array, rounded like the sklearn trees round it"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis]
+        if self.cast_float32:
+            X = X.astype(np.float32).astype(np.float64)
+        return np.ascontiguousarray(X)
+
+    def evaluate(self, X, reduce) -> np.ndarray:
+        """
+        Walks every tree for every row and returns reduce(leaf_values) per chunk of
+        CHUNK_ROWS rows, concatenated. leaf_values is (rows x trees), without base.
+        """
+        X = self._prepare(X)
+        has_nan = bool(np.isnan(X).any())
+
+        if len(X) <= CHUNK_ROWS:
+            return reduce(self._leaf_values(X, has_nan))
+        return np.concatenate([
+            reduce(self._leaf_values(X[start:start + CHUNK_ROWS], has_nan))
+            for start in range(0, len(X), CHUNK_ROWS)
+        ])
+
+    def predict(self, X) -> np.ndarray:
+        """Raw model output for a (rows x features) array or DataFrame, like model.predict"""
+        return self.base + self.evaluate(X, lambda leaves: leaves.sum(axis=1))
+
+    def predict_wins(self, X) -> np.ndarray:
+        """Calibrated win totals, clipped to 0-82"""
+        return np.clip(self.alpha + self.beta * self.predict(X), 0.0, 82.0)
+
+
+def concat_ensembles(members: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Joins several flattened ensembles (same model type) into one set of arrays,
+    so they can all be walked in a single evaluation. member_trees holds each
+    member's number of trees and member_base each member's constant.
+    """
+    joined = {key: [] for key in ("feature", "threshold", "left", "right", "value", "missing_left", "roots")}
+    offset = 0
+    for arrays in members:
+        for key in ("feature", "threshold", "value", "missing_left"):
+            joined[key].append(arrays[key])
+        for key in ("left", "right", "roots"):
+            joined[key].append(arrays[key].astype(np.int64) + offset)
+        offset += len(arrays["feature"])
+
+    out = {key: np.concatenate(parts) for key, parts in joined.items()}
+    for key in ("left", "right", "roots"):
+        out[key] = out[key].astype(np.int32)
+    out["max_depth"] = np.int32(max(int(arrays["max_depth"]) for arrays in members))
+    out["base"] = np.float64(0.0)
+    out["cast_float32"] = np.bool_(members[0]["cast_float32"])
+    out["n_features"] = np.int32(members[0]["n_features"])
+    out["member_trees"] = np.array([len(arrays["roots"]) for arrays in members], dtype=np.int32)
+    out["member_base"] = np.array([float(arrays["base"]) for arrays in members])
+    return out
+
+
+def save_flat_model(path: str, arrays: Dict[str, np.ndarray], feature_cols: List[str], alpha: float, beta: float,
+                    compressed: bool = False):
+    """Writes the flattened ensemble and calibration to an .npz (atomically)"""
+    tmp_path = path + ".tmp.npz"
+    (np.savez_compressed if compressed else np.savez)(
+        tmp_path, **arrays,
+        feature_cols=np.array(feature_cols), alpha=np.float64(alpha), beta=np.float64(beta),
+    )
+    os.replace(tmp_path, path)
+
+
+def read_flat_model(path: str) -> FlatEnsemble:
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    return FlatEnsemble(arrays, [str(c) for c in arrays["feature_cols"]],
+                        float(arrays["alpha"]), float(arrays["beta"]))
+
+
+#path -> (mtime, size, FlatEnsemble), reloaded when the file changes
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_flat_model(path: str) -> FlatEnsemble:
+    """Loads an exported ensemble once per process (again only if the file changed)"""
+    stat = os.stat(path)
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        flat = read_flat_model(path)
+        _loaded[path] = (stat.st_mtime, stat.st_size, flat)
+        return flat
@@ -0,0 +1,85 @@
+'''
+Prediction intervals for win totals from a bootstrap ensemble.
+
+model.train_intervals fits N copies of the win model (same backend and tuned
+parameters as win_model.pkl) on bootstrap samples of the training rows, in
+parallel. Each member is flattened (see flat_ensemble.py) and all members are
+saved together in one .npz next to the model (win_model.intervals.npz), along
+with each member's calibration and a grid of quantiles of the out-of-bag
+residuals.
+
+Predicting walks every tree of every member for a batch of rosters in one
+evaluation. The out-of-bag residuals already hold both the model's estimation
+error and the season-to-season noise, so p10/p50/p90 are quantiles of
+(ensemble mean + residual) per roster; adding the members' spread on top would
+count the model error twice. Only needs NumPy.
+'''
+import os
+import threading
+from typing import Sequence
+
+import numpy as np
+
+from flat_ensemble import FlatEnsemble
+
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def intervals_path(model_path: str) -> str:
+    """win_model.pkl -> win_model.intervals.npz"""
+    return os.path.splitext(model_path)[0] + ".intervals.npz"
+
+
+class BootstrapIntervals:
+    """Evaluates a saved bootstrap ensemble and turns it into win quantiles"""
+
+    def __init__(self, arrays: dict):
+        self.ensemble = FlatEnsemble(arrays, [str(c) for c in arrays["feature_cols"]])
+        self.feature_cols = self.ensemble.feature_cols
+        self.member_starts = np.concatenate([[0], np.cumsum(arrays["member_trees"])[:-1]])
+        self.member_base = arrays["member_base"]
+        self.member_alpha = arrays["member_alpha"]
+        self.member_beta = arrays["member_beta"]
+        self.residual_grid = arrays["residual_grid"]
+
+    @property
+    def n_members(self) -> int:
+        return len(self.member_base)
+
+    def member_wins(self, X) -> np.ndarray:
+        """(rows x members) calibrated win totals, from one pass over all members' trees"""
+        raw = self.ensemble.evaluate(
+            X, lambda leaves: np.add.reduceat(leaves, self.member_starts, axis=1)
+        ) + self.member_base
+        return self.member_alpha + self.member_beta * raw
+
+    def predict_quantiles(self, X, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> np.ndarray:
+        """(rows x quantiles) win totals, clipped to 0-82"""
+        center = self.member_wins(X).mean(axis=1)
+        #Out-of-bag error quantiles around the ensemble mean, per roster
+        samples = center[:, np.newaxis] + self.residual_grid[np.newaxis, :]
+        return np.clip(np.quantile(samples, quantiles, axis=1).T, 0.0, 82.0)
+
+
+def read_intervals(path: str) -> BootstrapIntervals:
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    return BootstrapIntervals(arrays)
+
+
+#path -> (mtime, size, BootstrapIntervals)
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_intervals(path: str) -> BootstrapIntervals:
+    """Loads an interval ensemble once per process (again only if the file changed)"""
+    stat = os.stat(path)
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        intervals = read_intervals(path)
+        _loaded[path] = (stat.st_mtime, stat.st_size, intervals)
+        return intervals
@@ -0,0 +1,139 @@
+'''
+Season-wide player stat table for predictions.
+
+One leaguedashplayerstats request returns every player's per-game line for a
+season, so instead of one playercareerstats call per player we load that table
+once (cached on disk for a day), index it by PLAYER_ID and answer every roster
+lookup from memory. The table also carries the shooting stats (FGM, FGA, ...).
+'''
+import os
+import threading
+import time
+from typing import Optional
+
+import pandas as pd
+
+from feature_engine import FEATURE_STATS, SHOOTING_STATS
+from stats_cache import is_offline
+import tracing
+
+
+CACHE_DIR = os.environ.get("NBA_LEAGUE_CACHE", ".nba_cache")
+
+#Refetch the season table once it is older than this (one day)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+#Columns kept from the league table
+KEEP_COLUMNS = ["PLAYER_NAME", "TEAM_ABBREVIATION", "GP"] + FEATURE_STATS + SHOOTING_STATS
+
+
+def current_season() -> str:
+    """The season nba_api considers current, e.g. "2025-26" """
+    from nba_api.stats.library.parameters import Season
+    return Season.default
+
+
+def previous_season(season: str) -> str:
+    start = int(season[:4]) - 1
+    return f"{start}-{str(start + 1)[-2:]}"
+
+
+def _fetch_table(season: str) -> pd.DataFrame:
+    from data_retrieval import call_with_retries, get_player_season_stats
+    return call_with_retries(get_player_season_stats, season, retries=3)
+
+
+class SeasonStatsStore:
+    """
+    In-memory, PLAYER_ID-indexed copy of a season's league-wide per-game table.
+
+    The table is fetched at most once per max_age (kept in CACHE_DIR between runs).
+    If the season has no games yet, the previous season is used instead.
+    In offline mode only the on-disk copy is used.
+    """
+
+    def __init__(self, season: Optional[str] = None, cache_dir: str = CACHE_DIR,
+                 max_age: float = DEFAULT_MAX_AGE, fetch=None, offline: Optional[bool] = None):
+        self.season = season
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.fetch = fetch or _fetch_table
+        self.offline = is_offline() if offline is None else offline
+
+        self.table: Optional[pd.DataFrame] = None
+        self.loaded_season: Optional[str] = None
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _cache_path(self, season: str) -> str:
+        return os.path.join(self.cache_dir, f"league_player_stats_{season}.csv")
+
+    def _load_season(self, season: str) -> Optional[pd.DataFrame]:
+        path = self._cache_path(season)
+        if os.path.exists(path):
+            age = time.time() - os.path.getmtime(path)
+            if self.offline or age < self.max_age:
+                tracing.incr("league_table_cache_hits")
+                return pd.read_csv(path, index_col="PLAYER_ID")
+
+        if self.offline:
+            return None
+
+        with tracing.span("api.league_player_stats", season=season):
+            raw = self.fetch(season)
+        table = raw.set_index("PLAYER_ID").reindex(columns=KEEP_COLUMNS)
+        table = table[~table.index.duplicated(keep="last")]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        table.to_csv(tmp_path)
+        os.replace(tmp_path, path)
+        return table
+
+    def load(self) -> pd.DataFrame:
+        """
+        Returns the indexed table, (re)loading it if it's missing or older than max_age.
+        The fetch happens under the lock, so concurrent callers wait for one request.
+        """
+        with self._lock:
+            if self.table is not None and time.time() - self.loaded_at < self.max_age:
+                return self.table
+
+            season = self.season or current_season()
+            table = self._load_season(season)
+
+            #Season hasn't started yet, fall back to the one before
+            if (table is None or table.empty) and self.season is None:
+                season = previous_season(season)
+                table = self._load_season(season)
+
+            if table is None:
+                raise LookupError(f"No league stats cached for {season} (offline mode)")
+
+            self.table = table
+            self.loaded_season = season
+            self.loaded_at = time.time()
+            return table
+
+    def get(self, player_id) -> Optional[pd.Series]:
+        """A player's per-game stat line, or None if they didn't play that season"""
+        table = self.load()
+        try:
+            return table.loc[int(player_id)]
+        except KeyError:
+            return None
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_season_store() -> SeasonStatsStore:
+    """Returns the process-wide season table, created on first use"""
+    global _default_store
+    #Checked again under the lock, fetch threads can all ask for it at once on a cold start
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = SeasonStatsStore()
+    return _default_store
@@ -0,0 +1,373 @@
+'''
+Lineup optimizer: finds the 5-man rosters from a player pool with the most predicted wins.
+
+Candidate lineups are scored in large batches: their stats are gathered into a
+(lineups x players x stats) array, turned into team features by feature_engine
+and sent through the model in one predict call per batch. Constraints
+(must-include players, a salary budget, a cap on stars) are applied to each
+batch as array masks before scoring.
+
+Two search methods:
+- "exhaustive" scores every combination (optionally split across a process pool)
+- "beam" grows lineups one slot at a time and keeps only the best partial lineups
+
+SwapSweep answers "what if we replace player 3 with each of these players?": the
+four players who stay are aggregated once, every candidate's team features are
+those aggregates updated with one player, and all candidates go through one
+predict call.
+'''
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import (
+    FEATURE_STATS,
+    SHOOTING_STATS,
+    partial_team_aggregates,
+    swap_feature_matrix,
+    team_feature_matrix,
+)
+import model as win_model
+
+
+ROSTER_SIZE = 5
+
+
+def build_pool(player_ids: Iterable[int], get_stats=None, source: Optional[str] = None) -> pd.DataFrame:
+    """
+    Builds a player pool (indexed by player ID) from each player's last-season stats.
+    By default the stats come from main.fetch_player_stats, the same source predict
+    and compare use (the season-wide league table unless source says otherwise),
+    so a pool costs one table request instead of one API call per player.
+    get_stats(player_id) replaces that source, e.g. for a local CSV.
+    """
+    player_ids = list(player_ids)
+    if get_stats is None:
+        from main import fetch_player_stats
+        stats_by_id = fetch_player_stats(player_ids, source)
+    else:
+        stats_by_id = {int(player_id): get_stats(player_id) for player_id in player_ids}
+
+    rows = {}
+    for player_id in player_ids:
+        stats = stats_by_id[int(player_id)]
+        rows[player_id] = {stat: stats.get(stat, np.nan) for stat in FEATURE_STATS + SHOOTING_STATS}
+    return pd.DataFrame.from_dict(rows, orient="index").astype(float)
+
+
+class LineupScorer:
+    """Scores batches of lineups (rows of pool positions) with the trained model"""
+
+    def __init__(self, pool: pd.DataFrame, model_path: str = win_model.model_path):
+        self.model, self.feature_cols, self.alpha, self.beta = win_model.load_model(model_path)
+
+        #Only stats every pool player has a column for (missing values stay NaN)
+        self.stat_names = [s for s in FEATURE_STATS + SHOOTING_STATS if s in pool.columns]
+        self.values = pool[self.stat_names].to_numpy(dtype=float)
+
+    def score_values(self, values: np.ndarray, batch_size: int = 50_000) -> np.ndarray:
+        """Calibrated win totals for a (lineups x players x stats) array, one predict call per batch"""
+        raw = np.empty(len(values))
+        for start in range(0, len(values), batch_size):
+            chunk = values[start:start + batch_size]
+            X = team_feature_matrix(chunk, self.stat_names, self.feature_cols)
+            raw[start:start + batch_size] = self.model.predict(pd.DataFrame(X, columns=self.feature_cols))
+        return np.clip(self.alpha + self.beta * raw, 0.0, 82.0)
+
+    def score(self, lineups: np.ndarray) -> np.ndarray:
+        """Calibrated win totals for a (lineups x players) array of pool positions"""
+        return self.score_values(self.values[lineups])
+
+
+class SwapSweep:
+    """
+    Scores single-slot replacements for one roster.
+
+    roster_ids are the 5 player IDs (all in the pool) and slot is the 1-based
+    position being replaced. The other players' aggregates are computed once
+    here, so each sweep() only costs one batched array update and one predict.
+    """
+
+    def __init__(self, pool: pd.DataFrame, roster_ids: Sequence[int], slot: int,
+                 model_path: str = win_model.model_path):
+        if not 1 <= slot <= len(roster_ids):
+            raise ValueError(f"Slot must be between 1 and {len(roster_ids)}")
+        missing = [player_id for player_id in roster_ids if player_id not in pool.index]
+        if missing:
+            raise ValueError(f"Players not in the pool: {', '.join(str(m) for m in missing)}")
+
+        self.pool = pool
+        self.scorer = LineupScorer(pool, model_path)
+        self.roster_ids = list(roster_ids)
+        self.slot = slot
+        self.replaced = self.roster_ids[slot - 1]
+
+        positions = pool.index.get_indexer(self.roster_ids)
+        fixed = np.delete(positions, slot - 1)
+        self.partial = partial_team_aggregates(self.scorer.values[fixed], self.scorer.stat_names)
+        self.current_wins = float(self.scorer.score(positions.reshape(1, -1))[0])
+
+    def score_values(self, candidate_values: np.ndarray) -> np.ndarray:
+        """Calibrated wins with each (candidates x stats) row in the slot"""
+        scorer = self.scorer
+        X = swap_feature_matrix(self.partial, candidate_values, scorer.stat_names, scorer.feature_cols)
+        raw = scorer.model.predict(pd.DataFrame(X, columns=scorer.feature_cols))
+        return np.clip(scorer.alpha + scorer.beta * raw, 0.0, 82.0)
+
+    def sweep(self, candidate_ids: Optional[Iterable[int]] = None, k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Ranks candidates (default: every pool player not on the roster) by how many
+        wins they add over the current player. Returns rank, player_id, player,
+        wins and win_delta, best first, the top k when k is given.
+        """
+        if candidate_ids is None:
+            candidate_ids = [p for p in self.pool.index if p not in set(self.roster_ids)]
+        else:
+            candidate_ids = [p for p in candidate_ids if p not in set(self.roster_ids)]
+        positions = self.pool.index.get_indexer(candidate_ids)
+        if np.any(positions < 0):
+            raise ValueError("Candidates have to be in the pool")
+
+        wins = self.score_values(self.scorer.values[positions])
+        order = np.argsort(-wins, kind="stable")[:k]
+
+        chosen = positions[order]
+        ids = self.pool.index.to_numpy()[chosen]
+        if "PLAYER_NAME" in self.pool.columns:
+            names = self.pool["PLAYER_NAME"].astype(str).to_numpy()[chosen]
+        else:
+            names = ids.astype(str)
+        return pd.DataFrame({
+            "rank": np.arange(1, len(order) + 1),
+            "player_id": ids,
+            "player": names,
+            "wins": wins[order],
+            "win_delta": wins[order] - self.current_wins,
+        })
+
+
+class _Constraints:
+    """Vectorized constraint checks on lineups given as pool positions"""
+
+    def __init__(self, salaries: Optional[np.ndarray], budget: Optional[float],
+                 star_flags: Optional[np.ndarray], max_stars: Optional[int]):
+        self.salaries = salaries if budget is not None else None
+        self.budget = budget
+        self.star_flags = star_flags if max_stars is not None else None
+        self.max_stars = max_stars
+
+    def mask(self, lineups: np.ndarray) -> np.ndarray:
+        keep = np.ones(len(lineups), dtype=bool)
+        if self.salaries is not None:
+            keep &= self.salaries[lineups].sum(axis=1) <= self.budget
+        if self.star_flags is not None:
+            keep &= self.star_flags[lineups].sum(axis=1) <= self.max_stars
+        return keep
+
+    def partial_mask(self, lineups: np.ndarray, slots_left: int, candidates: np.ndarray) -> np.ndarray:
+        """
+        Prunes partial lineups that can't be completed: over the star cap already, or
+        over budget even if every remaining slot took the cheapest candidates.
+        """
+        keep = np.ones(len(lineups), dtype=bool)
+        if self.salaries is not None:
+            cheapest = np.sort(self.salaries[candidates])[:slots_left].sum() if slots_left else 0.0
+            keep &= self.salaries[lineups].sum(axis=1) + cheapest <= self.budget
+        if self.star_flags is not None:
+            keep &= self.star_flags[lineups].sum(axis=1) <= self.max_stars
+        return keep
+
+
+def _merge_top_k(best_scores, best_lineups, scores, lineups, k):
+    """Keeps the k highest-scoring lineups seen so far"""
+    scores = np.concatenate([best_scores, scores])
+    lineups = np.concatenate([best_lineups, lineups])
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+        scores, lineups = scores[top], lineups[top]
+    return scores, lineups
+
+
+def _combination_batches(first: int, others: Sequence[int], size: int, batch_size: int):
+    """Yields (batch x size) arrays of lineups that start with `first`"""
+    #Every other slot is already forced, the lineup is just `first`
+    if size == 1:
+        yield np.array([[first]], dtype=np.int64)
+        return
+
+    combos = itertools.combinations(others, size - 1)
+    while True:
+        flat = np.fromiter(
+            itertools.chain.from_iterable(itertools.islice(combos, batch_size)),
+            dtype=np.int64,
+        )
+        if flat.size == 0:
+            return
+        rest = flat.reshape(-1, size - 1)
+        yield np.column_stack([np.full(len(rest), first, dtype=np.int64), rest])
+
+
+def _search_from(scorer: LineupScorer, constraints: _Constraints, fixed: np.ndarray,
+                 free: np.ndarray, first: int, k: int, batch_size: int):
+    """Exhaustively scores every lineup whose first free player is free[first]"""
+    best_scores = np.empty(0)
+    best_lineups = np.empty((0, ROSTER_SIZE), dtype=np.int64)
+    n_free_slots = ROSTER_SIZE - len(fixed)
+
+    for batch in _combination_batches(free[first], free[first + 1:], n_free_slots, batch_size):
+        lineups = np.column_stack([np.broadcast_to(fixed, (len(batch), len(fixed))), batch])
+        lineups = lineups[constraints.mask(lineups)]
+        if len(lineups) == 0:
+            continue
+        best_scores, best_lineups = _merge_top_k(
+            best_scores, best_lineups, scorer.score(lineups), lineups, k
+        )
+    return best_scores, best_lineups
+
+
+#Per-process state for the process pool
+_worker = {}
+
+
+def _init_worker(pool, model_path, constraints, fixed, free, k, batch_size):
+    _worker["scorer"] = LineupScorer(pool, model_path)
+    _worker["args"] = (constraints, fixed, free)
+    _worker["k"] = k
+    _worker["batch_size"] = batch_size
+
+
+def _worker_search(first):
+    constraints, fixed, free = _worker["args"]
+    return _search_from(_worker["scorer"], constraints, fixed, free, first, _worker["k"], _worker["batch_size"])
+
+
+def _beam_search(scorer: LineupScorer, constraints: _Constraints, fixed: np.ndarray,
+                 free: np.ndarray, k: int, beam_width: int, batch_size: int):
+    """
+    Grows lineups one slot at a time. Partial lineups are scored with the empty slots
+    filled by a replacement-level player (the pool median), and only the best
+    beam_width partial lineups survive each round.
+    """
+    replacement = np.nanmedian(scorer.values[free], axis=0)
+    beam = fixed.reshape(1, -1)
+
+    for slot in range(len(fixed), ROSTER_SIZE):
+        #Extend every lineup with each free player after its last free pick (no duplicates)
+        last = np.full(len(beam), -1) if slot == len(fixed) else np.searchsorted(free, beam[:, -1])
+        starts = np.repeat(np.arange(len(beam)), len(free))
+        picks = np.tile(np.arange(len(free)), len(beam))
+        valid = picks > last[starts]
+        lineups = np.column_stack([beam[starts[valid]], free[picks[valid]]])
+
+        slots_left = ROSTER_SIZE - slot - 1
+        lineups = lineups[constraints.partial_mask(lineups, slots_left, free)]
+        if slots_left == 0:
+            lineups = lineups[constraints.mask(lineups)]
+        if len(lineups) == 0:
+            return np.empty(0), np.empty((0, ROSTER_SIZE), dtype=np.int64)
+
+        #Score the partial lineups with replacement players in the empty slots
+        scores = np.empty(len(lineups))
+        for start in range(0, len(lineups), batch_size):
+            values = scorer.values[lineups[start:start + batch_size]]
+            if slots_left:
+                padding = np.broadcast_to(replacement, (len(values), slots_left, len(replacement)))
+                values = np.concatenate([values, padding], axis=1)
+            scores[start:start + batch_size] = scorer.score_values(values, batch_size)
+
+        width = k if slots_left == 0 else beam_width
+        if len(scores) > width:
+            top = np.argpartition(-scores, width - 1)[:width]
+            scores, lineups = scores[top], lineups[top]
+        beam = lineups
+
+    return scores, beam
+
+
+def optimize_lineups(pool: pd.DataFrame, k: int = 10, must_include: Iterable[int] = (),
+                     salaries: Optional[Dict[int, float]] = None, budget: Optional[float] = None,
+                     stars: Iterable[int] = (), max_stars: Optional[int] = None,
+                     method: str = "exhaustive", beam_width: int = 2000,
+                     batch_size: int = 50_000, workers: int = 1,
+                     model_path: str = win_model.model_path) -> pd.DataFrame:
+    """
+    Returns the top-k 5-man lineups from the pool by predicted wins.
+
+    Args:
+        pool: DataFrame indexed by player ID with FEATURE_STATS (and optionally
+              SHOOTING_STATS) columns, and optionally PLAYER_NAME / SALARY
+        k: Number of lineups to return
+        must_include: Player IDs that every lineup has to contain
+        salaries, budget: Salary per player ID (defaults to the SALARY column) and
+                          the cap on a lineup's total salary
+        stars, max_stars: Player IDs that count as stars and the most allowed per lineup
+        method: "exhaustive" (every combination) or "beam" (pruned search)
+        beam_width: Partial lineups kept per slot in beam search
+        batch_size: Lineups scored per predict call
+        workers: Processes for exhaustive search (1 = run in this process)
+    """
+    ids = list(pool.index)
+    position = {player_id: i for i, player_id in enumerate(ids)}
+
+    fixed = np.array([position[player_id] for player_id in must_include], dtype=np.int64)
+    if len(fixed) > ROSTER_SIZE:
+        raise ValueError(f"Can't force {len(fixed)} players into a {ROSTER_SIZE}-man lineup")
+    free = np.array([i for i in range(len(ids)) if i not in set(fixed.tolist())], dtype=np.int64)
+
+    salary_array = None
+    if budget is not None:
+        if salaries is None:
+            salary_array = pool["SALARY"].to_numpy(dtype=float)
+        else:
+            salary_array = np.array([salaries[player_id] for player_id in ids], dtype=float)
+    star_set = set(stars)
+    star_flags = np.array([player_id in star_set for player_id in ids], dtype=np.int64)
+    constraints = _Constraints(salary_array, budget, star_flags, max_stars)
+
+    if len(fixed) == ROSTER_SIZE:
+        scorer = LineupScorer(pool, model_path)
+        lineups = fixed.reshape(1, -1)[constraints.mask(fixed.reshape(1, -1))]
+        scores = scorer.score(lineups) if len(lineups) else np.empty(0)
+
+    elif method == "beam":
+        scorer = LineupScorer(pool, model_path)
+        scores, lineups = _beam_search(scorer, constraints, fixed, free, k, beam_width, batch_size)
+
+    elif method == "exhaustive":
+        firsts = range(len(free) - (ROSTER_SIZE - len(fixed)) + 1)
+
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(pool, model_path, constraints, fixed, free, k, batch_size),
+            ) as executor:
+                results = list(executor.map(_worker_search, firsts))
+        else:
+            scorer = LineupScorer(pool, model_path)
+            results = [_search_from(scorer, constraints, fixed, free, first, k, batch_size) for first in firsts]
+
+        scores = np.empty(0)
+        lineups = np.empty((0, ROSTER_SIZE), dtype=np.int64)
+        for part_scores, part_lineups in results:
+            scores, lineups = _merge_top_k(scores, lineups, part_scores, part_lineups, k)
+
+    else:
+        raise ValueError(f"Unknown method {method!r}, expected 'exhaustive' or 'beam'")
+
+    order = np.argsort(-scores, kind="stable")[:k]
+    names = pool["PLAYER_NAME"] if "PLAYER_NAME" in pool.columns else pd.Series(ids, index=ids).astype(str)
+
+    results = []
+    for rank, i in enumerate(order, start=1):
+        lineup_ids = [ids[j] for j in lineups[i]]
+        results.append({
+            "rank": rank,
+            "wins": float(scores[i]),
+            "player_ids": lineup_ids,
+            "players": ";".join(str(names[player_id]) for player_id in lineup_ids),
+        })
+    return pd.DataFrame(results, columns=["rank", "wins", "player_ids", "players"])
@@ -1,9 +1,20 @@
-from nba_api.stats.endpoints import playercareerstats
-from nba_api.stats.static import players
-from typing import List, Dict
-import pandas as pd
-from model import load_model, FEATURE_STATS, SHOOTING_STATS, compute_team_features
-from visualization import visualize_roster_comparison, get_top_strengths
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from player_resolver import get_resolver, substituted_name
+import tracing
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+#The heavy dependencies (nba_api endpoints, pandas, scikit-learn via model,
+#matplotlib via visualization) are imported inside the functions that use them,
+#so the menu and scripted runs only pay for what they actually touch.
+#`python benchmark.py --startup` checks the time-to-menu.
 
 
 #Function to Display the main Menu
@@ -102,11 +113,11 @@ def get_player_list():
         #Get Player Name
         player_name = str(input("\nEnter the Player Name: ")).lower()
 
-        #Call to NBA API to retrieve the player name/info
-        name_matches = players.find_players_by_full_name(player_name)
+        #Look up the player name/info
+        match = get_resolver().resolve(player_name)
 
         #Player Not Found
-        if len(name_matches) == 0:
+        if match is None:
             print("/nERROR - Name not Found Try Again\n")
 
         #Invalid Position entered
@@ -115,12 +126,14 @@ def get_player_list():
 
         #Player Found, add to the desired position
         else:
+            report_substitution(player_name, match)
+
             #Add Player Name
             player_index -= 1   #Adjust for 0 index
-            user_roster[player_index]["name"] = name_matches[0]["full_name"]
+            user_roster[player_index]["name"] = match["full_name"]
 
             #Add Player ID
-            user_roster[player_index]["id"] = name_matches[0]["id"]
+            user_roster[player_index]["id"] = match["id"]
 
     #Return the User's Roster
     return user_roster
@@ -157,60 +170,121 @@ def roster_load(user_roster):
     try:
         #Open File
         with open(filename, "r") as f:
-            #Iterate over each line
-            for i, line in enumerate(f):
-                #Clean
-                player_name = line.strip().lower()
+            #Clean each line
+            player_names = [line.strip().lower() for line in f]
 
-                #Get Player Info   
-                name_matches = players.find_players_by_full_name(player_name)
+        #Get Player Info for every line at once
+        matches = get_resolver().resolve_many(player_names)
 
-                if name_matches == []:
-                    print(f"Error - player: {player_name} not found")
-                    break
+        #Iterate over each player
+        for i, (player_name, match) in enumerate(zip(player_names, matches)):
+            if match is None:
+                print(f"Error - player: {player_name} not found")
+                break
+            report_substitution(player_name, match)
 
-                #Extract ID
-                user_roster[i]["name"] = name_matches[0]["full_name"]
+            #Extract ID
+            user_roster[i]["name"] = match["full_name"]
 
-                #Add Player ID
-                user_roster[i]["id"] = name_matches[0]["id"]
+            #Add Player ID
+            user_roster[i]["id"] = match["id"]
 
-            #Return the Roster
-            # print(user_roster)  #TESTING
-            return user_roster
+        #Return the Roster
+        # print(user_roster)  #TESTING
+        return user_roster
 
     except Exception as e:
         print(f"ERROR - File Read Error: {e}")
 
-#Function to get a players most recent stat line
-def get_last_season_stats(player_id):
+#Function that calls the API for a players most recent stat line
+def fetch_last_season_stats(player_id):
+    from nba_api.stats.endpoints import playercareerstats
+
     #Call to API to retrieve the players per gane stats
-    career = playercareerstats.PlayerCareerStats(
-        player_id=player_id,
-        per_mode36="PerGame" 
-    )
+    tracing.incr("api_calls")
+    with tracing.span("api.player_career_stats", player_id=player_id):
+        career = playercareerstats.PlayerCareerStats(
+            player_id=player_id,
+            per_mode36="PerGame" 
+        )
 
     #Retreive Most Recent Season
     df = career.get_data_frames()[0]
+    if df.empty:
+        raise LookupError(f"No stats for player {player_id}")
     last = df.iloc[-1]     
 
     #Return last season    
     return last 
 
+#Function to get a players most recent stat line
+def get_last_season_stats(player_id):
+    """Returns the last-season stat line, served from the on-disk cache when possible"""
+    from stats_cache import get_default_cache
+    return get_default_cache().get(player_id, fetch_last_season_stats)
+
+#Where prediction stats come from: "league" (one season-wide table for everyone) or "career" (one call per player)
+STATS_SOURCE = os.environ.get("NBA_STATS_SOURCE", "league")
+
+def get_player_stats(player_id, source=None):
+    """
+    Returns a player's per-game stat line. The "league" source looks the player up in
+    the season-wide table (one request per day for every player) and falls back to the
+    per-player career call for anyone missing from it.
+    """
+    source = source or STATS_SOURCE
+    if source == "league":
+        from league_stats import get_season_store
+        try:
+            stats = get_season_store().get(player_id)
+        except LookupError:
+            stats = None
+        if stats is not None:
+            return stats
+    return get_last_season_stats(player_id)
+
+def stats_unavailable_message(error) -> str:
+    """What we tell the user when a player's stats can't be fetched (or aren't cached offline)"""
+    return f"ERROR - Player stats unavailable: {error}"
+
+#Most player stat lookups allowed to run at once
+FETCH_WORKERS = 8
+
+def fetch_player_stats(player_ids, source=None, workers=FETCH_WORKERS) -> Dict[int, "pd.Series"]:
+    """
+    Looks up every distinct player once, with up to `workers` lookups in flight,
+    and returns {player_id: stat line}. Rosters that share players (or repeat a
+    roster) don't pay for the same fetch twice.
+    """
+    unique_ids = list(dict.fromkeys(int(player_id) for player_id in player_ids))
+    tracing.incr("stat_lookups_deduplicated", len(player_ids) - len(unique_ids))
+
+    if len(unique_ids) <= 1 or workers <= 1:
+        return {player_id: get_player_stats(player_id, source) for player_id in unique_ids}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique_ids))) as executor:
+        stats = executor.map(lambda player_id: get_player_stats(player_id, source), unique_ids)
+        return dict(zip(unique_ids, stats))
+
 def print_roster_stats_table(user_roster):
     """
     Iterates over each player in user_roster, collects their last-season stats,
     and prints a nice table.
     """
+    import pandas as pd
+
     rows = []
 
+    #Fetch everyone's stats at once
+    stats_by_id = fetch_player_stats([player["id"] for player in user_roster])
+
     for player in user_roster:
         #Retrieve Player Info
         name = player["name"]
         player_id = player["id"]
 
         #Get the stats from last season
-        stats = get_last_season_stats(player_id)
+        stats = stats_by_id[int(player_id)]
 
         #Build a row with the desired stats
         row = {
@@ -229,49 +303,321 @@ def print_roster_stats_table(user_roster):
     df = pd.DataFrame(rows)
     print(df.to_string(index=False))
 
+def build_roster_features(rosters, feature_cols, source=None) -> "pd.DataFrame":
+    """Builds one feature matrix (one row per roster) lined up with the model's feature columns"""
+    from model import compute_team_features
+    from roster_tensor import roster_tensor_from_stats
+
+    with tracing.span("predict.player_stats", rosters=len(rosters)):
+        #Every distinct player across all rosters is fetched once, concurrently
+        player_ids = [player["id"] for roster in rosters for player in roster[:5]]
+        stats_by_id = fetch_player_stats(player_ids, source)
+        tensor = roster_tensor_from_stats(
+            [[stats_by_id[int(player["id"])] for player in roster[:5]] for roster in rosters],
+            player_names=[[player["name"] for player in roster[:5]] for roster in rosters],
+        )
+
+    df = compute_team_features(tensor)
+
+    return df.reindex(columns=feature_cols, fill_value=0.0)
+
+
+def calibrate_wins(raw_pred, alpha, beta) -> "np.ndarray":
+    """Applies the linear calibration and forces win totals into the 0-82 range"""
+    import numpy as np
+
+    calibrated = alpha + beta * np.asarray(raw_pred, dtype=float)
+    return np.clip(calibrated, 0.0, 82.0)
+
+
+#Which evaluator scores rosters: "sklearn" (the pickled model) or "flat" (the NumPy export, see flat_ensemble.py)
+ENGINE = os.environ.get("NBA_ENGINE", "sklearn")
+
+def load_engine(engine=None):
+    """Returns (model, feature_cols, alpha, beta) for the chosen engine"""
+    from model import load_model, model_path, flat_model_path, export_flat_model
+
+    engine = engine or ENGINE
+    if engine == "sklearn":
+        return load_model()
+    if engine != "flat":
+        raise ValueError(f"Unknown engine {engine!r}, expected 'sklearn' or 'flat'")
+
+    from flat_ensemble import load_flat_model
+
+    flat_path = flat_model_path(model_path)
+    if not os.path.exists(flat_path) or os.path.getmtime(flat_path) < os.path.getmtime(model_path):
+        #Models trained before the export existed (or retrained since) get exported once
+        print(f"Exporting {model_path} to {flat_path}", file=sys.stderr)
+        export_flat_model(model_path, flat_path)
+    flat = load_flat_model(flat_path)
+    if not flat.supports_contributions:
+        #Exports from before node values were kept can't explain rosters, refresh them once
+        print(f"Exporting {model_path} to {flat_path}", file=sys.stderr)
+        export_flat_model(model_path, flat_path)
+        flat = load_flat_model(flat_path)
+    return flat, flat.feature_cols, flat.alpha, flat.beta
+
+def predict_many(rosters, return_details=False, source=None, engine=None):
+    """
+    Predict wins for many rosters at once.
+
+    The model is loaded once, every roster goes into one feature matrix and
+    the model is called a single time. Returns an array of win totals.
+    source picks where player stats come from ("league" or "career", see get_player_stats).
+    engine picks the evaluator ("sklearn" or "flat", see load_engine).
+    """
+    model, feature_cols, alpha, beta = load_engine(engine)
+
+    X = build_roster_features(rosters, feature_cols, source)
+
+    with tracing.span("model.predict", rows=len(X)):
+        wins = calibrate_wins(model.predict(X), alpha, beta)
+
+    if return_details:
+        return wins, model, feature_cols, X
+    return wins
+
+
+def predict_intervals(rosters, source=None, quantiles=None) -> "Optional[np.ndarray]":
+    """
+    (rosters x quantiles) win totals from the bootstrap ensemble (p10/p50/p90 by
+    default), or None if model.py --intervals hasn't been run for the model.
+    """
+    from model import model_path
+    from intervals import DEFAULT_QUANTILES, intervals_path, load_intervals
+
+    path = intervals_path(model_path)
+    if not os.path.exists(path):
+        return None
+    intervals = load_intervals(path)
+
+    X = build_roster_features(rosters, intervals.feature_cols, source)
+
+    with tracing.span("model.predict_intervals", rows=len(X), members=intervals.n_members):
+        return intervals.predict_quantiles(X, quantiles or DEFAULT_QUANTILES)
+
+
 def predict_custom_roster_wins(user_roster, return_details=False):
     """
     Predict wins for a custom roster.
     """
-    #Load model, feature columns, and calibration params
-    model, feature_cols, alpha, beta = load_model()
-
     print("\nPredicting win total based on last-season stats:\n")
 
-    row = {}
+    wins, model, feature_cols, X_custom = predict_many([user_roster], return_details=True)
+    wins = float(wins[0])
 
-    #Build player stats from the user's roster
-    for i, player in enumerate(user_roster, start=1):
-        if i > 5:
-            break
+    if return_details:
+        return wins, model, feature_cols, X_custom
+    else:
+        print(f"Predicted Wins: {wins:.1f} out of 82")
+        interval = predict_intervals([user_roster])
+        if interval is not None:
+            print(f"80% range: {interval[0, 0]:.1f} - {interval[0, 2]:.1f} wins")
+        return print()
 
-        stats = get_last_season_stats(player["id"])
 
-        for stat in FEATURE_STATS:
-            col_name = f"P{i}_{stat}"
-            value = float(stats[stat])
+def report_substitution(player_name, match):
+    """Tells the user when a name was matched to a differently named player"""
+    substitute = substituted_name(player_name, match)
+    if substitute is not None:
+        print(f"NOTE - \"{player_name}\" matched {substitute}", file=sys.stderr)
 
-            row[col_name] = value
 
-    df = pd.DataFrame([row])
+def roster_from_names(player_names):
+    """Looks up each player name and returns a roster list (missing players keep name X)"""
+    roster = [
+        {"position_num": str(i+1), "name": "X", "id": None}
+        for i in range(5)
+    ]
+    matches = get_resolver().resolve_many(player_names[:5])
+    for i, (player_name, match) in enumerate(zip(player_names, matches)):
+        if match is not None:
+            report_substitution(player_name, match)
+            roster[i]["name"] = match["full_name"]
+            roster[i]["id"] = match["id"]
+    return roster
 
-    df = compute_team_features(df)
 
-    X_custom = df.reindex(columns=feature_cols, fill_value=0.0)
+def load_roster_file(filename):
+    """Loads a roster from a .txt file with one player name per line"""
+    with open(filename, "r") as f:
+        names = [line.strip() for line in f if line.strip()]
+    return roster_from_names(names)
 
-    raw_pred = model.predict(X_custom)[0]
 
-    #Model calibration to keep predictions reasonable
-    calibrated = alpha + beta * raw_pred
+def load_rosters(source) -> List[Tuple[str, list]]:
+    """
+    Loads (roster_name, roster) pairs from a directory of .txt roster files,
+    a JSONL file ({"name": ..., "players": [...]} per line) or a single .txt file.
+    """
+    rosters = []
+
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if filename.endswith(".txt"):
+                name = os.path.splitext(filename)[0]
+                rosters.append((name, load_roster_file(os.path.join(source, filename))))
+
+    elif source.endswith(".jsonl"):
+        with open(source, "r") as f:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                name = str(record.get("name", f"roster_{line_num}"))
+                rosters.append((name, roster_from_names(record["players"])))
 
-    #Force win totals to 0-82 range so that we don't have impossible predictions
-    wins = max(0.0, min(82.0, calibrated))
+    else:
+        name = os.path.splitext(os.path.basename(source))[0]
+        rosters.append((name, load_roster_file(source)))
+
+    #Skip rosters with players we couldn't find, they can't be scored
+    valid = []
+    for name, roster in rosters:
+        missing = [p["position_num"] for p in roster if p["id"] is None]
+        if missing:
+            print(f"ERROR - Roster {name}: players not found for position(s) {', '.join(missing)}, skipping")
+        else:
+            valid.append((name, roster))
+    return valid
 
-    if return_details:
-        return wins, model, feature_cols, X_custom
+
+def write_results(results: "pd.DataFrame", output=None, fmt=None):
+    """Writes prediction results as CSV or JSON (to stdout when no output path is given)"""
+    if fmt is None:
+        fmt = "json" if output and output.endswith(".json") else "csv"
+
+    if fmt == "json":
+        text = results.to_json(orient="records", indent=2)
+    else:
+        text = results.to_csv(index=False)
+
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+        print(f"Saved {len(results)} results to {output}", file=sys.stderr)
     else:
-        return print(f"Predicted Wins: {wins:.1f} out of 82\n")
+        print(text)
+
+
+def run_cli(argv=None):
+    """Non-interactive entry point: `predict`, `compare` and `simulate` subcommands"""
+    parser = argparse.ArgumentParser(description="Predict NBA roster win totals")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    predict_parser = subparsers.add_parser("predict", help="Predict wins for every roster")
+    predict_parser.add_argument("rosters", help="Directory of .txt rosters, a .jsonl file or a single .txt roster")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare rosters against a baseline roster")
+    compare_parser.add_argument("baseline", help="Baseline roster (.txt)")
+    compare_parser.add_argument("rosters", help="Directory of .txt rosters, a .jsonl file or a single .txt roster")
+
+    simulate_parser = subparsers.add_parser("simulate", help="Simulate seasons for a league of rosters (one per team)")
+    simulate_parser.add_argument("rosters", help="Directory of .txt rosters (file name = team), or a .jsonl file")
+    simulate_parser.add_argument("--seasons", type=int, default=None, help="Seasons to simulate (default 100000)")
+    simulate_parser.add_argument("--seed", type=int, default=0, help="Random seed, same seed = same results")
+    simulate_parser.add_argument("--workers", type=int, default=1, help="Processes to simulate chunks of seasons on")
+    simulate_parser.add_argument("--conferences", help='JSON file {"East": [team, ...], "West": [...]} to seed by conference')
+    simulate_parser.add_argument("--seeds-output", help="Also write each team's seed distribution to this file")
+
+    for sub in (predict_parser, compare_parser, simulate_parser):
+        sub.add_argument("-o", "--output", help="File to write results to (default: stdout)")
+        sub.add_argument("--format", choices=["csv", "json"], help="Output format (default: from the file extension, else csv)")
+        sub.add_argument("--source", choices=["league", "career"], default=None,
+                         help="Player stats from one season-wide table (league) or per-player career calls")
+        sub.add_argument("--engine", choices=["sklearn", "flat"], default=None,
+                         help="Score with the sklearn model or the flat NumPy export (faster for few rosters)")
+        sub.add_argument("--trace", nargs="?", const="", metavar="FILE",
+                         help="Record timings: summary table on stderr, or a .json trace / Prometheus text file")
+        sub.add_argument("--fuzzy-names", action="store_true",
+                         help="Match misspelled player names to the closest name (substitutions are reported)")
+
+    for sub in (predict_parser, compare_parser):
+        sub.add_argument("--intervals", action="store_true",
+                         help="Add p10/p50/p90 win columns from the bootstrap ensemble (model.py --intervals)")
+
+    args = parser.parse_args(argv)
+
+    if args.trace is not None:
+        tracing.enable()
+    if args.fuzzy_names:
+        get_resolver().fuzzy = True
+
+    named_rosters = load_rosters(args.rosters)
+    if args.command == "compare":
+        baseline = load_rosters(args.baseline)
+        if not baseline:
+            parser.error(f"could not load baseline roster {args.baseline}")
+        named_rosters = baseline[:1] + named_rosters
+
+    if not named_rosters:
+        parser.error(f"no rosters could be loaded from {args.rosters}")
+
+    names = [name for name, _ in named_rosters]
+    rosters = [roster for _, roster in named_rosters]
+
+    import numpy as np
+    import pandas as pd
 
+    try:
+        wins = predict_many(rosters, source=args.source, engine=args.engine)
+    except LookupError as e:
+        parser.exit(1, stats_unavailable_message(e) + "\n")
+
+    if args.command == "simulate":
+        try:
+            simulate_league(names, wins, args)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.trace is not None:
+            tracing.write_report(args.trace or None)
+            tracing.reset()
+        return
+
+    results = pd.DataFrame({
+        "roster": names,
+        "players": [";".join(p["name"] for p in roster) for roster in rosters],
+        "wins": np.round(wins, 2),
+    })
+
+    if args.intervals:
+        try:
+            interval = predict_intervals(rosters, source=args.source)
+        except LookupError as e:
+            parser.exit(1, stats_unavailable_message(e) + "\n")
+        if interval is None:
+            parser.error("no interval ensemble found, train one with `python model.py --export-only --intervals`")
+        for column, values in zip(["wins_p10", "wins_p50", "wins_p90"], interval.T):
+            results[column] = np.round(values, 2)
+
+    if args.command == "compare":
+        results["diff_vs_baseline"] = np.round(wins - wins[0], 2)
+        results = results.iloc[1:].sort_values("wins", ascending=False)
+        results.insert(0, "baseline", names[0])
+
+    write_results(results, args.output, args.format)
+
+    if args.trace is not None:
+        tracing.write_report(args.trace or None)
+        tracing.reset()
+
+
+def simulate_league(names, wins, args):
+    """Runs the season simulator on the predicted win totals and writes standings (and seed odds)"""
+    from season_sim import DEFAULT_SEASONS, load_conferences, simulate_seasons
+
+    conferences = load_conferences(args.conferences) if args.conferences else None
+    n_seasons = args.seasons or DEFAULT_SEASONS
+
+    with tracing.span("simulate.seasons", teams=len(names), seasons=n_seasons):
+        standings, seeds = simulate_seasons(
+            wins, names, conferences, n_seasons=n_seasons, seed=args.seed, workers=args.workers,
+        )
+
+    write_results(standings, args.output, args.format)
+    if args.seeds_output:
+        write_results(seeds, args.seeds_output)
 
 
 def main():
@@ -304,14 +650,20 @@ def main():
             display_roster(user_roster=user_roster, isComplete=True)
 
             #Iterate over each player and extract their stats
-            print_roster_stats_table(user_roster=user_roster)
+            try:
+                print_roster_stats_table(user_roster=user_roster)
+            except LookupError as e:
+                print(stats_unavailable_message(e))
 
         #OPTION D - Predict Win Total
         elif user_input == "d":
             if not user_roster:
                 print("\nNo roster selected. Please create one first\n")
             else:
-                predict_custom_roster_wins(user_roster)
+                try:
+                    predict_custom_roster_wins(user_roster)
+                except LookupError as e:
+                    print(stats_unavailable_message(e))
 
         #OPTION E - visualize two Rosters
         elif user_input == "e":
@@ -322,38 +674,15 @@ def main():
             print("Enter the filenames for the two rosters to compare.\n")
             
             filename1 = str(input("Enter filename for Roster 1 (e.g., roster.txt): ")).strip()
-            roster1 = []
             try:
-                with open(filename1, "r") as f:
-                    from nba_api.stats.static import players
-                    roster1 = [
-                        {"position_num": str(i+1), "name": "X", "id": None}
-                        for i in range(5)
-                    ]
-                    for i, line in enumerate(f):
-                        player_name = line.strip().lower()
-                        name_matches = players.find_players_by_full_name(player_name)
-                        if name_matches:
-                            roster1[i]["name"] = name_matches[0]["full_name"]
-                            roster1[i]["id"] = name_matches[0]["id"]
+                roster1 = load_roster_file(filename1)
             except Exception as e:
                 print(f"Error loading {filename1}: {e}")
                 continue
             
             filename2 = str(input("Enter filename for Roster 2 (e.g., roster2.txt): ")).strip()
-            roster2 = []
             try:
-                with open(filename2, "r") as f:
-                    roster2 = [
-                        {"position_num": str(i+1), "name": "X", "id": None}
-                        for i in range(5)
-                    ]
-                    for i, line in enumerate(f):
-                        player_name = line.strip().lower()
-                        name_matches = players.find_players_by_full_name(player_name)
-                        if name_matches:
-                            roster2[i]["name"] = name_matches[0]["full_name"]
-                            roster2[i]["id"] = name_matches[0]["id"]
+                roster2 = load_roster_file(filename2)
             except Exception as e:
                 print(f"Error loading {filename2}: {e}")
                 continue
@@ -368,12 +697,18 @@ def main():
                 roster2_name = filename2.replace(".txt", "").title()
             
             print("\nCalculating predictions and generating visualization...")
+            from visualization import visualize_roster_comparison, get_top_strengths
             
-            wins1, model1, feature_cols1, X1 = predict_custom_roster_wins(roster1, return_details=True)
-            wins2, model2, feature_cols2, X2 = predict_custom_roster_wins(roster2, return_details=True)
+            #Score both rosters in one batch
+            try:
+                wins, model, feature_cols, X = predict_many([roster1, roster2], return_details=True)
+            except LookupError as e:
+                print(stats_unavailable_message(e))
+                continue
+            wins1, wins2 = float(wins[0]), float(wins[1])
 
-            strengths1 = get_top_strengths(model1, feature_cols1, X1, top_n=3)
-            strengths2 = get_top_strengths(model2, feature_cols2, X2, top_n=3)
+            strengths1 = get_top_strengths(model, feature_cols, X.iloc[[0]], top_n=3)
+            strengths2 = get_top_strengths(model, feature_cols, X.iloc[[1]], top_n=3)
             
             print(f"\n{'='*50}")
             print("COMPARISON SUMMARY")
@@ -405,4 +740,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    #Run the CLI when arguments are given, otherwise the interactive menu
+    if len(sys.argv) > 1:
+        run_cli()
+    else:
+        main()
\ No newline at end of file
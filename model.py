@@ -1,25 +1,34 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from typing import List, Optional
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import KFold, RandomizedSearchCV
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
+import tracing
+from roster_tensor import RosterTensor, load_roster_tensor
+from feature_engine import (
+    FEATURE_STATS,
+    SHOOTING_STATS,
+    ADVANCED_STATS,
+    compute_team_feature_arrays,
+    count_players,
+    effective_fg,
+    player_columns,
+    true_shooting,
+)
 
 
 model_path = "win_model.pkl"
 
-#Player stat features (I took out games played because it seemed to create strange predictions)
-FEATURE_STATS = ["MIN", "PTS", "AST", "REB", "STL", "BLK", "TOV"]
-
-#Advanced shooting stats for efficiency metrics
-SHOOTING_STATS = ["FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
-
 def compute_advanced_metrics(df):
     """
     Calculate advanced efficiency metrics: eFG% and TS%
     """
-    for i in range(1, 6):
+    for i in range(1, count_players(df.columns, default=5) + 1):
         fgm_col = f"P{i}_FGM"
         fga_col = f"P{i}_FGA"
         fg3m_col = f"P{i}_FG3M"
@@ -29,18 +38,16 @@ def compute_advanced_metrics(df):
         
         # Effective Field Goal Percentage: Formula Gemini threw - (FGM + 0.5 * FG3M) / FGA
         if fgm_col in df.columns and fga_col in df.columns and fg3m_col in df.columns:
-            df[f"P{i}_EFG"] = np.where(
-                df[fga_col] > 0,
-                (df[fgm_col] + 0.5 * df[fg3m_col]) / df[fga_col],
-                0.0
+            df[f"P{i}_EFG"] = effective_fg(
+                df[fgm_col].to_numpy(dtype=float), df[fga_col].to_numpy(dtype=float),
+                df[fg3m_col].to_numpy(dtype=float),
             )
         
         # True Shooting Percentage: Formula Gemini threw - PTS / (2 * (FGA + 0.44 * FTA))
         if pts_col in df.columns and fga_col in df.columns and fta_col in df.columns:
-            df[f"P{i}_TS"] = np.where(
-                (df[fga_col] + 0.44 * df[fta_col]) > 0,
-                df[pts_col] / (2 * (df[fga_col] + 0.44 * df[fta_col])),
-                0.0
+            df[f"P{i}_TS"] = true_shooting(
+                df[pts_col].to_numpy(dtype=float), df[fga_col].to_numpy(dtype=float),
+                df[fta_col].to_numpy(dtype=float),
             )
     
     return df
@@ -48,87 +55,322 @@ def compute_advanced_metrics(df):
 def compute_team_features(df):
     """
     Takes raw player stats and adds aggregated features:
+    team average, total, top-2 and per-36 for every stat, plus EFG/TS when
+    shooting stats are present. The math lives in feature_engine.
+    A RosterTensor gives just the TEAM_* columns (and Wins).
     """
+    if isinstance(df, RosterTensor):
+        tracing.incr("feature_rows", len(df))
+        with tracing.span("features.compute_team_features", rows=len(df)):
+            return df.team_features()
+
     if any(f"P1_{stat}" in df.columns for stat in SHOOTING_STATS):
         df = compute_advanced_metrics(df)
-    
-    for stat in FEATURE_STATS:
-        player_cols = [f"P{i}_{stat}" for i in range(1, 6)]
-        
-        if not all(col in df.columns for col in player_cols):
-            continue
 
-        #Team averages and totals
-        df[f"TEAM_AVG_{stat}"]   = df[player_cols].mean(axis=1)
-        df[f"TEAM_TOTAL_{stat}"] = df[player_cols].sum(axis=1)
+    tracing.incr("feature_rows", len(df))
+    n_players = count_players(df.columns, default=5)
 
-        #Top 2 for star power
-        df[f"TEAM_TOP2_{stat}"] = df[player_cols].apply(
-            lambda row: row.nlargest(2).sum(), axis=1
-        )
-        #Per 36 minutes averages
-        if stat != "MIN":
-            total_stat = df[player_cols].sum(axis=1)
-            total_min = df[[f"P{i}_MIN" for i in range(1, 6)]].sum(axis=1)
-            df[f"TEAM_AVG_{stat}_P36"] = (total_stat / total_min.replace(0, pd.NA)) * 36
-    
-    # Process advanced metrics if available
-    for adv_stat in ["EFG", "TS"]:
-        player_cols = [f"P{i}_{adv_stat}" for i in range(1, 6)]
-        
-        if all(col in df.columns for col in player_cols):
-            #Team averages for efficiency metrics
-            df[f"TEAM_AVG_{adv_stat}"] = df[player_cols].mean(axis=1)
-            df[f"TEAM_TOTAL_{adv_stat}"] = df[player_cols].sum(axis=1)
-            df[f"TEAM_TOP2_{adv_stat}"] = df[player_cols].apply(
-                lambda row: row.nlargest(2).sum(), axis=1
-            )
+    #Only stats that every player slot has can be aggregated
+    stats = [
+        stat for stat in FEATURE_STATS + SHOOTING_STATS + ADVANCED_STATS
+        if all(f"P{i}_{stat}" in df.columns for i in range(1, n_players + 1))
+    ]
+    if not stats:
+        return df
+
+    values = df[player_columns(n_players, stats)].to_numpy(dtype=float)
+    values = values.reshape(len(df), n_players, len(stats))
+
+    with tracing.span("features.compute_team_features", rows=len(df)):
+        features = pd.DataFrame(compute_team_feature_arrays(values, stats), index=df.index)
+
+    df = df.drop(columns=[c for c in features.columns if c in df.columns])
+    return pd.concat([df, features], axis=1)
+
+
+#Bump when the feature code changes in a way the source fingerprint can't see
+FEATURE_CODE_VERSION = 1
+
+#Where engineered training matrices are cached (override with NBA_FEATURE_CACHE)
+FEATURE_CACHE_DIR = os.environ.get("NBA_FEATURE_CACHE", os.path.join(".nba_cache", "features"))
+
+
+def _feature_code_fingerprint() -> str:
+    """Hash of the code that turns data.csv into features, so edits invalidate the cache"""
+    import feature_engine
+    import roster_tensor
+
+    digest = hashlib.sha256(str(FEATURE_CODE_VERSION).encode())
+    for source in (feature_engine, roster_tensor, compute_advanced_metrics, compute_team_features):
+        digest.update(inspect.getsource(source).encode())
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    return df
 
+def training_matrix_key(data_path: str) -> str:
+    """Cache key: hash of the input file's bytes and of the feature code"""
+    digest = hashlib.sha256((_file_digest(data_path) + _feature_code_fingerprint()).encode())
+    return digest.hexdigest()[:24]
 
-def train_model():
-    df = pd.read_csv("data.csv")
 
-    df = compute_team_features(df)
+def load_training_matrix(data_path: str = "data.csv", cache_dir: str = FEATURE_CACHE_DIR,
+                         use_cache: bool = True):
+    """
+    Returns (X, y, feature_cols) for training.
+
+    X is the float32 TEAM_* feature matrix and y the win totals. Both are cached as
+    .npy files under a key made from the input file's contents and the feature code,
+    so repeated trainings skip feature engineering and X is memory-mapped (zero-copy)
+    straight from disk.
+    """
+    key_dir = os.path.join(cache_dir, training_matrix_key(data_path)) if use_cache else None
 
-    y = df["Wins"].astype(float)
+    if key_dir is not None and os.path.exists(os.path.join(key_dir, "features.json")):
+        tracing.incr("feature_cache_hits")
+        with open(os.path.join(key_dir, "features.json"), "r") as f:
+            feature_cols = json.load(f)
+        X = np.load(os.path.join(key_dir, "X.npy"), mmap_mode="r")
+        y = np.load(os.path.join(key_dir, "y.npy"))
+        return X, y, feature_cols
+
+    #float32 (teams x players x stats) instead of the wide float64/object frame
+    df = compute_team_features(load_roster_tensor(data_path))
+    y = df["Wins"].to_numpy(dtype=np.float64)
     feature_cols = [c for c in df.columns if c.startswith("TEAM_")]
-    X = df[feature_cols].astype(float)
-
-    param_dist = {
-        "n_estimators": [200, 300, 500, 800],
-        "learning_rate": [0.01, 0.02, 0.03, 0.05],
-        "max_depth": [2, 3, 4],
-        "min_samples_leaf": [1, 2, 3],
-        "subsample": [0.8, 1.0],
-    }
+    X = df[feature_cols].astype(float).to_numpy(dtype=np.float32)
 
-    gb = GradientBoostingRegressor(random_state=42)
+    if key_dir is not None:
+        tracing.incr("feature_cache_misses")
+        #Write everything to a temp dir first so a half-written entry is never picked up
+        tmp_dir = f"{key_dir}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        np.save(os.path.join(tmp_dir, "X.npy"), X)
+        np.save(os.path.join(tmp_dir, "y.npy"), y)
+        with open(os.path.join(tmp_dir, "features.json"), "w") as f:
+            json.dump(feature_cols, f)
+        try:
+            os.replace(tmp_dir, key_dir)
+        except OSError:
+            #Another process cached the same key first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    kf = KFold(n_splits=5, shuffle=True, random_state=42)
+    return X, y, feature_cols
 
-    search = RandomizedSearchCV(
-        gb,
-        param_distributions=param_dist,
-        n_iter=25,
-        cv=kf,
-        scoring="r2",
-        random_state=42,
-        n_jobs=-1,
-    )
 
-    search.fit(X, y)
+#Search space for the default GradientBoostingRegressor backend
+GBR_PARAM_DIST = {
+    "n_estimators": [200, 300, 500, 800],
+    "learning_rate": [0.01, 0.02, 0.03, 0.05],
+    "max_depth": [2, 3, 4],
+    "min_samples_leaf": [1, 2, 3],
+    "subsample": [0.8, 1.0],
+}
+
+#Search space for the HistGradientBoostingRegressor backend
+HIST_PARAM_DIST = {
+    "max_iter": [200, 300, 500, 800],
+    "learning_rate": [0.01, 0.02, 0.03, 0.05, 0.1],
+    "max_depth": [2, 3, 4, None],
+    "max_leaf_nodes": [7, 15, 31],
+    "min_samples_leaf": [5, 10, 20],
+    "l2_regularization": [0.0, 0.1, 1.0],
+}
+
+
+def make_estimator(backend: str = "gbr", early_stopping: bool = False, params: Optional[dict] = None,
+                   random_state: int = 42):
+    """Builds an unfitted regressor for the given backend ("gbr" or "hist")"""
+    params = dict(params or {})
+
+    if backend == "gbr":
+        from sklearn.ensemble import GradientBoostingRegressor
+        if early_stopping:
+            params.setdefault("n_iter_no_change", 10)
+            params.setdefault("validation_fraction", 0.1)
+        return GradientBoostingRegressor(random_state=random_state, **params)
+
+    if backend == "hist":
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        params.setdefault("early_stopping", early_stopping)
+        return HistGradientBoostingRegressor(random_state=random_state, **params)
+
+    raise ValueError(f"Unknown backend {backend!r}, expected 'gbr' or 'hist'")
+
+
+def calibrate(y, raw_pred):
+    """Fits wins = alpha + beta * raw_pred and returns (alpha, beta)"""
+    from sklearn.linear_model import LinearRegression
+
+    lr = LinearRegression()
+    lr.fit(np.asarray(raw_pred).reshape(-1, 1), y)
+    #bias term
+    alpha = float(lr.intercept_)
+    #scale term
+    beta = float(lr.coef_[0])
+    return alpha, beta
+
+
+def successive_halving_search(X, y, backend: str = "gbr", n_candidates: int = 24, factor: int = 3,
+                              cv: int = 3, deadline: Optional[float] = None, random_state: int = 42):
+    """
+    Successive-halving hyperparameter search.
+
+    Every candidate is scored on a small sample of the rows, the best 1/factor
+    move on to the next round with factor times more rows, until one candidate
+    (or the full data) is left. Candidates use early stopping. If the deadline
+    (a time.perf_counter() value) passes, the search stops and the best
+    candidate scored so far wins. The first round always runs to the end, so
+    even a budget that is already spent picks a scored candidate.
+
+    Returns (best_params, best_score, rounds, budget_exhausted).
+    """
+    from sklearn.model_selection import KFold, ParameterSampler, cross_val_score
+
+    param_dist = GBR_PARAM_DIST if backend == "gbr" else HIST_PARAM_DIST
+    candidates = list(ParameterSampler(param_dist, n_iter=n_candidates, random_state=random_state))
+
+    n_rounds = max(1, int(np.ceil(np.log(len(candidates)) / np.log(factor))) + 1)
+    min_samples = max(cv * 20, len(X) // factor ** (n_rounds - 1))
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(len(X))
+
+    rounds = []
+    best_params, best_score = candidates[0], -np.inf
+    budget_exhausted = False
+
+    for round_num in range(n_rounds):
+        n_samples = min(len(X), min_samples * factor ** round_num)
+        rows = order[:n_samples]
+        X_round = X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+        y_round = y.iloc[rows] if hasattr(y, "iloc") else y[rows]
+
+        start = time.perf_counter()
+        scores = []
+        for params in candidates:
+            if deadline is not None and round_num > 0 and time.perf_counter() > deadline:
+                budget_exhausted = True
+                break
+            est = make_estimator(backend, early_stopping=True, params=params, random_state=random_state)
+            cv_scores = cross_val_score(
+                est, X_round, y_round,
+                cv=KFold(n_splits=cv, shuffle=True, random_state=random_state),
+                scoring="r2", n_jobs=-1,
+            )
+            scores.append(float(np.mean(cv_scores)))
+
+        if scores:
+            ranked = np.argsort(scores)[::-1]
+            best_params, best_score = candidates[ranked[0]], scores[ranked[0]]
+            rounds.append({
+                "round": round_num,
+                "candidates": len(scores),
+                "samples": int(n_samples),
+                "best_cv_r2": best_score,
+                "seconds": time.perf_counter() - start,
+            })
+            candidates = [candidates[i] for i in ranked[:max(1, len(scores) // factor)]]
+
+        if budget_exhausted or (len(candidates) == 1 and n_samples == len(X)):
+            break
+
+    return best_params, best_score, rounds, budget_exhausted
+
+
+def print_training_report(report: dict):
+    """Prints the per-phase timings and CV scores from train_model"""
+    print(f"\nTraining report ({report['mode']} mode, {report['backend']} backend):")
+    for phase, seconds in report["phases"].items():
+        print(f"  {phase:<12} {seconds:8.2f}s")
+    print(f"  {'total':<12} {sum(report['phases'].values()):8.2f}s")
+
+    for round_info in report.get("rounds", []):
+        print(
+            f"  round {round_info['round']}: {round_info['candidates']} candidates on "
+            f"{round_info['samples']} rows, best CV R-Squared {round_info['best_cv_r2']:.4f} "
+            f"({round_info['seconds']:.2f}s)"
+        )
+    if report.get("budget_exhausted"):
+        print("  time budget ran out, kept the best candidate found so far")
+
+
+def train_model(data_path: str = "data.csv", model_path: str = model_path, mode: str = "full",
+                backend: str = "gbr", time_budget: Optional[float] = None, n_candidates: int = 24,
+                use_feature_cache: bool = True):
+    """
+    Tunes, fits, calibrates and saves the win model. Returns a timing/score report.
+
+    mode="full" runs the 25-candidate x 5-fold RandomizedSearchCV.
+    mode="fast" runs a successive-halving search with early stopping, optionally
+    capped at time_budget seconds of search. backend picks GradientBoostingRegressor
+    ("gbr") or HistGradientBoostingRegressor ("hist"). The feature matrix is reused
+    from the cache unless use_feature_cache is False.
+    """
+    #scikit-learn and joblib are only imported once training actually starts
+    import joblib
+    from sklearn.metrics import mean_squared_error, r2_score
+    from sklearn.model_selection import KFold, RandomizedSearchCV
+
+    phases = {}
+    report = {"mode": mode, "backend": backend, "phases": phases}
+    start = time.perf_counter()
+    deadline = start + time_budget if time_budget is not None else None
+
+    #Features come from the on-disk cache when data.csv and the feature code are unchanged
+    X_array, y_array, feature_cols = load_training_matrix(data_path, use_cache=use_feature_cache)
+    X = pd.DataFrame(X_array, columns=feature_cols, copy=False)
+    y = pd.Series(y_array, name="Wins")
+    phases["features"] = time.perf_counter() - start
+
+    tick = time.perf_counter()
+    if mode == "fast":
+        best_params, best_score, rounds, exhausted = successive_halving_search(
+            X, y, backend=backend, n_candidates=n_candidates, deadline=deadline,
+        )
+        report["rounds"] = rounds
+        report["budget_exhausted"] = exhausted
+        best_model = make_estimator(backend, early_stopping=True, params=best_params)
+
+    elif mode == "full":
+        param_dist = GBR_PARAM_DIST if backend == "gbr" else HIST_PARAM_DIST
 
-    print("Best CV R-Squared:", search.best_score_)
-    print("Best params:", search.best_params_)
+        kf = KFold(n_splits=5, shuffle=True, random_state=42)
 
-    best_model = search.best_estimator_
+        search = RandomizedSearchCV(
+            make_estimator(backend),
+            param_distributions=param_dist,
+            n_iter=25,
+            cv=kf,
+            scoring="r2",
+            random_state=42,
+            n_jobs=-1,
+        )
+
+        search.fit(X, y)
+        best_params, best_score = search.best_params_, search.best_score_
+
+        best_model = search.best_estimator_
+
+    else:
+        raise ValueError(f"Unknown mode {mode!r}, expected 'full' or 'fast'")
+    phases["search"] = time.perf_counter() - tick
+
+    print("Best CV R-Squared:", best_score)
+    print("Best params:", best_params)
 
     #Apply GradientBoosting to all of the training data after grid search
+    tick = time.perf_counter()
     best_model.fit(X, y)
+    phases["refit"] = time.perf_counter() - tick
 
     # Predictions
+    tick = time.perf_counter()
     raw_pred = best_model.predict(X)
     
     # RMSE
@@ -140,19 +382,14 @@ def train_model():
     print(f"  RMSE: {rmse_before:.2f} wins")
 
     # Calibration
-    raw_pred_reshaped = raw_pred.reshape(-1, 1)
-    lr = LinearRegression()
-    lr.fit(raw_pred_reshaped, y)
-    #bias term
-    alpha = float(lr.intercept_)
-    #scale term  
-    beta = float(lr.coef_[0])       
+    alpha, beta = calibrate(y, raw_pred)
 
     calibrated_pred = alpha + beta * raw_pred
     
     # Calculate metrics after calibration
     rmse_after = np.sqrt(mean_squared_error(y, calibrated_pred))
     r2_after = r2_score(y, calibrated_pred)
+    phases["calibrate"] = time.perf_counter() - tick
     
     print(f"\nCalibration: Wins = {alpha:.3f} + {beta:.3f} * raw_pred")
     print(f"\nModel Performance (After Calibration):")
@@ -160,6 +397,7 @@ def train_model():
     print(f"  RMSE: {rmse_after:.2f} wins")
 
     #Save model, features, and calibration params
+    tick = time.perf_counter()
     joblib.dump(
         {
             "model": best_model,
@@ -168,15 +406,379 @@ def train_model():
             "beta": beta,
             "rmse": rmse_after,
             "r2": r2_after,
+            "params": best_params,
+            "backend": backend,
         },
         model_path,
     )
+    #Flat-array copy for the fast NumPy evaluator (engine="flat")
+    export_flat_model(model_path)
+    phases["save"] = time.perf_counter() - tick
     print(f"\nSaved tuned model + calibration to {model_path}")
 
+    report.update({
+        "best_params": best_params,
+        "cv_r2": float(best_score),
+        "r2": float(r2_after),
+        "rmse": float(rmse_after),
+    })
+    print_training_report(report)
+    return report
+
+
+def _bundle_nbytes(bundle) -> int:
+    """Rough in-memory size of a bundle: the node/value arrays of every fitted tree"""
+    model = bundle["model"]
+    total = 0
+
+    #GradientBoostingRegressor keeps a 2-D array of DecisionTreeRegressors
+    for est in np.ravel(getattr(model, "estimators_", [])):
+        state = est.tree_.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+
+    #HistGradientBoostingRegressor keeps TreePredictors
+    for predictors in getattr(model, "_predictors", []):
+        for predictor in predictors:
+            total += predictor.nodes.nbytes
+
+    return total
 
-def load_model(model_path: str = model_path):
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded model bundles.
+
+    Each bundle is unpickled once and reused until its file changes on disk
+    (checked by mtime and size on every lookup). Several named versions can be
+    registered side by side.
+    """
+
+    def __init__(self, mmap_mode=None):
+        self.mmap_mode = mmap_mode
+        self._paths = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str):
+        """Registers a named model version (e.g. "v2" -> "models/win_model_v2.pkl")"""
+        with self._lock:
+            self._paths[name] = path
+            self._entries.pop(name, None)
+
+    def get(self, name: str = "default") -> dict:
+        """Returns the bundle for a registered name, loading or reloading it if needed"""
+        path = self._paths.get(name)
+        if path is None:
+            raise KeyError(f"No model registered under {name!r}")
+
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry["signature"] == signature and entry["path"] == path:
+                return entry["bundle"]
+
+            start = time.perf_counter()
+            import joblib
+            with tracing.span("model.joblib_load", path=path):
+                bundle = joblib.load(path, mmap_mode=self.mmap_mode)
+            load_seconds = time.perf_counter() - start
+
+            self._entries[name] = {
+                "path": path,
+                "signature": signature,
+                "bundle": bundle,
+                "load_seconds": load_seconds,
+                "memory_bytes": _bundle_nbytes(bundle),
+                "file_bytes": stat.st_size,
+                "loads": (entry["loads"] + 1) if entry is not None else 1,
+            }
+            return bundle
+
+    def load(self, path: str) -> dict:
+        """Returns the bundle stored at path, registering the path as its own name"""
+        if self._paths.get(path) != path:
+            self.register(path, path)
+        return self.get(path)
+
+    def stats(self) -> List[dict]:
+        """Load time and memory for every loaded bundle"""
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "path": entry["path"],
+                    "load_seconds": entry["load_seconds"],
+                    "memory_bytes": entry["memory_bytes"],
+                    "file_bytes": entry["file_bytes"],
+                    "loads": entry["loads"],
+                }
+                for name, entry in self._entries.items()
+            ]
+
+    def clear(self):
+        """Drops every loaded bundle (registrations are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+
+_registry = ModelRegistry(mmap_mode=os.environ.get("NBA_MODEL_MMAP") or None)
+
+
+def get_registry() -> ModelRegistry:
+    """Returns the process-wide model registry"""
+    return _registry
+
+
+def flat_model_path(model_path: str = model_path) -> str:
+    """Where the flat-array export of a model bundle lives (win_model.pkl -> win_model.npz)"""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def export_flat_model(model_path: str = model_path, flat_path: Optional[str] = None) -> str:
+    """
+    Flattens the saved model and its alpha/beta calibration into contiguous arrays
+    (see flat_ensemble.py) and writes them as an .npz next to the bundle.
+    Returns the path written.
+    """
+    from flat_ensemble import flatten_ensemble, save_flat_model
+
+    flat_path = flat_path or flat_model_path(model_path)
+    model, features, alpha, beta = load_model(model_path)
+    save_flat_model(flat_path, flatten_ensemble(model), features, alpha, beta)
+    return flat_path
+
+
+def previous_model_path(model_path: str = model_path) -> str:
+    """Where update_model keeps the bundle it replaced (win_model.pkl -> win_model.prev.pkl)"""
+    return os.path.splitext(model_path)[0] + ".prev.pkl"
+
+
+def _link_or_copy(src: str, dst: str):
+    """Makes dst (a scratch path) the same file as src, a hard link when the filesystem allows"""
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _n_trees(model) -> int:
+    return model.n_iter_ if hasattr(model, "n_iter_") else model.n_estimators_
+
+
+def update_model(data_path: str = "data.csv", model_path: str = model_path,
+                 extra_estimators: Optional[int] = None) -> dict:
+    """
+    Incrementally updates the saved model on an extended data.csv (e.g. a new season
+    appended) instead of rerunning the hyperparameter search.
+
+    The saved model keeps its tuned parameters and trees and is warm-started with
+    extra_estimators more trees (default: 10% of the current count) fitted on the
+    new data, then alpha/beta are refitted. The bundle it replaces is kept as
+    win_model.prev.pkl, see rollback_model. Returns a report like train_model.
+    """
+    import joblib
+    from sklearn.metrics import mean_squared_error, r2_score
+
+    start = time.perf_counter()
+    phases = {}
+
+    #Fresh copy, the registry's bundle may be in use elsewhere in the process
     bundle = joblib.load(model_path)
     model = bundle["model"]
+    backend = bundle.get("backend", "gbr")
+
+    X_array, y_array, feature_cols = load_training_matrix(data_path)
+    if list(feature_cols) != list(bundle["features"]):
+        raise ValueError(f"{data_path} doesn't produce the features {model_path} was trained on, run a full train")
+    X = pd.DataFrame(X_array, columns=feature_cols, copy=False)
+    y = pd.Series(y_array, name="Wins")
+    phases["features"] = time.perf_counter() - start
+
+    old_trees = _n_trees(model)
+    if extra_estimators is None:
+        extra_estimators = max(10, old_trees // 10)
+    rmse_old = np.sqrt(mean_squared_error(y, bundle.get("alpha", 0.0) + bundle.get("beta", 1.0) * model.predict(X)))
+
+    #Both backends keep their fitted trees and only add new ones with warm_start.
+    #Early stopping (fast mode) is switched off meanwhile, it would cut the extra trees short
+    tick = time.perf_counter()
+    size_param = "max_iter" if backend == "hist" else "n_estimators"
+    stopping_param = "early_stopping" if backend == "hist" else "n_iter_no_change"
+    stopping = model.get_params()[stopping_param]
+    model.set_params(warm_start=True, **{size_param: old_trees + extra_estimators,
+                                         stopping_param: False if backend == "hist" else None})
+    with tracing.span("model.update_fit", rows=len(X), extra=extra_estimators):
+        model.fit(X, y)
+    model.set_params(warm_start=False, **{stopping_param: stopping})
+    if _n_trees(model) != old_trees + extra_estimators:
+        raise RuntimeError(f"Expected {old_trees + extra_estimators} trees after the update, got {_n_trees(model)}")
+    phases["fit"] = time.perf_counter() - tick
+
+    tick = time.perf_counter()
+    raw_pred = model.predict(X)
+    alpha, beta = calibrate(y, raw_pred)
+    calibrated_pred = alpha + beta * raw_pred
+    rmse = np.sqrt(mean_squared_error(y, calibrated_pred))
+    r2 = r2_score(y, calibrated_pred)
+    phases["calibrate"] = time.perf_counter() - tick
+
+    params = dict(bundle.get("params") or {})
+    params[size_param] = _n_trees(model)
+    bundle.update({
+        "model": model,
+        "alpha": alpha,
+        "beta": beta,
+        "rmse": rmse,
+        "r2": r2,
+        "params": params,
+        "updates": bundle.get("updates", 0) + 1,
+    })
+
+    #The current bundle is linked to prev first and the new one is written next to it,
+    #so one os.replace swaps it in and model_path always exists in full
+    tick = time.perf_counter()
+    prev_path = previous_model_path(model_path)
+    _link_or_copy(model_path, prev_path + ".tmp")
+    os.replace(prev_path + ".tmp", prev_path)
+    tmp_path = model_path + ".tmp"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, model_path)
+    export_flat_model(model_path)
+    phases["save"] = time.perf_counter() - tick
+    phases["total"] = time.perf_counter() - start
+
+    print(f"Added {_n_trees(model) - old_trees} trees ({old_trees} -> {_n_trees(model)}) on {len(X)} rows")
+    print(f"Calibration: Wins = {alpha:.3f} + {beta:.3f} * raw_pred")
+    print(f"RMSE: {rmse_old:.2f} -> {rmse:.2f} wins, R² Score: {r2:.4f}")
+    for phase, seconds in phases.items():
+        print(f"  {phase:<16} {seconds:.2f}s")
+    print(f"Saved to {model_path}, previous model kept as {previous_model_path(model_path)}")
+
+    from intervals import intervals_path
+    if os.path.exists(intervals_path(model_path)):
+        print(f"WARNING - {intervals_path(model_path)} was trained for the previous model, "
+              f"rerun `python model.py --export-only --intervals` to refresh it")
+
+    return {
+        "mode": "update",
+        "backend": backend,
+        "phases": phases,
+        "trees": _n_trees(model),
+        "r2": float(r2),
+        "rmse": float(rmse),
+    }
+
+
+def rollback_model(model_path: str = model_path) -> str:
+    """
+    Swaps the model with the one update_model replaced (so a second rollback
+    undoes the first) and re-exports the flat copy. Returns the model path.
+    """
+    prev_path = previous_model_path(model_path)
+    if not os.path.exists(prev_path):
+        raise FileNotFoundError(f"No previous model at {prev_path}")
+
+    #Both sides are staged as scratch files first, then each moves into place with one
+    #os.replace: model_path never goes missing and a crash in between leaves prev.tmp behind
+    current_tmp = prev_path + ".tmp"
+    _link_or_copy(model_path, current_tmp)
+    #A fresh copy (not a link) gets a new mtime, so loaded registries notice the change
+    tmp_path = model_path + ".tmp"
+    shutil.copyfile(prev_path, tmp_path)
+    os.replace(tmp_path, model_path)
+    os.replace(current_tmp, prev_path)
+    export_flat_model(model_path)
+    return model_path
+
+
+def _fit_bootstrap_member(X, y, backend: str, params: dict, seed: int):
+    """
+    Fits one interval-ensemble member on a bootstrap sample of the rows.
+    Returns (flattened trees, alpha, beta, out-of-bag residuals).
+    """
+    from flat_ensemble import flatten_ensemble
+
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(X), len(X))
+    oob = np.setdiff1d(np.arange(len(X)), rows)
+
+    #X is a read-only memmap shared with the other workers, only the sample is copied
+    X_boot, y_boot = np.asarray(X[rows]), y[rows]
+    est = make_estimator(backend, params=params, random_state=seed)
+    est.fit(X_boot, y_boot)
+    alpha, beta = calibrate(y_boot, est.predict(X_boot))
+
+    residuals = np.empty(0)
+    if len(oob):
+        residuals = y[oob] - (alpha + beta * est.predict(np.asarray(X[oob])))
+    return flatten_ensemble(est), alpha, beta, residuals
+
+
+def train_intervals(model_path: str = model_path, data_path: str = "data.csv", n_members: int = 20,
+                    n_jobs: int = -1, random_state: int = 42, n_residual_quantiles: int = 39) -> str:
+    """
+    Trains a bootstrap ensemble for prediction intervals and saves it next to the model.
+
+    Members reuse the saved bundle's backend and tuned parameters and are fitted
+    in parallel with joblib. The training matrix comes from the feature cache as
+    a memory-mapped .npy, so workers read it from disk instead of getting a
+    pickled copy. The result (all members flattened, their calibrations and a
+    grid of out-of-bag residual quantiles) is one compressed .npz, see intervals.py.
+    Returns its path.
+    """
+    from joblib import Parallel, delayed
+    from flat_ensemble import concat_ensembles, save_flat_model
+    from intervals import intervals_path
+
+    bundle = _registry.load(model_path)
+    backend = bundle.get("backend", "gbr")
+    params = bundle.get("params") or {}
+
+    X, y, feature_cols = load_training_matrix(data_path)
+    if list(feature_cols) != list(bundle["features"]):
+        raise ValueError(f"{data_path} doesn't produce the features {model_path} was trained on")
+
+    seeds = [int(seq.generate_state(1)[0]) for seq in np.random.SeedSequence(random_state).spawn(n_members)]
+
+    start = time.perf_counter()
+    with tracing.span("model.train_intervals", members=n_members):
+        members = Parallel(n_jobs=n_jobs, max_nbytes="1M", mmap_mode="r")(
+            delayed(_fit_bootstrap_member)(X, y, backend, params, seed) for seed in seeds
+        )
+
+    arrays = concat_ensembles([flat for flat, _, _, _ in members])
+    arrays["member_alpha"] = np.array([alpha for _, alpha, _, _ in members])
+    arrays["member_beta"] = np.array([beta for _, _, beta, _ in members])
+
+    #Centered quantiles of every member's out-of-bag errors
+    residuals = np.concatenate([res for _, _, _, res in members])
+    grid = np.linspace(0.5 / n_residual_quantiles, 1 - 0.5 / n_residual_quantiles, n_residual_quantiles)
+    arrays["residual_grid"] = np.quantile(residuals, grid) - np.median(residuals)
+
+    path = intervals_path(model_path)
+    save_flat_model(path, arrays, feature_cols, bundle.get("alpha", 0.0), bundle.get("beta", 1.0), compressed=True)
+
+    print(
+        f"\nTrained {n_members} interval members in {time.perf_counter() - start:.1f}s "
+        f"(out-of-bag RMSE {np.sqrt(np.mean(residuals ** 2)):.2f} wins), saved to {path}"
+    )
+    return path
+
+
+def load_model(model_path: str = model_path, name: Optional[str] = None):
+    """
+    Returns (model, features, alpha, beta), loading the bundle only once per process.
+    Pass name to use a version registered with get_registry().register().
+    """
+    if name is not None:
+        bundle = _registry.get(name)
+    else:
+        bundle = _registry.load(model_path)
+    model = bundle["model"]
     features = bundle["features"]
     alpha = bundle.get("alpha", 0.0)
     beta = bundle.get("beta", 1.0)
@@ -184,4 +786,39 @@ def load_model(model_path: str = model_path):
 
 
 if __name__ == "__main__":
-    train_model()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the win model")
+    parser.add_argument("--data", default="data.csv")
+    parser.add_argument("--output", default=model_path)
+    parser.add_argument("--fast", action="store_true", help="Successive-halving search with early stopping")
+    parser.add_argument("--backend", choices=["gbr", "hist"], default="gbr")
+    parser.add_argument("--time-budget", type=float, help="Seconds allowed for the search (fast mode)")
+    parser.add_argument("--export-only", action="store_true",
+                        help="Don't train, just write the flat-array .npz for an existing --output model")
+    parser.add_argument("--intervals", type=int, nargs="?", const=20, metavar="MEMBERS",
+                        help="Also train a bootstrap ensemble (default 20 members) for p10/p50/p90 predictions")
+    parser.add_argument("--jobs", type=int, default=-1, help="Processes for the interval ensemble")
+    parser.add_argument("--update", action="store_true",
+                        help="Warm-start the saved model with more trees on --data instead of searching again")
+    parser.add_argument("--extra-estimators", type=int, help="Trees to add with --update (default 10%% more)")
+    parser.add_argument("--rollback", action="store_true", help="Restore the model --update replaced")
+    args = parser.parse_args()
+
+    if args.rollback:
+        print(f"Restored the previous model to {rollback_model(args.output)}")
+    elif args.update:
+        update_model(args.data, args.output, extra_estimators=args.extra_estimators)
+    elif args.export_only:
+        print(f"Exported {export_flat_model(args.output)}")
+    else:
+        train_model(
+            data_path=args.data,
+            model_path=args.output,
+            mode="fast" if args.fast else "full",
+            backend=args.backend,
+            time_budget=args.time_budget,
+        )
+
+    if args.intervals:
+        train_intervals(args.output, args.data, n_members=args.intervals, n_jobs=args.jobs)
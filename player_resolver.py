@@ -0,0 +1,148 @@
+'''
+Indexed player-name lookup.
+
+Replaces players.find_players_by_full_name (a regex scan over every player)
+with indexes that are built once: an exact-name hash and a trigram index for
+substring and fuzzy matches. Names are folded so accents and
+punctuation don't matter ("Nikola Jokić" == "nikola jokic",
+"Shai Gilgeous-Alexander" == "shai gilgeous alexander").
+
+Fuzzy matching is opt-in (fuzzy=True, or NBA_FUZZY_NAMES=1 for the shared
+resolver), since it happily turns an unknown name into a different real
+player. substituted_name tells callers when a match isn't the name they asked for.
+'''
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+
+#Punctuation that is dropped (P.J. -> pj, D'Angelo -> dangelo), everything else non-alphanumeric splits words
+_DROP_CHARS = re.compile(r"[.'’`]")
+_SPLIT_CHARS = re.compile(r"[^a-z0-9]+")
+
+#Minimum trigram similarity for a fuzzy match
+FUZZY_THRESHOLD = 0.45
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    folded = unicodedata.normalize("NFKD", str(name))
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    folded = _DROP_CHARS.sub("", folded)
+    return _SPLIT_CHARS.sub(" ", folded).strip()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PlayerResolver:
+    """
+    Resolves player names to nba_api player dicts using indexes built once.
+
+    Lookup order: exact normalized name, then names containing the query (what
+    the old regex search did, first match in list order), then, only when fuzzy
+    matching is on, the closest name by trigram similarity.
+    """
+
+    def __init__(self, player_list: Optional[List[dict]] = None, fuzzy: bool = False):
+        self.fuzzy = fuzzy
+        if player_list is None:
+            from nba_api.stats.static import players
+            player_list = players.get_players()
+
+        self.players = list(player_list)
+        self.normalized = [normalize_name(p["full_name"]) for p in self.players]
+
+        #Exact index: normalized name -> player positions (in list order)
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.normalized):
+            self._exact[name].append(i)
+
+        #Trigram index over " name " so word starts/ends get their own trigrams
+        self._trigram_index: Dict[str, set] = defaultdict(set)
+        self._trigram_sets = []
+        for i, name in enumerate(self.normalized):
+            grams = _trigrams(f" {name} ")
+            self._trigram_sets.append(grams)
+            for gram in grams:
+                self._trigram_index[gram].add(i)
+
+        self._memo: Dict[tuple, Optional[dict]] = {}
+
+    def _substring_matches(self, query: str) -> List[int]:
+        grams = _trigrams(query)
+        if not grams:
+            #One or two characters, too short for the index
+            return [i for i, name in enumerate(self.normalized) if query in name]
+
+        postings = sorted((self._trigram_index.get(g, set()) for g in grams), key=len)
+        candidates = set.intersection(*postings) if postings[0] else set()
+        return sorted(i for i in candidates if query in self.normalized[i])
+
+    def _fuzzy_match(self, query: str) -> Optional[int]:
+        grams = _trigrams(f" {query} ")
+        scores = defaultdict(int)
+        for gram in grams:
+            for i in self._trigram_index.get(gram, ()):
+                scores[i] += 1
+
+        best, best_key = None, None
+        for i, shared in scores.items():
+            #Dice coefficient between the two trigram sets
+            score = 2 * shared / (len(grams) + len(self._trigram_sets[i]))
+            key = (score, self.players[i].get("is_active", False), -i)
+            if score >= FUZZY_THRESHOLD and (best_key is None or key > best_key):
+                best, best_key = i, key
+        return best
+
+    def find(self, name: str) -> List[dict]:
+        """All exact or substring matches, in list order (like find_players_by_full_name)"""
+        query = normalize_name(name)
+        if not query:
+            return []
+        positions = self._exact.get(query) or self._substring_matches(query)
+        return [self.players[i] for i in positions]
+
+    def resolve(self, name: str, fuzzy: Optional[bool] = None) -> Optional[dict]:
+        """Best single match for a name, or None. fuzzy defaults to the resolver's setting."""
+        fuzzy = self.fuzzy if fuzzy is None else fuzzy
+        query = normalize_name(name)
+        if (query, fuzzy) in self._memo:
+            return self._memo[(query, fuzzy)]
+
+        match = None
+        if query:
+            positions = self._exact.get(query) or self._substring_matches(query)
+            if positions:
+                match = self.players[positions[0]]
+            elif fuzzy:
+                best = self._fuzzy_match(query)
+                match = self.players[best] if best is not None else None
+
+        self._memo[(query, fuzzy)] = match
+        return match
+
+    def resolve_many(self, names: Iterable[str], fuzzy: Optional[bool] = None) -> List[Optional[dict]]:
+        """Resolves a batch of names; repeated names are only looked up once"""
+        return [self.resolve(name, fuzzy=fuzzy) for name in names]
+
+
+def substituted_name(name: str, match: Optional[dict]) -> Optional[str]:
+    """The matched player's full name when it isn't just `name` spelled differently, else None"""
+    if match is None or normalize_name(match["full_name"]) == normalize_name(name):
+        return None
+    return match["full_name"]
+
+
+_default_resolver = None
+
+
+def get_resolver() -> PlayerResolver:
+    """Returns the process-wide resolver, building its indexes on first use"""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = PlayerResolver(fuzzy=os.environ.get("NBA_FUZZY_NAMES") == "1")
+    return _default_resolver
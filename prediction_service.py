@@ -0,0 +1,651 @@
+'''
+Long-running prediction service.
+
+A small asyncio HTTP/1.1 server that keeps the model bundle and the player stats
+warm between requests:
+
+    POST /predict  {"players": [5 names or IDs]}  or  {"rosters": [{"name": ..., "players": [...]}, ...]}
+    POST /compare  {"rosters": [...]}            (every roster against the first one)
+    POST /explain  {"players": [...], "top_n": 3}   (per-feature win contributions)
+    POST /swap     {"players": [...], "slot": 3, "candidates": [...], "top_n": 20}
+                   (candidates for one slot, ranked by win delta)
+    GET  /health
+
+Rosters from concurrent requests that arrive within a couple of milliseconds are
+scored together in one model.predict call (micro-batching), and concurrent
+requests for the same player share one stat fetch. Stats come from
+main.get_player_stats unless a different source is given, e.g. a CSV of player
+stat lines for testing without the NBA API:
+
+    python prediction_service.py serve --port 8482
+    python prediction_service.py serve --stats-csv .nba_cache/league_player_stats_2025-26.csv
+    python prediction_service.py loadtest --concurrency 200 --requests 5000 --players 201939 2544 ...
+'''
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import (
+    FEATURE_STATS,
+    SHOOTING_STATS,
+    partial_team_aggregates,
+    swap_feature_matrix,
+    team_feature_matrix,
+)
+from stats_cache import DEFAULT_TTL
+import model as win_model
+import tracing
+
+
+ROSTER_SIZE = 5
+
+#Stats gathered per player, in the order of the stat axis
+STAT_NAMES = FEATURE_STATS + SHOOTING_STATS
+
+#Biggest request body we accept (bytes)
+MAX_BODY = 1 << 20
+
+#Most replacement candidates in one /swap request
+MAX_SWAP_CANDIDATES = 5000
+
+
+class RequestError(Exception):
+    """Bad request, reported to the caller with a 4xx status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_top_n(body: dict, default: Optional[int]) -> Optional[int]:
+    """body["top_n"] as a positive int (default when it isn't given)"""
+    value = body.get("top_n", default)
+    if value is None:
+        return None
+    try:
+        top_n = int(value)
+    except (TypeError, ValueError):
+        raise RequestError('"top_n" must be a whole number')
+    if top_n < 1:
+        raise RequestError('"top_n" must be at least 1')
+    return top_n
+
+
+def csv_stats_source(path: str) -> Callable:
+    """
+    Stats source backed by a CSV of per-game stat lines indexed by PLAYER_ID
+    (the league table layout), for running the service without the NBA API.
+    """
+    table = pd.read_csv(path, index_col="PLAYER_ID")
+
+    def get_stats(player_id):
+        try:
+            return table.loc[int(player_id)]
+        except KeyError:
+            raise LookupError(f"No stats for player {player_id}")
+
+    return get_stats
+
+
+class MicroBatcher:
+    """
+    Collects rosters submitted within max_wait seconds of each other (or until
+    max_batch are waiting) and scores them with one call to score_batch.
+    score_batch runs on executor (the loop's default when None), so the event
+    loop keeps serving while a batch is predicted.
+    """
+
+    def __init__(self, score_batch: Callable, max_batch: int = 256, max_wait: float = 0.002,
+                 executor=None):
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.executor = executor
+
+        self._pending = []
+        self._timer = None
+        #Batches being scored, referenced until they finish
+        self._running = set()
+
+    async def submit(self, values: np.ndarray):
+        """Queues one (players x stats) array and waits for its score"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        tracing.incr("service_batches")
+        tracing.incr("service_batched_rows", len(pending))
+        task = asyncio.ensure_future(self._score(pending))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _score(self, pending):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, self.score_batch, np.stack([values for values, _ in pending])
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class PredictionService:
+    """
+    Request handling for the HTTP server: player lookups, deduplicated stat
+    fetches and micro-batched scoring against a warm model.
+
+    get_stats(player_id) returns a per-game stat line (a Series or dict) and
+    defaults to main.get_player_stats. It runs on a thread pool, since the
+    default source can block on the NBA API. Predictions run on their own
+    thread, one batch at a time, while the event loop keeps taking requests.
+    """
+
+    def __init__(self, model_path: str = win_model.model_path, get_stats: Optional[Callable] = None,
+                 max_batch: int = 256, max_wait: float = 0.002, fetch_workers: int = 8,
+                 stats_ttl: float = DEFAULT_TTL):
+        if get_stats is None:
+            from main import get_player_stats as get_stats
+
+        self.model_path = model_path
+        self.get_stats = get_stats
+        self.stats_ttl = stats_ttl
+        self._score_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score")
+        self.batcher = MicroBatcher(self._score_batch, max_batch, max_wait, self._score_executor)
+
+        #player_id -> (stat array, fetched_at), and fetches currently running
+        self._player_values: Dict[int, tuple] = {}
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="stats")
+
+        self.latencies = deque(maxlen=10_000)
+        self.requests = 0
+
+    def warm(self):
+        """Loads the model (and the season stats table when that is the source) before serving"""
+        #One throwaway prediction so the first real batch doesn't pay for sklearn's warm-up
+        self._score_batch(np.ones((1, ROSTER_SIZE, len(STAT_NAMES))))
+
+        if getattr(self.get_stats, "__module__", None) == "main":
+            from league_stats import get_season_store
+            try:
+                get_season_store().load()
+            except Exception as e:
+                print(f"WARNING - Could not preload the season stats table: {e}")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._score_executor.shutdown(wait=False)
+
+    #---- scoring ----
+
+    def _score_batch(self, values: np.ndarray) -> np.ndarray:
+        """Calibrated wins for a (rosters x players x stats) array, one predict call"""
+        #The registry only reloads when the model file changed, so this stays warm
+        model, feature_cols, alpha, beta = win_model.load_model(self.model_path)
+        X = team_feature_matrix(values, STAT_NAMES, feature_cols)
+        with tracing.span("service.predict", rows=len(X)):
+            raw = model.predict(pd.DataFrame(X, columns=feature_cols))
+        return np.clip(alpha + beta * raw, 0.0, 82.0)
+
+    def _swap_wins(self, values: np.ndarray, slot: int, candidate_values: np.ndarray) -> np.ndarray:
+        """Calibrated wins with each candidate row in place of the player at slot (1-based)"""
+        #The four players who stay are aggregated once, every candidate is one row of one predict call
+        model, feature_cols, alpha, beta = win_model.load_model(self.model_path)
+        partial = partial_team_aggregates(np.delete(values, slot - 1, axis=0), STAT_NAMES)
+        X = swap_feature_matrix(partial, candidate_values, STAT_NAMES, feature_cols)
+        with tracing.span("service.predict", rows=len(X)):
+            return np.clip(alpha + beta * model.predict(pd.DataFrame(X, columns=feature_cols)), 0.0, 82.0)
+
+    #---- player stats ----
+
+    def _fetch_values(self, player_id: int) -> np.ndarray:
+        stats = self.get_stats(player_id)
+        if stats is None:
+            raise LookupError(f"No stats for player {player_id}")
+        stats = pd.Series(stats)
+        return np.array(
+            [float(stats[s]) if s in stats.index and pd.notna(stats[s]) else np.nan for s in STAT_NAMES]
+        )
+
+    async def _fetch(self, player_id: int) -> np.ndarray:
+        try:
+            tracing.incr("service_stat_fetches")
+            loop = asyncio.get_running_loop()
+            values = await loop.run_in_executor(self._executor, self._fetch_values, player_id)
+            self._player_values[player_id] = (values, time.time())
+            return values
+        finally:
+            self._inflight.pop(player_id, None)
+
+    async def player_values(self, player_id: int) -> np.ndarray:
+        """A player's stat array, shared with any fetch for the same player already running"""
+        cached = self._cached_values(player_id)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(player_id)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(player_id))
+            self._inflight[player_id] = future
+        else:
+            tracing.incr("service_fetches_deduplicated")
+
+        #shield: one caller disconnecting mustn't cancel the fetch the others are waiting on
+        return await asyncio.shield(future)
+
+    #---- rosters ----
+
+    def resolve_player(self, player) -> dict:
+        """A player name or ID as {"id", "name"}"""
+        if isinstance(player, int) or (isinstance(player, str) and player.isdigit()):
+            return {"id": int(player), "name": str(player)}
+
+        from player_resolver import get_resolver
+        match = get_resolver().resolve(str(player)) if isinstance(player, str) else None
+        if match is None:
+            raise RequestError(f"Player not found: {player}")
+        return {"id": int(match["id"]), "name": match["full_name"]}
+
+    def resolve_roster(self, players) -> List[dict]:
+        """Turns a list of 5 player names or IDs into [{"id", "name"}, ...]"""
+        if not isinstance(players, list) or len(players) != ROSTER_SIZE:
+            raise RequestError(f"A roster needs exactly {ROSTER_SIZE} players")
+        return [self.resolve_player(player) for player in players]
+
+    def parse_rosters(self, body: dict) -> List[tuple]:
+        """(name, roster) pairs from {"players": [...]} or {"rosters": [...]}"""
+        if "players" in body:
+            return [(body.get("name", "roster"), self.resolve_roster(body["players"]))]
+
+        rosters = body.get("rosters")
+        if not isinstance(rosters, list) or not rosters:
+            raise RequestError('Expected "players" or a non-empty "rosters" list')
+
+        parsed = []
+        for i, entry in enumerate(rosters, start=1):
+            if isinstance(entry, dict):
+                parsed.append((str(entry.get("name", f"roster_{i}")), self.resolve_roster(entry.get("players"))))
+            else:
+                parsed.append((f"roster_{i}", self.resolve_roster(entry)))
+        return parsed
+
+    def _cached_values(self, player_id: int) -> Optional[np.ndarray]:
+        cached = self._player_values.get(player_id)
+        if cached is not None and time.time() - cached[1] < self.stats_ttl:
+            return cached[0]
+        return None
+
+    async def roster_values(self, roster: List[dict]) -> np.ndarray:
+        #Warm players are read straight from memory, only the rest wait on fetches
+        rows = [self._cached_values(p["id"]) for p in roster]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            try:
+                fetched = await asyncio.gather(*(self.player_values(roster[i]["id"]) for i in missing))
+            except LookupError as e:
+                raise RequestError(str(e), status=404)
+            for i, row in zip(missing, fetched):
+                rows[i] = row
+        return np.stack(rows)
+
+    async def score_rosters(self, rosters: List[List[dict]]) -> List[float]:
+        if len(rosters) == 1:
+            return [float(await self.batcher.submit(await self.roster_values(rosters[0])))]
+        values = await asyncio.gather(*(self.roster_values(roster) for roster in rosters))
+        wins = await asyncio.gather(*(self.batcher.submit(v) for v in values))
+        return [float(w) for w in wins]
+
+    #---- endpoints ----
+
+    async def predict(self, body: dict) -> dict:
+        named = self.parse_rosters(body)
+        wins = await self.score_rosters([roster for _, roster in named])
+        results = [
+            {"roster": name, "players": [p["name"] for p in roster], "wins": round(w, 2)}
+            for (name, roster), w in zip(named, wins)
+        ]
+        if "players" in body:
+            return results[0]
+        return {"results": results}
+
+    async def compare(self, body: dict) -> dict:
+        named = self.parse_rosters(body)
+        if len(named) < 2:
+            raise RequestError("Compare needs at least two rosters")
+        wins = await self.score_rosters([roster for _, roster in named])
+        return {
+            "baseline": named[0][0],
+            "results": [
+                {"roster": name, "players": [p["name"] for p in roster],
+                 "wins": round(w, 2), "diff_vs_baseline": round(w - wins[0], 2)}
+                for (name, roster), w in zip(named, wins)
+            ],
+        }
+
+    async def explain(self, body: dict) -> dict:
+        from contributions import feature_contributions
+        from visualization import get_top_strengths
+
+        named = self.parse_rosters(body)
+        if len(named) != 1:
+            raise RequestError("Explain takes one roster")
+        top_n = parse_top_n(body, 3)
+        name, roster = named[0]
+
+        values = await self.roster_values(roster)
+        wins = await self.batcher.submit(values)
+
+        model, feature_cols, alpha, beta = win_model.load_model(self.model_path)
+        X = pd.DataFrame(team_feature_matrix(values[np.newaxis], STAT_NAMES, feature_cols), columns=feature_cols)
+        strengths = get_top_strengths(model, feature_cols, X, top_n=top_n)
+        contributions = feature_contributions(model, feature_cols, X, alpha, beta)
+
+        result = {
+            "roster": name,
+            "players": [p["name"] for p in roster],
+            "wins": round(float(wins), 2),
+            "strengths": [{"feature": feature, "importance": float(value)} for feature, value in strengths],
+            "features": {col: float(X.iloc[0][col]) for col in feature_cols},
+        }
+        #How many wins each feature adds or takes away (sums to wins minus the average, before clipping)
+        if contributions is not None:
+            result["baseline_wins"] = round(contributions.attrs["bias"], 2)
+            result["contributions"] = {col: float(contributions.iloc[0][col]) for col in feature_cols}
+        return result
+
+    async def swap(self, body: dict) -> dict:
+        roster = self.resolve_roster(body.get("players"))
+        slot = body.get("slot")
+        if not isinstance(slot, int) or not 1 <= slot <= ROSTER_SIZE:
+            raise RequestError(f'"slot" must be a position from 1 to {ROSTER_SIZE}')
+        candidates = body.get("candidates")
+        if not isinstance(candidates, list) or not candidates:
+            raise RequestError('Expected a non-empty "candidates" list')
+        if len(candidates) > MAX_SWAP_CANDIDATES:
+            raise RequestError(f"At most {MAX_SWAP_CANDIDATES} candidates per request")
+        top_n = parse_top_n(body, None)
+
+        on_roster = {p["id"] for p in roster}
+        candidates = [c for c in map(self.resolve_player, candidates) if c["id"] not in on_roster]
+
+        values = await self.roster_values(roster)
+        current = float(await self.batcher.submit(values))
+
+        #A candidate without stats is reported as skipped instead of failing the sweep
+        fetched = await asyncio.gather(*(self.player_values(c["id"]) for c in candidates), return_exceptions=True)
+        scored = [(c, v) for c, v in zip(candidates, fetched) if not isinstance(v, BaseException)]
+        skipped = [c["name"] for c, v in zip(candidates, fetched) if isinstance(v, BaseException)]
+
+        results = []
+        if scored:
+            loop = asyncio.get_running_loop()
+            wins = await loop.run_in_executor(
+                self._score_executor, self._swap_wins, values, slot, np.stack([v for _, v in scored])
+            )
+
+            order = np.argsort(-wins, kind="stable")[:top_n]
+            results = [
+                {"player": scored[i][0]["name"], "id": scored[i][0]["id"],
+                 "wins": round(float(wins[i]), 2), "win_delta": round(float(wins[i]) - current, 2)}
+                for i in order
+            ]
+
+        return {
+            "players": [p["name"] for p in roster],
+            "replaced": roster[slot - 1]["name"],
+            "wins": round(current, 2),
+            "results": results,
+            "skipped": skipped,
+        }
+
+    def health(self) -> dict:
+        latencies = sorted(self.latencies)
+        report = {"status": "ok", "requests": self.requests, "cached_players": len(self._player_values)}
+        if latencies:
+            report["latency_ms"] = {
+                "p50": 1000 * latencies[len(latencies) // 2],
+                "p99": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            }
+        return report
+
+    async def handle(self, method: str, path: str, body: bytes):
+        """Routes one request, returns (status, JSON-serializable payload)"""
+        if path == "/health":
+            return 200, self.health()
+
+        routes = {"/predict": self.predict, "/compare": self.compare, "/explain": self.explain, "/swap": self.swap}
+        if path not in routes:
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": f"{path} only accepts POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "Request body must be a JSON object"}
+
+        start = time.perf_counter()
+        try:
+            with tracing.span(f"service{path}"):
+                result = await routes[path](payload)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            print(f"ERROR - {path} failed: {e}")
+            return 500, {"error": str(e)}
+
+        self.requests += 1
+        self.latencies.append(time.perf_counter() - start)
+        return 200, result
+
+
+#---- HTTP ----
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+async def _serve_connection(service: PredictionService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+    """Serves requests on one connection until the client closes it (HTTP/1.1 keep-alive)"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, {"error": "Malformed request line"}, False))
+                return
+
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_response(400, {"error": "Malformed Content-Length"}, False))
+                return
+            if length > MAX_BODY:
+                writer.write(_response(413, {"error": "Request body too large"}, False))
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+            status, payload = await service.handle(method, target.split("?", 1)[0], body)
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+
+            if not keep_alive:
+                return
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service: PredictionService, host: str = "127.0.0.1", port: int = 8482):
+    """Starts serving in the running event loop and returns the asyncio server"""
+    return await asyncio.start_server(
+        lambda reader, writer: _serve_connection(service, reader, writer), host, port,
+        backlog=1024,
+    )
+
+
+async def serve(service: PredictionService, host: str = "127.0.0.1", port: int = 8482):
+    server = await start_server(service, host, port)
+    print(f"Serving predictions on http://{host}:{port} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+#---- load test ----
+
+async def _client(host, port, path, body, count, latencies, go: asyncio.Event):
+    reader, writer = await asyncio.open_connection(host, port)
+    #Every client connects before any starts timing, so connection setup isn't measured
+    await go.wait()
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, players: List, concurrency: int = 200,
+                    requests: int = 5000, path: str = "/predict") -> dict:
+    """Fires `requests` requests from `concurrency` keep-alive clients, returns latency percentiles"""
+    body = json.dumps({"players": players}).encode()
+    latencies = []
+    per_client = max(1, requests // concurrency)
+
+    go = asyncio.Event()
+    clients = [
+        asyncio.ensure_future(_client(host, port, path, body, per_client, latencies, go))
+        for _ in range(concurrency)
+    ]
+    await asyncio.sleep(0.5)
+
+    start = time.perf_counter()
+    go.set()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "p95_ms": 1000 * latencies[int(len(latencies) * 0.95)],
+        "max_ms": 1000 * latencies[-1],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediction HTTP service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8482)
+    serve_parser.add_argument("--model", default=win_model.model_path)
+    serve_parser.add_argument("--stats-csv", help="Serve player stats from this CSV (PLAYER_ID index) instead of the NBA API")
+    serve_parser.add_argument("--max-batch", type=int, default=256, help="Most rosters per predict call")
+    serve_parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long a roster waits for others to batch with")
+
+    load_parser = subparsers.add_parser("loadtest", help="Measure latency against a running service")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8482)
+    load_parser.add_argument("--players", nargs=ROSTER_SIZE, required=True, help="Player names or IDs")
+    load_parser.add_argument("--concurrency", type=int, default=200)
+    load_parser.add_argument("--requests", type=int, default=5000)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "loadtest":
+        players = [int(p) if p.isdigit() else p for p in args.players]
+        result = asyncio.run(load_test(args.host, args.port, players, args.concurrency, args.requests))
+        print(json.dumps(result, indent=2))
+        return 0
+
+    get_stats = csv_stats_source(args.stats_csv) if args.stats_csv else None
+    service = PredictionService(args.model, get_stats, args.max_batch, args.max_wait_ms / 1000)
+    service.warm()
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
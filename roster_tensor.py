@@ -0,0 +1,185 @@
+'''
+Compact tensor form of the roster dataset.
+
+data.csv is one wide row per team season (TeamName, Season, Wins and P{i}_NAME,
+P{i}_<stat> for every player slot). RosterTensor holds the same data as:
+
+    values        float32 (teams x players x stats), NaN for padded/missing players
+    mask          bool (teams x players), True where a player fills the slot
+    wins          float32 (teams,)
+    team_codes, season_codes   int codes into team_names / seasons
+    player_codes  int32 (teams x players) codes into player_names, -1 for padding
+
+Any number of player slots works (e.g. 10-man rotations), shorter rosters are
+padded. model.compute_team_features takes a RosterTensor directly, and the
+training matrix and batch predictions are built from one.
+'''
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import (
+    ADVANCED_STATS,
+    FEATURE_STATS,
+    SHOOTING_STATS,
+    compute_team_feature_arrays,
+    count_players,
+)
+
+
+#Stats kept on the stat axis by default, whichever of them the file has
+DEFAULT_STATS = FEATURE_STATS + SHOOTING_STATS + ADVANCED_STATS
+
+#Rows per feature computation step (aggregates are computed in float64 per chunk)
+CHUNK_ROWS = 65_536
+
+
+def _codes(labels):
+    """(int32 codes, categories) for labels, -1 for missing"""
+    categorical = pd.Categorical(labels)
+    return categorical.codes.astype(np.int32), [str(c) for c in categorical.categories]
+
+
+class RosterTensor:
+    """Teams x players x stats array plus mask, wins and categorical codes"""
+
+    def __init__(self, values: np.ndarray, stat_names: Sequence[str], mask: Optional[np.ndarray] = None,
+                 wins: Optional[np.ndarray] = None, team_codes: Optional[np.ndarray] = None,
+                 team_names: Sequence[str] = (), season_codes: Optional[np.ndarray] = None,
+                 seasons: Sequence[str] = (), player_codes: Optional[np.ndarray] = None,
+                 player_names: Sequence[str] = ()):
+        self.values = np.asarray(values, dtype=np.float32)
+        self.stat_names = list(stat_names)
+        self.mask = ~np.isnan(self.values).all(axis=2) if mask is None else np.asarray(mask, dtype=bool)
+        self.wins = None if wins is None else np.asarray(wins, dtype=np.float32)
+        self.team_codes = team_codes
+        self.team_names = list(team_names)
+        self.season_codes = season_codes
+        self.seasons = list(seasons)
+        self.player_codes = player_codes
+        self.player_names = list(player_names)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def n_players(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.values, self.mask, self.wins, self.team_codes, self.season_codes, self.player_codes]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def team_feature_arrays(self) -> Dict[str, np.ndarray]:
+        """Every TEAM_* aggregate, see feature_engine.compute_team_feature_arrays"""
+        if len(self) <= CHUNK_ROWS:
+            return compute_team_feature_arrays(self.values.astype(np.float64), self.stat_names, mask=self.mask)
+
+        parts = [
+            compute_team_feature_arrays(self.values[start:start + CHUNK_ROWS].astype(np.float64), self.stat_names,
+                                        mask=self.mask[start:start + CHUNK_ROWS])
+            for start in range(0, len(self), CHUNK_ROWS)
+        ]
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    def team_features(self) -> pd.DataFrame:
+        """TEAM_* features as a DataFrame (plus Wins when the tensor has them)"""
+        df = pd.DataFrame(self.team_feature_arrays())
+        if self.wins is not None:
+            df.insert(0, "Wins", self.wins.astype(np.float64))
+        return df
+
+
+def load_roster_tensor(data_path: str = "data.csv", stat_names: Optional[Sequence[str]] = None) -> RosterTensor:
+    """
+    Reads a wide roster CSV (like data.csv) straight into a RosterTensor.
+    Stat columns are parsed as float32 and names as categories, so the wide
+    float64/object frame is never built. stat_names defaults to DEFAULT_STATS.
+    """
+    header = list(pd.read_csv(data_path, nrows=0).columns)
+    n_players = count_players(header)
+
+    if stat_names is None:
+        stat_names = [s for s in DEFAULT_STATS if any(f"P{i}_{s}" in header for i in range(1, n_players + 1))]
+    stat_names = list(stat_names)
+
+    stat_cols = [f"P{i}_{s}" for i in range(1, n_players + 1) for s in stat_names if f"P{i}_{s}" in header]
+    name_cols = [f"P{i}_NAME" for i in range(1, n_players + 1) if f"P{i}_NAME" in header]
+    meta_cols = [c for c in ("TeamName", "Season") if c in header]
+    dtypes = {col: np.float32 for col in stat_cols + (["Wins"] if "Wins" in header else [])}
+    dtypes.update({col: "category" for col in name_cols + meta_cols})
+
+    df = pd.read_csv(data_path, usecols=list(dtypes), dtype=dtypes)
+    n_teams = len(df)
+
+    #Slots missing a stat column stay NaN
+    values = np.full((n_teams, n_players, len(stat_names)), np.nan, dtype=np.float32)
+    for i in range(n_players):
+        for j, stat in enumerate(stat_names):
+            col = f"P{i + 1}_{stat}"
+            if col in df.columns:
+                values[:, i, j] = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+
+    mask = ~np.isnan(values).all(axis=2)
+    player_codes, player_names = None, []
+    if name_cols:
+        names = np.full((n_teams, n_players), None, dtype=object)
+        for col in name_cols:
+            i = int(col[1:col.index("_")]) - 1
+            names[:, i] = df[col].astype(object).where(df[col].notna(), None).to_numpy()
+        flat_codes, player_names = _codes(names.ravel())
+        player_codes = flat_codes.reshape(n_teams, n_players)
+        mask |= player_codes >= 0
+        player_codes[~mask] = -1
+
+    team_codes, team_names = _codes(df["TeamName"]) if "TeamName" in df.columns else (None, [])
+    season_codes, seasons = _codes(df["Season"]) if "Season" in df.columns else (None, [])
+
+    return RosterTensor(
+        values, stat_names, mask,
+        wins=df["Wins"].to_numpy(dtype=np.float32) if "Wins" in df.columns else None,
+        team_codes=team_codes, team_names=team_names,
+        season_codes=season_codes, seasons=seasons,
+        player_codes=player_codes, player_names=player_names,
+    )
+
+
+def roster_tensor_from_stats(stat_lines: Iterable[Sequence], stat_names: Optional[Sequence[str]] = None,
+                             player_names: Optional[Iterable[Sequence[str]]] = None) -> RosterTensor:
+    """
+    Builds a RosterTensor from per-roster lists of player stat lines (Series or
+    dicts, e.g. from main.fetch_player_stats). Rosters can have different sizes.
+    Shooting stats are kept when any player has them. Players without them stay
+    NaN, so their EFG/TS is left out of the team aggregates and a roster gets
+    the same features whichever rosters it is batched with.
+    """
+    stat_lines = [list(roster) for roster in stat_lines]
+    n_players = max((len(roster) for roster in stat_lines), default=0)
+
+    def has(stats, stat):
+        value = stats.get(stat) if hasattr(stats, "get") else None
+        return value is not None and pd.notna(value)
+
+    if stat_names is None:
+        stat_names = list(FEATURE_STATS) + [
+            s for s in SHOOTING_STATS if any(has(stats, s) for roster in stat_lines for stats in roster)
+        ]
+
+    values = np.full((len(stat_lines), n_players, len(stat_names)), np.nan, dtype=np.float32)
+    for r, roster in enumerate(stat_lines):
+        for i, stats in enumerate(roster):
+            values[r, i] = [float(stats[s]) if has(stats, s) else np.nan for s in stat_names]
+
+    player_codes, names = None, []
+    if player_names is not None:
+        padded = np.full(values.shape[:2], None, dtype=object)
+        for r, roster in enumerate(player_names):
+            roster = list(roster)
+            padded[r, :len(roster)] = roster
+        flat_codes, names = _codes(padded.ravel())
+        player_codes = flat_codes.reshape(padded.shape)
+
+    return RosterTensor(values, stat_names, player_codes=player_codes, player_names=names)
+
@@ -0,0 +1,212 @@
+'''
+Monte Carlo season simulator.
+
+Every team's predicted win total (one batched predict over all rosters) becomes
+a win probability, and each matchup is settled with log5:
+
+    P(a beats b) = pa * (1 - pb) / (pa * (1 - pb) + pb * (1 - pa))
+
+An 82-game schedule is a (teams x teams) game-count matrix, so a whole season is
+one binomial draw per pair of teams instead of a Python loop over games.
+Seasons are simulated in chunks: every chunk has its own random stream spawned
+from one SeedSequence, so memory stays at one chunk and the results are the
+same for a given seed no matter how many processes run the chunks. Each chunk
+only returns sums (wins, squared wins, win and seed histograms).
+
+Seeding follows the NBA format per conference: seeds 1-6 make the playoffs,
+7-10 go to the play-in (scaled to the conference size). Ties are broken at random.
+'''
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+GAMES = 82
+DEFAULT_SEASONS = 100_000
+CHUNK_SEASONS = 5_000
+
+#Out of 15 teams per conference
+PLAYOFF_SEEDS = 6
+PLAY_IN_SEEDS = 4
+
+#Keeps log5 away from certain wins/losses
+MIN_WIN_PCT = 0.02
+
+
+def log5(win_pct: np.ndarray) -> np.ndarray:
+    """(teams x teams) probability that the row team beats the column team"""
+    p = np.clip(np.asarray(win_pct, dtype=float), MIN_WIN_PCT, 1 - MIN_WIN_PCT)
+    a, b = p[:, np.newaxis], p[np.newaxis, :]
+    return a * (1 - b) / (a * (1 - b) + b * (1 - a))
+
+
+def balanced_schedule(n_teams: int, games: int = GAMES) -> np.ndarray:
+    """
+    (teams x teams) symmetric game counts: every pair meets games // (n - 1)
+    times and the remaining games come from rounds of a round-robin (circle
+    method), so each team plays `games` games (one fewer per bye for odd team counts).
+    """
+    if n_teams < 2:
+        raise ValueError("A season needs at least two teams")
+    base, extra = divmod(games, n_teams - 1)
+    schedule = np.full((n_teams, n_teams), base, dtype=np.int64)
+    np.fill_diagonal(schedule, 0)
+
+    #Circle method over an even number of slots, slot n_teams is a bye for odd counts
+    slots = n_teams + n_teams % 2
+    order = list(range(slots))
+    for _ in range(extra):
+        for k in range(slots // 2):
+            a, b = order[k], order[slots - 1 - k]
+            if a < n_teams and b < n_teams:
+                schedule[a, b] += 1
+                schedule[b, a] += 1
+        order = [order[0], order[-1]] + order[1:-1]
+    return schedule
+
+
+def seeding_groups(names: Sequence[str], conferences: Optional[Dict[str, List[str]]] = None) -> Dict[str, np.ndarray]:
+    """Conference name -> team indices; one "League" group when no conferences are given"""
+    if not conferences:
+        return {"League": np.arange(len(names))}
+
+    index = {name: i for i, name in enumerate(names)}
+    groups, seen = {}, set()
+    for conference, members in conferences.items():
+        unknown = [m for m in members if m not in index]
+        if unknown:
+            raise ValueError(f"Conference {conference}: unknown team(s) {', '.join(unknown)}")
+        groups[conference] = np.array([index[m] for m in members], dtype=np.int64)
+        seen.update(members)
+    missing = [name for name in names if name not in seen]
+    if missing:
+        raise ValueError(f"Team(s) without a conference: {', '.join(missing)}")
+    return groups
+
+
+def load_conferences(path: str) -> Dict[str, List[str]]:
+    """Reads {"East": [team, ...], "West": [...]} (team = roster file name without .txt)"""
+    with open(path, "r") as f:
+        return {str(k): [str(t) for t in v] for k, v in json.load(f).items()}
+
+
+def seed_cutoffs(group_size: int):
+    """(playoff seeds, play-in seeds) for a conference of group_size teams"""
+    playoff = max(1, round(group_size * PLAYOFF_SEEDS / 15))
+    play_in = min(group_size - playoff, round(group_size * PLAY_IN_SEEDS / 15))
+    return playoff, play_in
+
+
+def _simulate_chunk(seed_seq, n_seasons, pair_a, pair_b, pair_games, pair_prob, n_teams, groups, games=GAMES):
+    """Simulates n_seasons seasons and returns their aggregates"""
+    rng = np.random.default_rng(seed_seq)
+
+    #(seasons x pairs) wins of the first team of each pair
+    a_wins = rng.binomial(pair_games, pair_prob, size=(n_seasons, len(pair_games))).astype(np.float64)
+
+    #Pair results -> team totals with two (pairs x teams) incidence matrices
+    first = np.zeros((len(pair_games), n_teams))
+    first[np.arange(len(pair_games)), pair_a] = 1.0
+    second = np.zeros_like(first)
+    second[np.arange(len(pair_games)), pair_b] = 1.0
+    wins = np.rint(a_wins @ first + (pair_games - a_wins) @ second).astype(np.int64)
+
+    max_group = max(len(members) for members in groups)
+    seed_counts = np.zeros((n_teams, max_group), dtype=np.int64)
+    #Random fraction < 1 only reorders teams with equal wins
+    tiebreak = wins + rng.random((n_seasons, n_teams))
+    for members in groups:
+        order = np.argsort(-tiebreak[:, members], axis=1)
+        seeds = np.empty_like(order)
+        np.put_along_axis(seeds, order, np.arange(len(members)), axis=1)
+        for j, team in enumerate(members):
+            seed_counts[team] += np.bincount(seeds[:, j], minlength=max_group)
+
+    #Win histogram over 0..games (games = the schedule length)
+    win_counts = np.zeros((n_teams, games + 1), dtype=np.int64)
+    for team in range(n_teams):
+        win_counts[team] = np.bincount(np.minimum(wins[:, team], games), minlength=games + 1)
+
+    return wins.sum(axis=0), (wins.astype(np.float64) ** 2).sum(axis=0), win_counts, seed_counts
+
+
+def simulate_seasons(expected_wins: Sequence[float], names: Sequence[str],
+                     conferences: Optional[Dict[str, List[str]]] = None, n_seasons: int = DEFAULT_SEASONS,
+                     seed: int = 0, workers: int = 1, chunk_seasons: int = CHUNK_SEASONS, games: int = GAMES):
+    """
+    Simulates n_seasons seasons for teams with the given expected win totals.
+
+    Returns (standings, seed_distribution) DataFrames: standings has one row per
+    team with mean/sd/p10/p90 wins and playoff, play-in and top-seed odds,
+    seed_distribution the share of seasons each team finished at each seed of
+    its conference. The same seed gives the same results for any workers.
+    """
+    import pandas as pd
+
+    names = list(names)
+    n_teams = len(names)
+    groups = seeding_groups(names, conferences)
+
+    probs = log5(np.asarray(expected_wins, dtype=float) / games)
+    schedule = balanced_schedule(n_teams, games)
+    pair_a, pair_b = np.nonzero(np.triu(schedule))
+    pair_games = schedule[pair_a, pair_b]
+    pair_prob = probs[pair_a, pair_b]
+
+    sizes = [min(chunk_seasons, n_seasons - start) for start in range(0, n_seasons, chunk_seasons)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (pair_a, pair_b, pair_games, pair_prob, n_teams, list(groups.values()), games)
+
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_simulate_chunk, streams, sizes, *[[a] * len(sizes) for a in args]))
+    else:
+        parts = [_simulate_chunk(stream, size, *args) for stream, size in zip(streams, sizes)]
+
+    win_sum = sum(p[0] for p in parts)
+    win_sq = sum(p[1] for p in parts)
+    win_counts = sum(p[2] for p in parts)
+    seed_counts = sum(p[3] for p in parts)
+
+    mean = win_sum / n_seasons
+    sd = np.sqrt(np.maximum(win_sq / n_seasons - mean ** 2, 0.0))
+    cdf = np.cumsum(win_counts, axis=1) / n_seasons
+    p10 = (cdf < 0.1).sum(axis=1)
+    p90 = (cdf < 0.9).sum(axis=1)
+
+    conference = np.empty(n_teams, dtype=object)
+    playoff = np.zeros(n_teams)
+    play_in = np.zeros(n_teams)
+    for group, members in groups.items():
+        conference[members] = group
+        n_playoff, n_play_in = seed_cutoffs(len(members))
+        shares = seed_counts[members] / n_seasons
+        playoff[members] = shares[:, :n_playoff].sum(axis=1)
+        play_in[members] = shares[:, n_playoff:n_playoff + n_play_in].sum(axis=1)
+
+    #Conference by conference, best projected record first
+    order = np.lexsort((-mean, [list(groups).index(c) for c in conference]))
+
+    standings = pd.DataFrame({
+        "team": names,
+        "conference": conference,
+        "expected_wins": np.round(np.asarray(expected_wins, dtype=float), 2),
+        "mean_wins": np.round(mean, 2),
+        "sd_wins": np.round(sd, 2),
+        "wins_p10": p10,
+        "wins_p90": p90,
+        "top_seed": np.round(seed_counts[:, 0] / n_seasons, 4),
+        "playoffs": np.round(playoff, 4),
+        "play_in": np.round(play_in, 4),
+        "playoffs_or_play_in": np.round(playoff + play_in, 4),
+    }).iloc[order].reset_index(drop=True)
+
+    seed_distribution = pd.DataFrame(
+        np.round(seed_counts / n_seasons, 4),
+        columns=[f"seed_{i + 1}" for i in range(seed_counts.shape[1])],
+    )
+    seed_distribution.insert(0, "conference", conference)
+    seed_distribution.insert(0, "team", names)
+    return standings, seed_distribution.iloc[order].reset_index(drop=True)
@@ -0,0 +1,161 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+import pandas as pd
+
+import tracing
+
+
+#Where the cache lives (override with NBA_STATS_CACHE)
+CACHE_PATH = os.environ.get("NBA_STATS_CACHE", os.path.join(".nba_cache", "player_stats.sqlite"))
+
+#How long a cached stat line counts as fresh (one day)
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def is_offline() -> bool:
+    """Returns True when NBA_OFFLINE is set, meaning we should never call the API"""
+    return os.environ.get("NBA_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _to_json(stats: pd.Series) -> str:
+    """Serialize a stat line (numpy scalars included) to JSON"""
+    return json.dumps(
+        stats.to_dict(),
+        default=lambda value: value.item() if hasattr(value, "item") else str(value),
+    )
+
+
+class PlayerStatsCache:
+    """
+    Persistent SQLite cache of each player's last-season stat line, keyed by player_id.
+
+    - Entries younger than `ttl` seconds are served straight from disk.
+    - Stale entries are served immediately while a background thread refreshes
+      them (stale-while-revalidate), unless that is turned off.
+    - In offline mode only the cache is used and missing players raise LookupError.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 stale_while_revalidate: bool = True, offline: Optional[bool] = None):
+        self.path = path
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.offline = is_offline() if offline is None else offline
+
+        #Player IDs currently being refreshed in the background
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS player_stats ("
+                " player_id INTEGER PRIMARY KEY,"
+                " fetched_at REAL NOT NULL,"
+                " stats TEXT NOT NULL)"
+            )
+
+    def _connect(self):
+        #One short-lived connection per call keeps the cache safe to use from threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def read(self, player_id):
+        """Returns (stats, fetched_at) for a cached player, or None"""
+        with self._connect() as conn:
+            result = conn.execute(
+                "SELECT stats, fetched_at FROM player_stats WHERE player_id = ?",
+                (int(player_id),),
+            ).fetchone()
+
+        if result is None:
+            return None
+
+        stats = pd.Series(json.loads(result[0]), name=int(player_id))
+        return stats, result[1]
+
+    def put(self, player_id, stats: pd.Series, fetched_at: Optional[float] = None):
+        """Store (or overwrite) the stat line for a player"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO player_stats (player_id, fetched_at, stats) VALUES (?, ?, ?)",
+                (int(player_id), fetched_at, _to_json(stats)),
+            )
+
+    def invalidate(self, player_id=None):
+        """Drop one player from the cache, or everything when no ID is given"""
+        with self._connect() as conn:
+            if player_id is None:
+                conn.execute("DELETE FROM player_stats")
+            else:
+                conn.execute("DELETE FROM player_stats WHERE player_id = ?", (int(player_id),))
+
+    def _refresh(self, player_id, fetch: Callable):
+        try:
+            self.put(player_id, fetch(player_id))
+        except Exception as e:
+            #Keep serving the stale copy if the API is throttling us
+            print(f"WARNING - Background refresh failed for player {player_id}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(player_id)
+
+    def _refresh_in_background(self, player_id, fetch: Callable):
+        with self._lock:
+            if player_id in self._refreshing:
+                return
+            self._refreshing.add(player_id)
+
+        threading.Thread(target=self._refresh, args=(player_id, fetch), daemon=True).start()
+
+    def get(self, player_id, fetch: Callable) -> pd.Series:
+        """
+        Returns the stat line for a player, calling fetch(player_id) only when needed.
+        """
+        cached = self.read(player_id)
+
+        if cached is not None:
+            stats, fetched_at = cached
+
+            #Fresh hit, or offline and any copy will do
+            if self.offline or time.time() - fetched_at < self.ttl:
+                tracing.incr("cache_hits")
+                return stats
+
+            #Stale hit, serve it now and refresh behind the scenes
+            if self.stale_while_revalidate:
+                tracing.incr("cache_stale_hits")
+                self._refresh_in_background(player_id, fetch)
+                return stats
+
+        if self.offline:
+            raise LookupError(f"No cached stats for player {player_id} (offline mode)")
+
+        #Miss (or stale without revalidation), fetch synchronously
+        tracing.incr("cache_misses")
+        stats = fetch(player_id)
+        self.put(player_id, stats)
+        return stats
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> PlayerStatsCache:
+    """Returns the process-wide cache, creating it on first use"""
+    global _default_cache
+    #Checked again under the lock, fetch threads can all ask for it at once on a cold start
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = PlayerStatsCache()
+    return _default_cache
@@ -1,7 +1,7 @@
 from main import roster_load, predict_custom_roster_wins
 from visualization import visualize_roster_comparison, get_top_strengths
 from model import load_model
-from nba_api.stats.static import players
+from player_resolver import get_resolver
 import pandas as pd
 
 def load_roster_from_file(filename):
@@ -13,12 +13,11 @@ def load_roster_from_file(filename):
                 {"position_num": str(i+1), "name": "X", "id": None}
                 for i in range(5)
             ]
-            for i, line in enumerate(f):
-                player_name = line.strip().lower()
-                name_matches = players.find_players_by_full_name(player_name)
-                if name_matches:
-                    roster[i]["name"] = name_matches[0]["full_name"]
-                    roster[i]["id"] = name_matches[0]["id"]
+            player_names = [line.strip().lower() for line in f]
+            for i, match in enumerate(get_resolver().resolve_many(player_names)):
+                if match:
+                    roster[i]["name"] = match["full_name"]
+                    roster[i]["id"] = match["id"]
     except Exception as e:
         print(f"Error loading {filename}: {e}")
     return roster
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+#The modules live at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_engine import FEATURE_STATS, SHOOTING_STATS
+
+
+@pytest.fixture(scope="session")
+def training_data(tmp_path_factory):
+    """Path of a small synthetic data.csv"""
+    from benchmark import make_synthetic_dataset
+
+    path = tmp_path_factory.mktemp("data") / "data.csv"
+    make_synthetic_dataset(300, seed=1).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def model_path(training_data, tmp_path_factory):
+    """A small GradientBoostingRegressor bundle trained on the synthetic data"""
+    import joblib
+    import model
+
+    X, y, feature_cols = model.load_training_matrix(
+        training_data, cache_dir=str(tmp_path_factory.mktemp("features")), use_cache=False
+    )
+    X = pd.DataFrame(np.asarray(X), columns=feature_cols)
+    est = model.make_estimator("gbr", params={"n_estimators": 40, "max_depth": 2, "learning_rate": 0.1})
+    est.fit(X, y)
+    alpha, beta = model.calibrate(y, est.predict(X))
+
+    path = tmp_path_factory.mktemp("model") / "win_model.pkl"
+    joblib.dump(
+        {"model": est, "features": feature_cols, "alpha": alpha, "beta": beta,
+         "params": {"n_estimators": 40, "max_depth": 2, "learning_rate": 0.1}, "backend": "gbr"},
+        path,
+    )
+    return str(path)
+
+
+@pytest.fixture
+def pool():
+    """12 players with random per-game stats, indexed by player ID 100..111"""
+    rng = np.random.default_rng(7)
+    stats = FEATURE_STATS + SHOOTING_STATS
+    values = rng.uniform(0.5, 30, (12, len(stats))).round(1)
+    df = pd.DataFrame(values, columns=stats, index=pd.Index(range(100, 112), name="PLAYER_ID"))
+    df["PLAYER_NAME"] = [f"Player {i}" for i in df.index]
+    return df
@@ -0,0 +1,138 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_retrieval
+from data_retrieval import PLAYER_STAT_COLS, RateLimiter, build_season_rows, call_with_retries, fetch_seasons
+
+
+class FakeClock:
+    """Stands in for data_retrieval's time module, sleeping only advances the clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+class FlakyEndpoint:
+    """Fails the first `failures` calls, then returns a small table"""
+
+    def __init__(self, failures, clock=None):
+        self.failures = failures
+        self.calls = []
+        self.clock = clock
+
+    def __call__(self, season):
+        self.calls.append(self.clock.now if self.clock else season)
+        if len(self.calls) <= self.failures:
+            raise ConnectionError("read timed out")
+        return pd.DataFrame({"SEASON": [season]})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(data_retrieval, "time", clock)
+    return clock
+
+
+def test_retries_until_the_endpoint_answers(clock, monkeypatch):
+    monkeypatch.setattr(data_retrieval.random, "uniform", lambda low, high: high)
+    endpoint = FlakyEndpoint(failures=3)
+
+    result = call_with_retries(endpoint, "2023-24", retries=4, base_delay=1.0, max_delay=3.0)
+
+    assert result["SEASON"].tolist() == ["2023-24"]
+    assert len(endpoint.calls) == 4
+    #Exponential backoff capped at max_delay (jitter pinned to its upper bound)
+    assert clock.sleeps == [1.0, 2.0, 3.0]
+
+
+def test_gives_up_after_the_last_retry(clock):
+    endpoint = FlakyEndpoint(failures=10)
+    with pytest.raises(ConnectionError):
+        call_with_retries(endpoint, "2023-24", retries=2)
+    assert len(endpoint.calls) == 3
+
+
+def test_rate_limiter_spaces_calls_after_the_burst(clock):
+    limiter = RateLimiter(rate=2.0, burst=3)
+    times = []
+    for _ in range(7):
+        limiter.acquire()
+        times.append(clock.now)
+
+    assert times[:3] == [0.0, 0.0, 0.0]
+    assert np.diff(times[2:]) == pytest.approx([0.5] * 4)
+
+
+def test_fetch_seasons_shares_one_rate_limit(clock, monkeypatch):
+    monkeypatch.setattr(data_retrieval.random, "uniform", lambda low, high: 0.0)
+    seasons = [f"{year}-{str(year + 1)[-2:]}" for year in range(2010, 2016)]
+    teams, players = FlakyEndpoint(failures=2, clock=clock), FlakyEndpoint(failures=0, clock=clock)
+
+    results = fetch_seasons(seasons, workers=3, rate=4.0, team_fetcher=teams, player_fetcher=players)
+
+    assert list(results) == seasons
+    assert all(results[s][0]["SEASON"].tolist() == [s] for s in seasons)
+    #12 successful calls plus 2 retried ones, never more than 4 per second, even at the start
+    calls = sorted(teams.calls + players.calls)
+    assert len(calls) == 14
+    assert all(t >= i / 4.0 - 1e-9 for i, t in enumerate(calls))
+
+
+def iterrows_season_rows(season, team_df, player_df, players_per_roster):
+    """The per-team iterrows loop build_season_rows replaced, as the reference"""
+    rows = []
+    for _, team_row in team_df.iterrows():
+        team_players = player_df[player_df["TEAM_ID"] == team_row["TEAM_ID"]]
+        if team_players.empty:
+            continue
+        starters = team_players.sort_values("MIN", ascending=False).head(players_per_roster)
+
+        row = {"TeamName": team_row["TEAM_NAME"], "Season": season, "Wins": team_row["W"]}
+        for i in range(1, players_per_roster + 1):
+            player = starters.iloc[i - 1] if i <= len(starters) else pd.Series(dtype=object)
+            row[f"P{i}_NAME"] = player.get("PLAYER_NAME", None)
+            for stat in PLAYER_STAT_COLS:
+                row[f"P{i}_{stat}"] = player.get(stat, None)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("players_per_roster", [5, 8])
+def test_season_rows_match_the_iterrows_builder(players_per_roster):
+    rng = np.random.default_rng(11)
+    team_df = pd.DataFrame({
+        "TEAM_ID": [30, 10, 20, 40],
+        "TEAM_NAME": ["Hawks", "Celtics", "Nets", "Hornets"],
+        "W": [41, 64, 32, 21],
+    })
+    #Deep rotations, a 3-man team, a team without players and a player on an unknown team
+    team_ids = [30] * 11 + [10] * 9 + [20] * 3 + [99]
+    player_df = pd.DataFrame(rng.uniform(0, 30, (len(team_ids), len(PLAYER_STAT_COLS))).round(1),
+                             columns=PLAYER_STAT_COLS)
+    player_df["MIN"] = rng.permutation(len(team_ids)) + 10.0
+    player_df["TEAM_ID"] = team_ids
+    player_df["PLAYER_NAME"] = [f"Player {i}" for i in range(len(team_ids))]
+    player_df = player_df.sample(frac=1, random_state=3).reset_index(drop=True)
+
+    rows = build_season_rows("2023-24", team_df, player_df, players_per_roster)
+    expected = iterrows_season_rows("2023-24", team_df, player_df, players_per_roster)
+
+    assert rows["TeamName"].tolist() == ["Hawks", "Celtics", "Nets"]
+    pd.testing.assert_frame_equal(rows.astype(object).where(rows.notna(), None),
+                                  expected.astype(object).where(expected.notna(), None),
+                                  check_dtype=False)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import model
+from benchmark import make_synthetic_dataset
+from feature_engine import FEATURE_STATS, SHOOTING_STATS, player_columns, team_feature_matrix
+from roster_tensor import load_roster_tensor
+
+
+def pandas_team_features(df):
+    """The row-wise pandas features feature_engine replaced, as the reference"""
+    df = df.copy()
+    for i in range(1, 6):
+        fga, fta = df[f"P{i}_FGA"], df[f"P{i}_FTA"]
+        df[f"P{i}_EFG"] = np.where(fga > 0, (df[f"P{i}_FGM"] + 0.5 * df[f"P{i}_FG3M"]) / fga, 0.0)
+        df[f"P{i}_TS"] = np.where(fga + 0.44 * fta > 0, df[f"P{i}_PTS"] / (2 * (fga + 0.44 * fta)), 0.0)
+
+    features = {}
+    for stat in FEATURE_STATS + ["EFG", "TS"]:
+        player_cols = [f"P{i}_{stat}" for i in range(1, 6)]
+        features[f"TEAM_AVG_{stat}"] = df[player_cols].mean(axis=1)
+        features[f"TEAM_TOTAL_{stat}"] = df[player_cols].sum(axis=1)
+        features[f"TEAM_TOP2_{stat}"] = df[player_cols].apply(lambda row: row.nlargest(2).sum(), axis=1)
+        if stat not in ("MIN", "EFG", "TS"):
+            total_min = df[[f"P{i}_MIN" for i in range(1, 6)]].sum(axis=1)
+            features[f"TEAM_AVG_{stat}_P36"] = (df[player_cols].sum(axis=1) / total_min.replace(0, np.nan)) * 36
+    return pd.DataFrame(features).astype(float)
+
+
+@pytest.fixture
+def rosters():
+    """Synthetic rosters with the edge cases: missing stats, no shot attempts, no minutes"""
+    df = make_synthetic_dataset(80, seed=5)
+    df.loc[3, "P2_PTS"] = np.nan
+    df.loc[5, ["P1_AST", "P4_AST"]] = np.nan
+    df.loc[7, ["P3_FGA", "P3_FTA"]] = 0.0
+    df.loc[9, [f"P{i}_MIN" for i in range(1, 6)]] = 0.0
+    df.loc[11, "P5_REB"] = df.loc[11, "P4_REB"]
+    return df
+
+
+def test_compute_team_features_matches_pandas(rosters):
+    expected = pandas_team_features(rosters)
+    features = model.compute_team_features(rosters.copy())
+    pd.testing.assert_frame_equal(features[expected.columns], expected, check_dtype=False)
+
+
+def test_roster_tensor_matches_pandas(rosters, tmp_path):
+    rosters.to_csv(tmp_path / "data.csv", index=False)
+    expected = pandas_team_features(rosters)
+    features = load_roster_tensor(str(tmp_path / "data.csv")).team_features()
+    #The tensor holds float32, the reference works on the float64 CSV values
+    pd.testing.assert_frame_equal(features[expected.columns], expected, check_dtype=False, rtol=1e-5)
+
+
+def test_team_feature_matrix_lines_up_with_the_model_columns(rosters):
+    expected = pandas_team_features(rosters)
+    stats = FEATURE_STATS + SHOOTING_STATS
+    values = rosters[player_columns(5, stats)].to_numpy(dtype=float).reshape(len(rosters), 5, len(stats))
+    #Model column order, plus a column the stats can't produce
+    feature_cols = list(expected.columns[::-1]) + ["TEAM_AVG_PLUS_MINUS"]
+
+    X = team_feature_matrix(values, stats, feature_cols)
+    np.testing.assert_allclose(X[:, :-1], expected[feature_cols[:-1]].to_numpy())
+    assert (X[:, -1] == 0.0).all()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import model
+from flat_ensemble import FlatEnsemble, concat_ensembles, flatten_ensemble, load_flat_model
+
+
+@pytest.fixture(scope="module")
+def matrix(training_data):
+    X, y, feature_cols = model.load_training_matrix(training_data, use_cache=False)
+    return pd.DataFrame(np.asarray(X), columns=feature_cols), np.asarray(y)
+
+
+@pytest.mark.parametrize("backend", ["gbr", "hist"])
+def test_flat_ensemble_matches_model_predict(matrix, backend):
+    X, y = matrix
+    est = model.make_estimator(backend, params={"learning_rate": 0.1, "max_depth": 3})
+    est.fit(X, y)
+
+    flat = FlatEnsemble(flatten_ensemble(est), list(X.columns))
+    np.testing.assert_allclose(flat.predict(X), est.predict(X), rtol=1e-10, atol=1e-10)
+    #A lone row and values outside the training range
+    np.testing.assert_allclose(flat.predict(X.iloc[0].to_numpy()), est.predict(X.iloc[[0]]))
+    np.testing.assert_allclose(flat.predict(X * 3 - 10), est.predict(X * 3 - 10), atol=1e-10)
+
+
+def test_flat_ensemble_follows_missing_values_like_hist(matrix):
+    X, y = matrix
+    X = X.copy()
+    X.iloc[::7, 2] = np.nan
+    est = model.make_estimator("hist", params={"learning_rate": 0.1, "max_depth": 3})
+    est.fit(X, y)
+
+    flat = FlatEnsemble(flatten_ensemble(est), list(X.columns))
+    X_test = X.copy()
+    X_test.iloc[1::5, 4] = np.nan
+    np.testing.assert_allclose(flat.predict(X_test), est.predict(X_test), atol=1e-10)
+
+
+def test_export_matches_the_calibrated_bundle(model_path, matrix, tmp_path):
+    X, _ = matrix
+    est, feature_cols, alpha, beta = model.load_model(model_path)
+
+    flat = load_flat_model(model.export_flat_model(model_path, str(tmp_path / "win_model.npz")))
+    assert flat.feature_cols == list(feature_cols)
+    expected = np.clip(alpha + beta * est.predict(X[feature_cols]), 0.0, 82.0)
+    np.testing.assert_allclose(flat.predict_wins(X[feature_cols]), expected, atol=1e-10)
+
+
+def test_concatenated_members_sum_per_member(matrix):
+    X, y = matrix
+    members = [model.make_estimator("gbr", params={"n_estimators": n, "max_depth": 2, "subsample": 0.8},
+                                    random_state=n) for n in (10, 25)]
+    for est in members:
+        est.fit(X, y)
+
+    arrays = concat_ensembles([flatten_ensemble(est) for est in members])
+    flat = FlatEnsemble(arrays, list(X.columns))
+    bounds = np.cumsum(arrays["member_trees"])[:-1]
+    per_member = flat.evaluate(
+        X, lambda leaves: np.column_stack([part.sum(axis=1) for part in np.split(leaves, bounds, axis=1)])
+    )
+
+    expected = np.column_stack([est.predict(X) for est in members])
+    np.testing.assert_allclose(per_member + arrays["member_base"], expected, atol=1e-10)
+
+
+@pytest.mark.parametrize("backend", ["gbr", "hist"])
+def test_flat_contributions_add_up_to_the_prediction(matrix, backend):
+    from contributions import tree_contributions
+
+    X, y = matrix
+    est = model.make_estimator(backend, params={"learning_rate": 0.1, "max_depth": 3})
+    est.fit(X, y)
+    flat = FlatEnsemble(flatten_ensemble(est), list(X.columns))
+
+    contributions, bias = flat.contributions(X.iloc[:20])
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), est.predict(X.iloc[:20]), atol=1e-8)
+    expected, expected_bias = tree_contributions(est, X.iloc[:20])
+    np.testing.assert_allclose(contributions, expected, atol=1e-8)
+    assert bias == pytest.approx(expected_bias)
+
+
+def test_both_engines_explain_a_roster_the_same_way(model_path, matrix, tmp_path):
+    from visualization import get_top_strengths
+
+    X, _ = matrix
+    est, feature_cols, _, _ = model.load_model(model_path)
+    flat = load_flat_model(model.export_flat_model(model_path, str(tmp_path / "win_model.npz")))
+
+    for row in (0, 7, 42):
+        roster = X[feature_cols].iloc[[row]]
+        sklearn_strengths = get_top_strengths(est, feature_cols, roster, top_n=3)
+        flat_strengths = get_top_strengths(flat, feature_cols, roster, top_n=3)
+        assert [name for name, _ in flat_strengths] == [name for name, _ in sklearn_strengths]
+        np.testing.assert_allclose([v for _, v in flat_strengths], [v for _, v in sklearn_strengths], atol=1e-8)
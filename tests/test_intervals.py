@@ -0,0 +1,21 @@
+import numpy as np
+
+import model
+from benchmark import make_synthetic_dataset
+from intervals import load_intervals
+
+
+def test_p10_p90_covers_about_80_percent_of_held_out_teams(model_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = make_synthetic_dataset(900, seed=3)
+    train, held_out = df.iloc[:600], df.iloc[600:]
+    train.to_csv(tmp_path / "train.csv", index=False)
+    held_out.to_csv(tmp_path / "held_out.csv", index=False)
+
+    path = model.train_intervals(model_path, str(tmp_path / "train.csv"), n_members=8, n_jobs=1)
+    X, y, _ = model.load_training_matrix(str(tmp_path / "held_out.csv"), use_cache=False)
+    bands = load_intervals(path).predict_quantiles(np.asarray(X), (0.1, 0.5, 0.9))
+
+    assert (bands[:, 0] <= bands[:, 1]).all() and (bands[:, 1] <= bands[:, 2]).all()
+    coverage = np.mean((y >= bands[:, 0]) & (y <= bands[:, 2]))
+    assert 0.7 <= coverage <= 0.9
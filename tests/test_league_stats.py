@@ -0,0 +1,59 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import league_stats
+import stats_cache
+from league_stats import SeasonStatsStore
+
+
+def league_table(season):
+    return pd.DataFrame({"PLAYER_ID": [1, 2], "PLAYER_NAME": ["A", "B"], "PTS": [10.0, 20.0]})
+
+
+def test_concurrent_lookups_fetch_the_season_once(tmp_path):
+    calls = []
+
+    def slow_fetch(season):
+        calls.append(season)
+        time.sleep(0.05)
+        return league_table(season)
+
+    store = SeasonStatsStore("2024-25", cache_dir=str(tmp_path), fetch=slow_fetch, offline=False)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        rows = list(executor.map(store.get, [1, 2] * 8))
+
+    assert calls == ["2024-25"]
+    assert [row["PTS"] for row in rows] == [10.0, 20.0] * 8
+
+
+def test_singletons_are_created_once(monkeypatch):
+    created = []
+
+    def counted(cls):
+        def make(*args, **kwargs):
+            created.append(cls)
+            #Widens the window a second thread would slip through without the lock
+            time.sleep(0.02)
+            return object()
+        return make
+
+    monkeypatch.setattr(league_stats, "_default_store", None)
+    monkeypatch.setattr(league_stats, "SeasonStatsStore", counted("store"))
+    monkeypatch.setattr(stats_cache, "_default_cache", None)
+    monkeypatch.setattr(stats_cache, "PlayerStatsCache", counted("cache"))
+
+    start = threading.Barrier(8)
+
+    def both(_):
+        start.wait()
+        return league_stats.get_season_store(), stats_cache.get_default_cache()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(both, range(8)))
+
+    assert sorted(created) == ["cache", "store"]
+    assert len({id(store) for store, _ in results}) == 1
+    assert len({id(cache) for _, cache in results}) == 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from lineup_optimizer import LineupScorer, SwapSweep, optimize_lineups
+
+
+@pytest.mark.parametrize("n_forced", [0, 1, 2, 3, 4, 5])
+def test_exhaustive_and_beam_agree(pool, model_path, n_forced):
+    forced = list(pool.index[:n_forced])
+
+    exhaustive = optimize_lineups(pool, k=3, must_include=forced, model_path=model_path)
+    beam = optimize_lineups(pool, k=3, must_include=forced, method="beam", beam_width=5000,
+                            model_path=model_path)
+
+    assert len(exhaustive) > 0
+    assert set(exhaustive.iloc[0]["player_ids"]) == set(beam.iloc[0]["player_ids"])
+    assert exhaustive.iloc[0]["wins"] == pytest.approx(beam.iloc[0]["wins"])
+    for lineup in exhaustive["player_ids"]:
+        assert set(forced) <= set(lineup)
+
+
+def test_exhaustive_workers_match_single_process(pool, model_path):
+    single = optimize_lineups(pool, k=5, must_include=[100], model_path=model_path)
+    parallel = optimize_lineups(pool, k=5, must_include=[100], workers=2, model_path=model_path)
+    np.testing.assert_allclose(single["wins"], parallel["wins"])
+
+
+@pytest.mark.parametrize("slot", [1, 3, 5])
+def test_swap_sweep_matches_full_rescoring(pool, model_path, slot):
+    roster = [100, 101, 102, 103, 104]
+    pool = pool.copy()
+    pool.loc[110, "AST"] = np.nan
+    sweep = SwapSweep(pool, roster, slot, model_path=model_path)
+    result = sweep.sweep()
+
+    #Every candidate's lineup scored from scratch, in the same slot
+    scorer = LineupScorer(pool, model_path)
+    lineups = [roster[:slot - 1] + [player_id] + roster[slot:] for player_id in result["player_id"]]
+    expected = scorer.score(np.stack([pool.index.get_indexer(lineup) for lineup in lineups]))
+
+    assert sorted(result["player_id"]) == list(range(105, 112))
+    np.testing.assert_allclose(result["wins"], expected, atol=1e-9)
+    assert sweep.current_wins == pytest.approx(scorer.score(pool.index.get_indexer(roster)[np.newaxis])[0])
+    np.testing.assert_allclose(result["win_delta"], expected - sweep.current_wins, atol=1e-9)
+    assert (np.diff(result["wins"]) <= 0).all()
+    assert result["player"].tolist() == [f"Player {i}" for i in result["player_id"]]
+
+
+def test_swap_sweep_top_k_and_candidates(pool, model_path):
+    sweep = SwapSweep(pool, [100, 101, 102, 103, 104], 2, model_path=model_path)
+    full = sweep.sweep()
+
+    top = sweep.sweep(k=3)
+    assert top["player_id"].tolist() == full["player_id"].tolist()[:3]
+
+    #Roster players are never candidates for their own roster
+    chosen = sweep.sweep(candidate_ids=[104, 107, 109])
+    assert sorted(chosen["player_id"]) == [107, 109]
+
+
+def test_build_pool_uses_the_prediction_stats_source(pool, monkeypatch):
+    import main
+    from lineup_optimizer import build_pool
+
+    lookups = []
+
+    def get_player_stats(player_id, source=None):
+        lookups.append((player_id, source))
+        return pool.loc[player_id]
+
+    def per_player_call(player_id):
+        raise AssertionError("build_pool shouldn't call the career endpoint")
+
+    monkeypatch.setattr(main, "get_player_stats", get_player_stats)
+    monkeypatch.setattr(main, "get_last_season_stats", per_player_call)
+
+    built = build_pool([100, 105, 100, 107], source="league")
+    assert sorted(lookups) == [(100, "league"), (105, "league"), (107, "league")]
+    assert list(built.index) == [100, 105, 107]
+    np.testing.assert_allclose(built.to_numpy(), pool.loc[[100, 105, 107], built.columns].to_numpy())
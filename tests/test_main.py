@@ -0,0 +1,21 @@
+import pytest
+
+import main
+import model
+import stats_cache
+
+
+def test_offline_career_source_without_cache_reports_missing_stats(model_path, tmp_path, monkeypatch, capsys):
+    roster = tmp_path / "roster.txt"
+    roster.write_text("LeBron James\nStephen Curry\nKevin Durant\nNikola Jokić\nLuka Dončić\n")
+    monkeypatch.setattr(stats_cache, "_default_cache",
+                        stats_cache.PlayerStatsCache(str(tmp_path / "stats.sqlite"), offline=True))
+    monkeypatch.setattr(main, "load_engine", lambda engine=None: model.load_model(model_path))
+
+    with pytest.raises(SystemExit) as exit_info:
+        main.run_cli(["predict", str(roster), "--source", "career"])
+
+    assert exit_info.value.code == 1
+    err = capsys.readouterr().err
+    assert "ERROR - Player stats unavailable: No cached stats for player" in err
+    assert "Traceback" not in err
@@ -0,0 +1,18 @@
+import time
+
+import numpy as np
+
+import model
+
+
+def test_spent_budget_still_scores_the_first_round(training_data):
+    X, y, _ = model.load_training_matrix(training_data, use_cache=False)
+
+    params, score, rounds, exhausted = model.successive_halving_search(
+        np.asarray(X), np.asarray(y), n_candidates=4, cv=2, deadline=time.perf_counter() - 1,
+    )
+
+    assert exhausted
+    assert len(rounds) == 1 and rounds[0]["candidates"] == 4
+    assert np.isfinite(score) and score == rounds[0]["best_cv_r2"]
+    assert params
@@ -0,0 +1,69 @@
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import model
+
+
+@pytest.mark.parametrize("backend", ["gbr", "hist"])
+def test_update_adds_exactly_the_requested_trees(training_data, tmp_path, monkeypatch, backend):
+    #update_model caches features under the working directory
+    monkeypatch.chdir(tmp_path)
+    old_data = tmp_path / "old.csv"
+    pd.read_csv(training_data).iloc[:200].to_csv(old_data, index=False)
+
+    #A fast-mode model, i.e. with early stopping switched on
+    X, y, feature_cols = model.load_training_matrix(str(old_data), use_cache=False)
+    est = model.make_estimator(backend, early_stopping=True, params={"learning_rate": 0.1, "max_depth": 2})
+    est.fit(pd.DataFrame(np.asarray(X), columns=feature_cols), y)
+    path = tmp_path / "win_model.pkl"
+    joblib.dump({"model": est, "features": feature_cols, "alpha": 0.0, "beta": 1.0,
+                 "params": {}, "backend": backend}, path)
+    old_trees = model._n_trees(est)
+    stopping = est.get_params()["early_stopping" if backend == "hist" else "n_iter_no_change"]
+
+    report = model.update_model(training_data, str(path), extra_estimators=10)
+
+    updated = joblib.load(path)["model"]
+    assert report["trees"] == model._n_trees(updated) == old_trees + 10
+    #Early stopping is restored for later full fits
+    assert updated.get_params()["early_stopping" if backend == "hist" else "n_iter_no_change"] == stopping
+
+    previous = joblib.load(model.previous_model_path(str(path)))["model"]
+    assert model._n_trees(previous) == old_trees
+
+    model.rollback_model(str(path))
+    assert model._n_trees(joblib.load(path)["model"]) == old_trees
+
+
+def test_model_file_never_goes_missing(model_path, training_data, tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "win_model.pkl")
+    shutil.copyfile(model_path, path)
+    trees = model._n_trees(joblib.load(path)["model"])
+
+    moves = []
+    replace = os.replace
+
+    def checked_replace(src, dst):
+        #The model is only ever replaced, never moved away
+        assert os.path.abspath(src) != path
+        replace(src, dst)
+        moves.append(dst)
+        assert os.path.exists(path)
+
+    monkeypatch.setattr(os, "replace", checked_replace)
+
+    model.update_model(training_data, path, extra_estimators=5)
+    assert moves.count(path) == 1
+    model.rollback_model(path)
+    assert model._n_trees(joblib.load(path)["model"]) == trees
+    #A second rollback undoes the first
+    model.rollback_model(path)
+    assert model._n_trees(joblib.load(path)["model"]) == trees + 5
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
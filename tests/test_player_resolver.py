@@ -0,0 +1,60 @@
+import pytest
+
+from player_resolver import PlayerResolver, normalize_name, substituted_name
+
+
+PLAYERS = [
+    {"id": 1, "full_name": "Nikola Jokić", "is_active": True},
+    {"id": 2, "full_name": "Shai Gilgeous-Alexander", "is_active": True},
+    {"id": 3, "full_name": "Don Smith", "is_active": False},
+    {"id": 4, "full_name": "Bobby Jones", "is_active": False},
+    {"id": 5, "full_name": "Jimmy Butler III", "is_active": True},
+    {"id": 6, "full_name": "D'Angelo Russell", "is_active": True},
+    {"id": 7, "full_name": "Stephen Curry", "is_active": True},
+]
+
+
+@pytest.fixture
+def resolver():
+    return PlayerResolver(PLAYERS)
+
+
+def test_normalize_name_folds_accents_and_punctuation():
+    assert normalize_name("Nikola Jokić") == "nikola jokic"
+    assert normalize_name("Shai Gilgeous-Alexander") == "shai gilgeous alexander"
+    assert normalize_name("  D'Angelo   RUSSELL ") == "dangelo russell"
+
+
+@pytest.mark.parametrize("query, player_id", [
+    ("nikola jokic", 1),
+    ("SHAI GILGEOUS ALEXANDER", 2),
+    ("dangelo russell", 6),
+    ("Jimmy Butler", 5),
+    ("curry", 7),
+])
+def test_exact_and_substring_matches(resolver, query, player_id):
+    assert resolver.resolve(query)["id"] == player_id
+
+
+@pytest.mark.parametrize("query", ["John Smith", "Bob Jones", "Nobody At All"])
+def test_unknown_names_are_not_substituted_by_default(resolver, query):
+    assert resolver.resolve(query) is None
+    assert resolver.resolve_many([query, "Stephen Curry"])[0] is None
+
+
+def test_fuzzy_matching_is_opt_in(resolver):
+    assert resolver.resolve("Stephen Cury") is None
+    assert resolver.resolve("Stephen Cury", fuzzy=True)["id"] == 7
+    assert PlayerResolver(PLAYERS, fuzzy=True).resolve("Stephen Cury")["id"] == 7
+
+
+def test_substituted_name(resolver):
+    assert substituted_name("nikola jokic", resolver.resolve("nikola jokic")) is None
+    assert substituted_name("Jimmy Butler", resolver.resolve("Jimmy Butler")) == "Jimmy Butler III"
+    assert substituted_name("Stephen Cury", resolver.resolve("Stephen Cury", fuzzy=True)) == "Stephen Curry"
+    assert substituted_name("John Smith", None) is None
+
+
+def test_find_returns_every_match_in_list_order(resolver):
+    assert [p["id"] for p in resolver.find("jones")] == [4]
+    assert [p["id"] for p in resolver.find("j")] == [1, 4, 5]
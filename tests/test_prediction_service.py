@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from prediction_service import PredictionService, csv_stats_source
+
+
+@pytest.fixture
+def service(model_path, pool, tmp_path):
+    """A service over the test model, with player stats from a CSV (as with --stats-csv)"""
+    stats_csv = tmp_path / "stats.csv"
+    pool.to_csv(stats_csv)
+    service = PredictionService(model_path, csv_stats_source(str(stats_csv)))
+    yield service
+    service.close()
+
+
+def swap_body(**extra):
+    return json.dumps({"players": [100, 101, 102, 103, 104], "slot": 2,
+                       "candidates": list(range(105, 112)), **extra}).encode()
+
+
+@pytest.mark.parametrize("top_n, expected", [(None, 7), (2, 2), ("2", 2)])
+def test_swap_top_n(service, top_n, expected):
+    body = swap_body() if top_n is None else swap_body(top_n=top_n)
+    status, payload = asyncio.run(service.handle("POST", "/swap", body))
+    assert status == 200
+    assert len(payload["results"]) == expected
+
+
+@pytest.mark.parametrize("top_n", ["two", 0, [3], {}])
+def test_swap_rejects_bad_top_n(service, top_n):
+    status, payload = asyncio.run(service.handle("POST", "/swap", swap_body(top_n=top_n)))
+    assert status == 400
+    assert "top_n" in payload["error"]
+
+
+async def request(port, method, path, payload=None):
+    """One HTTP/1.1 request to the local server, returns (status, JSON body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+    payload = json.loads(await reader.readexactly(length))
+    writer.close()
+    return int(head.split(b" ", 2)[1]), payload
+
+
+def test_localhost_predictions_do_not_block_the_loop(service):
+    import time
+    from prediction_service import start_server
+
+    #Every batch takes 300ms, like a predict under heavy load
+    score_batch = service.batcher.score_batch
+    started = []
+
+    def slow_score_batch(values):
+        started.append(time.perf_counter())
+        time.sleep(0.3)
+        return score_batch(values)
+
+    service.batcher.score_batch = slow_score_batch
+
+    async def run():
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            rosters = [[100 + (i + j) % 12 for j in range(5)] for i in range(12)]
+            predictions = asyncio.gather(*(request(port, "POST", "/predict", {"players": r}) for r in rosters))
+            while not started:
+                await asyncio.sleep(0.005)
+
+            #The batch is being scored, the loop still answers right away
+            status, health = await request(port, "GET", "/health")
+            health_seconds = time.perf_counter() - started[0]
+            return await predictions, status, health_seconds
+
+    results, health_status, health_seconds = asyncio.run(run())
+    assert health_status == 200
+    assert health_seconds < 0.2
+    assert all(status == 200 for status, _ in results)
+
+    expected = score_batch(np.stack([asyncio.run(service.roster_values([{"id": int(p)} for p in r["players"]]))
+                                     for _, r in results]))
+    assert [r["wins"] for _, r in results] == [round(float(w), 2) for w in expected]
+
+
+@pytest.mark.parametrize("length, status", [("abc", 400), ("-5", 400), ("", 400), ("99999999999", 413)])
+def test_bad_content_length_gets_an_answer(service, length, status):
+    from prediction_service import start_server
+
+    async def run():
+        server = await start_server(service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Length: {length}\r\n\r\n{{}}".encode())
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+
+    response = asyncio.run(run())
+    assert response.startswith(f"HTTP/1.1 {status} ".encode())
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from feature_engine import FEATURE_STATS, SHOOTING_STATS, effective_fg
+from roster_tensor import roster_tensor_from_stats
+
+
+def stat_line(rng, shooting=True):
+    stats = {s: float(rng.uniform(1, 20)) for s in FEATURE_STATS}
+    if shooting:
+        stats.update(FGM=6.0, FGA=12.0, FG3M=2.0, FG3A=5.0, FTM=3.0, FTA=4.0)
+    return stats
+
+
+def test_players_without_shooting_stats_are_left_out_of_efg():
+    rng = np.random.default_rng(0)
+    rosters = [[stat_line(rng) for _ in range(5)], [stat_line(rng) for _ in range(4)] + [stat_line(rng, False)]]
+
+    tensor = roster_tensor_from_stats(rosters)
+    assert tensor.stat_names == FEATURE_STATS + SHOOTING_STATS
+    features = tensor.team_features()
+    expected = float(effective_fg(6.0, 12.0, 2.0))
+    assert features["TEAM_AVG_EFG"].to_numpy() == pytest.approx([expected, expected])
+    assert features["TEAM_TOTAL_EFG"].to_numpy() == pytest.approx([5 * expected, 4 * expected])
+
+
+def test_a_roster_scores_the_same_alone_and_in_a_mixed_batch(model_path):
+    import model
+
+    est, feature_cols, alpha, beta = model.load_model(model_path)
+
+    def features(rosters):
+        return model.compute_team_features(roster_tensor_from_stats(rosters)).reindex(columns=feature_cols, fill_value=0.0)
+
+    rng = np.random.default_rng(2)
+    complete = [stat_line(rng) for _ in range(5)]
+    partial = [stat_line(rng) for _ in range(3)] + [stat_line(rng, False) for _ in range(2)]
+
+    batch = features([complete, partial])
+    for i, roster in enumerate([complete, partial]):
+        alone = features([roster])
+        np.testing.assert_array_equal(batch.iloc[[i]].to_numpy(), alone.to_numpy())
+        assert alpha + beta * est.predict(batch.iloc[[i]])[0] == pytest.approx(alpha + beta * est.predict(alone)[0])
+
+
+def test_efg_aggregates_over_every_filled_slot():
+    rng = np.random.default_rng(1)
+    #Rosters of different sizes, the padded slot isn't a player
+    tensor = roster_tensor_from_stats([[stat_line(rng) for _ in range(5)], [stat_line(rng) for _ in range(4)]])
+    assert tensor.stat_names == FEATURE_STATS + SHOOTING_STATS
+    assert tensor.mask.tolist() == [[True] * 5, [True] * 4 + [False]]
+
+    features = tensor.team_features()
+    expected = float(effective_fg(6.0, 12.0, 2.0))
+    assert features["TEAM_AVG_EFG"].to_numpy() == pytest.approx([expected, expected])
+    assert features["TEAM_TOTAL_EFG"].to_numpy() == pytest.approx([5 * expected, 4 * expected])
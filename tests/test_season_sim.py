@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from season_sim import balanced_schedule, simulate_seasons
+
+
+@pytest.mark.parametrize("n_teams, games", [(30, 82), (8, 82), (6, 20), (10, 120)])
+def test_every_team_plays_the_schedule_length(n_teams, games):
+    schedule = balanced_schedule(n_teams, games)
+    assert (schedule == schedule.T).all()
+    assert (np.diag(schedule) == 0).all()
+    assert (schedule.sum(axis=1) == games).all()
+
+
+@pytest.mark.parametrize("games", [20, 120])
+def test_win_ranges_follow_the_schedule_length(games):
+    standings, _ = simulate_seasons([0.5 * games] * 5 + [0.9 * games], list("ABCDEF"),
+                                    n_seasons=2000, games=games, chunk_seasons=500)
+    #Mean wins of every team add up to half of all games played
+    assert standings["mean_wins"].sum() == pytest.approx(6 * games / 2, abs=0.05)
+    best = standings.set_index("team").loc["F"]
+    assert best["mean_wins"] <= best["wins_p90"] <= games
+    assert best["wins_p10"] <= best["mean_wins"]
+    if games > 82:
+        #Totals past 82 aren't cut off
+        assert best["wins_p90"] > 82
+
+
+def test_same_seed_same_results_for_any_workers():
+    wins = [55, 50, 45, 41, 38, 30, 25, 20]
+    names = [f"T{i}" for i in range(8)]
+    conferences = {"East": names[::2], "West": names[1::2]}
+
+    single = simulate_seasons(wins, names, conferences, n_seasons=4000, seed=7, chunk_seasons=1000)
+    parallel = simulate_seasons(wins, names, conferences, n_seasons=4000, seed=7, chunk_seasons=1000, workers=2)
+    for one, other in zip(single, parallel):
+        pd.testing.assert_frame_equal(one, other)
+
+    other_seed, _ = simulate_seasons(wins, names, conferences, n_seasons=4000, seed=8, chunk_seasons=1000)
+    assert not other_seed["mean_wins"].equals(single[0]["mean_wins"])
+
+
+def test_stronger_team_has_better_playoff_odds():
+    names = [f"T{i}" for i in range(15)]
+    wins = [62] + [41] * 14
+    standings, seeds = simulate_seasons(wins, names, n_seasons=3000, seed=1)
+    by_team = standings.set_index("team")
+
+    assert by_team.loc["T0", "playoffs"] > 0.95
+    assert by_team.loc["T0", "playoffs"] > by_team.drop("T0")["playoffs"].max()
+    assert by_team.loc["T0", "top_seed"] > 0.5
+    #Seed shares per team add up to one
+    np.testing.assert_allclose(seeds.filter(like="seed_").sum(axis=1), 1.0, atol=1e-3)
@@ -0,0 +1,224 @@
+'''
+Lightweight tracing: timed spans and counters for the hot paths.
+
+Off by default. Turn it on with NBA_TRACE=1 (or tracing.enable(), or the
+--trace flag of the main.py CLI). When disabled, span() hands back a shared
+no-op context manager and incr() returns immediately, so the instrumentation
+costs next to nothing.
+
+    with tracing.span("model.predict", rows=len(X)):
+        model.predict(X)
+    tracing.incr("api_calls")
+
+Results can be printed as a summary table, or written as a JSON trace (Chrome
+trace event format, opens in chrome://tracing or Perfetto) or a
+Prometheus-style text file. Set NBA_TRACE_FILE to write one on exit.
+'''
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+_enabled = _env_flag("NBA_TRACE")
+_lock = threading.Lock()
+_spans: List[dict] = []
+_counters: Dict[str, float] = defaultdict(float)
+_origin = time.perf_counter()
+
+
+class _NullSpan:
+    """What span() returns while tracing is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        record = {
+            "name": self.name,
+            "start": self.start - _origin,
+            "seconds": end - self.start,
+            "thread": threading.get_ident(),
+            "attrs": self.attrs,
+        }
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        with _lock:
+            _spans.append(record)
+        return False
+
+
+def enable(flag: bool = True):
+    """Turns tracing on (or off)"""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attrs):
+    """Context manager that records how long its block took"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def incr(name: str, value: float = 1):
+    """Adds value to a counter (API calls, retries, cache hits, rows processed, ...)"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] += value
+
+
+def reset():
+    """Clears every recorded span and counter"""
+    global _origin
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _origin = time.perf_counter()
+
+
+def summary() -> List[dict]:
+    """Per-span-name call count and total/mean/max seconds, slowest total first"""
+    with _lock:
+        spans = list(_spans)
+
+    grouped = defaultdict(list)
+    for record in spans:
+        grouped[record["name"]].append(record["seconds"])
+
+    rows = [
+        {
+            "span": name,
+            "calls": len(times),
+            "total_seconds": sum(times),
+            "mean_seconds": sum(times) / len(times),
+            "max_seconds": max(times),
+        }
+        for name, times in grouped.items()
+    ]
+    return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+
+def counters() -> Dict[str, float]:
+    with _lock:
+        return dict(_counters)
+
+
+def format_summary() -> str:
+    """Summary table of spans and counters as text"""
+    lines = [f"{'span':<36} {'calls':>7} {'total s':>10} {'mean ms':>10} {'max ms':>10}"]
+    for row in summary():
+        lines.append(
+            f"{row['span']:<36} {row['calls']:>7} {row['total_seconds']:>10.3f} "
+            f"{row['mean_seconds'] * 1000:>10.2f} {row['max_seconds'] * 1000:>10.2f}"
+        )
+    current = counters()
+    if current:
+        lines.append("")
+        lines.append(f"{'counter':<36} {'value':>7}")
+        for name, value in sorted(current.items()):
+            lines.append(f"{name:<36} {value:>7g}")
+    return "\n".join(lines)
+
+
+def to_json() -> dict:
+    """Spans in Chrome trace event format, plus the counters"""
+    with _lock:
+        spans = list(_spans)
+        current = dict(_counters)
+
+    events = [
+        {
+            "name": record["name"],
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["seconds"] * 1e6,
+            "pid": os.getpid(),
+            "tid": record["thread"],
+            "args": {**record["attrs"], **({"error": record["error"]} if "error" in record else {})},
+        }
+        for record in spans
+    ]
+    return {"traceEvents": events, "counters": current, "displayTimeUnit": "ms"}
+
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def to_prometheus() -> str:
+    """Prometheus text exposition format"""
+    lines = [
+        "# HELP nba_span_seconds_total Total seconds spent in each span",
+        "# TYPE nba_span_seconds_total counter",
+    ]
+    rows = summary()
+    for row in rows:
+        lines.append(f'nba_span_seconds_total{{span="{row["span"]}"}} {row["total_seconds"]:.6f}')
+    lines += [
+        "# HELP nba_span_calls_total Number of times each span ran",
+        "# TYPE nba_span_calls_total counter",
+    ]
+    for row in rows:
+        lines.append(f'nba_span_calls_total{{span="{row["span"]}"}} {row["calls"]}')
+    for name, value in sorted(counters().items()):
+        metric = f"nba_{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: Optional[str] = None):
+    """
+    Writes the trace: .json -> JSON trace, .prom/.txt -> Prometheus text,
+    no path -> summary table on stderr.
+    """
+    if not path:
+        print("\n" + format_summary(), file=sys.stderr)
+        return
+
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(to_json(), f, indent=2)
+    else:
+        with open(path, "w") as f:
+            f.write(to_prometheus())
+    print(f"Trace written to {path}", file=sys.stderr)
+
+
+def _report_at_exit():
+    if _enabled and (_spans or _counters):
+        write_report(os.environ.get("NBA_TRACE_FILE"))
+
+
+atexit.register(_report_at_exit)
@@ -1,19 +1,32 @@
 '''
 A bulk of the visualization code was taken from Gemini's code. A bit sloppy, so I shall clean it up later.
 '''
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 import pandas as pd
+from contributions import feature_contributions
+import tracing
 
 
 def get_feature_importance(model, feature_cols, X_sample):
     """
-    Get feature importance for a specific prediction kinda like SHAP-values
-    Returns top features that contribute most to the prediction
+    Get how much each feature moved this roster's prediction (additive per-roster
+    contributions from the model's trees, see contributions.py), largest first.
+    Models without trees fall back to global importances.
     """
-    if hasattr(model, 'feature_importances_'):
+    contributions = feature_contributions(model, feature_cols, X_sample.iloc[[0]])
+    if contributions is not None:
+        importances = contributions.iloc[0].to_numpy()
+    elif hasattr(model, 'feature_importances_'):
         importances = model.feature_importances_
     else:
         importances = np.abs(X_sample.values[0])
@@ -27,13 +40,13 @@ def get_feature_importance(model, feature_cols, X_sample):
 
 def get_top_strengths(model, feature_cols, X_sample, top_n=3):
     """
-    Extract top N strengths (most impactful features) for a roster
+    Extract top N strengths (features that push this roster's prediction up the most)
     Returns list of (feature_name, importance) tuples
     """
     feature_importance = get_feature_importance(model, feature_cols, X_sample)
     
-    # Get top N features
-    top_features = feature_importance[:top_n]
+    # Get top N features, only the ones that help the roster count as strengths
+    top_features = [(name, value) for name, value in feature_importance if value > 0][:top_n]
     
     strengths = []
     for feat_name, importance in top_features:
@@ -45,11 +58,163 @@ def get_top_strengths(model, feature_cols, X_sample, top_n=3):
     return strengths
 
 
+#Style for every comparison figure (first one this matplotlib has)
+STYLE_CHOICES = ['seaborn-v0_8-darkgrid', 'seaborn-darkgrid', 'default']
+
+#Set NBA_HEADLESS=1 on servers: figures are rendered with Agg and never shown
+HEADLESS = os.environ.get("NBA_HEADLESS", "").strip().lower() in ("1", "true", "yes", "on")
+
+# Color scheme - professional NBA colors
+ROSTER_COLORS = ('#1f77b4', '#ff7f0e')  # Blue, Orange
+WINNER_COLOR = '#2ecc71'
+OTHER_COLOR = '#95a5a6'
+
+
+def comparison_style() -> str:
+    """The first available style in STYLE_CHOICES"""
+    for style in STYLE_CHOICES:
+        if style == 'default' or style in plt.style.available:
+            return style
+    return 'default'
+
+
+class ComparisonFigure:
+    """
+    Prebuilt roster comparison figure.
+
+    The layout (axes, bars, reference lines, labels) is built once and update()
+    only changes the data, so rendering many comparisons reuses one figure.
+    With pyplot=False the figure is a bare Agg figure that pyplot never tracks,
+    which is what the headless/batch rendering uses.
+    """
+
+    def __init__(self, n_strengths: int = 3, pyplot: bool = False):
+        self.n_strengths = n_strengths
+
+        with plt.style.context(comparison_style()):
+            if pyplot:
+                self.fig = plt.figure(figsize=(14, 8))
+            else:
+                self.fig = Figure(figsize=(14, 8))
+                FigureCanvasAgg(self.fig)
+            self.fig.patch.set_facecolor('white')
+
+            gs = self.fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3,
+                                       left=0.08, right=0.95, top=0.92, bottom=0.08)
+
+            # ========== Plot 1: Predicted Wins Comparison ==========
+            ax1 = self.fig.add_subplot(gs[0, :])
+            self.win_bars = ax1.bar([0, 1], [0, 0], color=OTHER_COLOR, alpha=0.8, edgecolor='black', linewidth=2)
+            self.win_labels = [
+                ax1.text(bar.get_x() + bar.get_width()/2., 0, '',
+                         ha='center', va='bottom', fontsize=14, fontweight='bold')
+                for bar in self.win_bars
+            ]
+
+            # Add 82-game reference line
+            ax1.axhline(y=41, color='gray', linestyle='--', alpha=0.5, linewidth=1, label='.500 (41 wins)')
+            ax1.axhline(y=50, color='green', linestyle='--', alpha=0.5, linewidth=1, label='Playoff Threshold (~50 wins)')
+
+            ax1.set_xticks([0, 1])
+            ax1.set_ylabel('Predicted Wins (out of 82)', fontsize=12, fontweight='bold')
+            ax1.set_title('Predicted Season Win Totals', fontsize=16, fontweight='bold', pad=5) #THIS ONE
+            ax1.grid(axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
+            ax1.legend(loc='upper right', fontsize=10)
+            ax1.spines['top'].set_visible(False)
+            ax1.spines['right'].set_visible(False)
+            self.wins_ax = ax1
+
+            # ========== Plots 2 and 3: Roster Strengths ==========
+            self.strength_axes = []
+            self.strength_bars = []
+            self.strength_labels = []
+            for col, color in enumerate(ROSTER_COLORS):
+                ax = self.fig.add_subplot(gs[1, col])
+                bars = ax.barh(range(n_strengths), [0] * n_strengths,
+                               color=color, alpha=0.7, edgecolor='black', linewidth=1.5)
+
+                ax.set_yticks(range(n_strengths))
+                ax.set_xlabel('Relative Impact (%)', fontsize=10, fontweight='bold')
+                ax.set_xlim(0, 110)
+                ax.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
+                ax.spines['top'].set_visible(False)
+                ax.spines['right'].set_visible(False)
+
+                labels = [
+                    ax.text(0, bar.get_y() + bar.get_height()/2, '', ha='left', va='center', fontsize=9)
+                    for bar in bars
+                ]
+                self.strength_axes.append(ax)
+                self.strength_bars.append(bars)
+                self.strength_labels.append(labels)
+
+            # Add overall title
+            self.fig.suptitle('NBA Roster Comparison Analysis',
+                              fontsize=18, fontweight='bold', y=0.98)    #THIS ONE
+
+    def _update_strengths(self, col: int, roster_name: str, strengths: List[Tuple[str, float]]):
+        strengths = list(strengths)[:self.n_strengths]
+        strength_values = [s[1] for s in strengths]
+
+        # Normalize for better visualization
+        max_val = max(strength_values) if strength_values else 1
+        names = [s[0] for s in strengths] + [''] * (self.n_strengths - len(strengths))
+        values_norm = [v / max_val * 100 for v in strength_values] + [0] * (self.n_strengths - len(strengths))
+
+        ax = self.strength_axes[col]
+        ax.set_yticklabels(names, fontsize=10)
+        ax.set_title(f'{roster_name}\nTop Strengths', fontsize=12, fontweight='bold')
+
+        for bar, label, name, val in zip(self.strength_bars[col], self.strength_labels[col], names, values_norm):
+            bar.set_width(val)
+            bar.set_visible(bool(name))
+            label.set_position((val + 2, label.get_position()[1]))
+            label.set_text(f'{val:.1f}%' if name else '')
+
+    def update(self, roster1_name: str, roster1_wins: float,
+               roster1_strengths: List[Tuple[str, float]],
+               roster2_name: str, roster2_wins: float,
+               roster2_strengths: List[Tuple[str, float]]):
+        """Swaps in one comparison's data"""
+        wins = [roster1_wins, roster2_wins]
+        colors = [
+            WINNER_COLOR if roster1_wins > roster2_wins else OTHER_COLOR,
+            WINNER_COLOR if roster2_wins > roster1_wins else OTHER_COLOR,
+        ]
+
+        for bar, label, win, color in zip(self.win_bars, self.win_labels, wins, colors):
+            bar.set_height(win)
+            bar.set_facecolor(color)
+            label.set_position((label.get_position()[0], win + 1))
+            label.set_text(f'{win:.1f} wins')
+
+        self.wins_ax.set_xticklabels([roster1_name, roster2_name])
+        self.wins_ax.set_ylim(0, max(82, max(wins) * 1.2))
+
+        self._update_strengths(0, roster1_name, roster1_strengths)
+        self._update_strengths(1, roster2_name, roster2_strengths)
+        return self
+
+    def save(self, target, dpi: int = 300, fmt: Optional[str] = None, tight: bool = True):
+        """
+        Writes the figure to a path, file object or PdfPages. tight=True trims the
+        margins, which costs a second draw of the figure.
+        """
+        bbox = 'tight' if tight else None
+        with tracing.span("plot.savefig", dpi=dpi):
+            if isinstance(target, PdfPages):
+                target.savefig(self.fig, dpi=dpi, bbox_inches=bbox, facecolor='white')
+            else:
+                self.fig.savefig(target, dpi=dpi, format=fmt, bbox_inches=bbox, facecolor='white')
+
+
 def visualize_roster_comparison(roster1_name: str, roster1_wins: float, 
                                 roster1_strengths: List[Tuple[str, float]],
                                 roster2_name: str, roster2_wins: float,
                                 roster2_strengths: List[Tuple[str, float]],
-                                save_path: str = "roster_comparison.png"):
+                                save_path: str = "roster_comparison.png",
+                                dpi: int = 300, fmt: Optional[str] = None,
+                                show: Optional[bool] = None):
     """
     Create a clean, professional visualization comparing two rosters
     
@@ -61,126 +226,98 @@ def visualize_roster_comparison(roster1_name: str, roster1_wins: float,
         roster2_wins: Predicted wins for second roster
         roster2_strengths: List of (strength_name, importance) tuples
         save_path: Path to save the visualization
+        dpi, fmt: Resolution and file format (format defaults to the file extension)
+        show: Open a window with the plot (defaults to True unless NBA_HEADLESS is set)
     """
-    try:
-        plt.style.use('seaborn-v0_8-darkgrid')
-    except:
-        try:
-            plt.style.use('seaborn-darkgrid')
-        except:
-            plt.style.use('default')
-    
-    fig = plt.figure(figsize=(14, 8))
-    fig.patch.set_facecolor('white')
-    
-    gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3, 
-                          left=0.08, right=0.95, top=0.92, bottom=0.08)
-    
-    # Color scheme - professional NBA colors
-    color1 = '#1f77b4'  # Blue
-    color2 = '#ff7f0e'  # Orange
-    win_color1 = '#2ecc71' if roster1_wins > roster2_wins else '#95a5a6'
-    win_color2 = '#2ecc71' if roster2_wins > roster1_wins else '#95a5a6'
-    
-    # ========== Plot 1: Predicted Wins Comparison ==========
-    ax1 = fig.add_subplot(gs[0, :])
-    
-    rosters = [roster1_name, roster2_name]
-    wins = [roster1_wins, roster2_wins]
-    colors = [win_color1, win_color2]
-    
-    bars = ax1.bar(rosters, wins, color=colors, alpha=0.8, edgecolor='black', linewidth=2)
-    
-    # Add value labels on bars
-    for i, (bar, win) in enumerate(zip(bars, wins)):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                f'{win:.1f} wins',
-                ha='center', va='bottom', fontsize=14, fontweight='bold')
-    
-    # Add 82-game reference line
-    ax1.axhline(y=41, color='gray', linestyle='--', alpha=0.5, linewidth=1, label='.500 (41 wins)')
-    ax1.axhline(y=50, color='green', linestyle='--', alpha=0.5, linewidth=1, label='Playoff Threshold (~50 wins)')
-    
-    ax1.set_ylabel('Predicted Wins (out of 82)', fontsize=12, fontweight='bold')
-    ax1.set_title('Predicted Season Win Totals', fontsize=16, fontweight='bold', pad=5) #THIS ONE
-    ax1.set_ylim(0, max(82, max(wins) * 1.2))
-    ax1.grid(axis='y', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax1.legend(loc='upper right', fontsize=10)
-    ax1.spines['top'].set_visible(False)
-    ax1.spines['right'].set_visible(False)
-    
-    # ========== Plot 2: Roster 1 Strengths ==========
-    ax2 = fig.add_subplot(gs[1, 0])
-    
-    strength_names = [s[0] for s in roster1_strengths]
-    strength_values = [s[1] for s in roster1_strengths]
-    
-    # Normalize for better visualization
-    max_val = max(strength_values) if strength_values else 1
-    strength_values_norm = [v / max_val * 100 for v in strength_values]
-    
-    bars2 = ax2.barh(range(len(strength_names)), strength_values_norm, 
-                     color=color1, alpha=0.7, edgecolor='black', linewidth=1.5)
-    
-    ax2.set_yticks(range(len(strength_names)))
-    ax2.set_yticklabels(strength_names, fontsize=10)
-    ax2.set_xlabel('Relative Impact (%)', fontsize=10, fontweight='bold')
-    ax2.set_title(f'{roster1_name}\nTop Strengths', fontsize=12, fontweight='bold')
-    ax2.set_xlim(0, 110)
-    ax2.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax2.spines['top'].set_visible(False)
-    ax2.spines['right'].set_visible(False)
-    
-    # Add value labels
-    for i, (bar, val) in enumerate(zip(bars2, strength_values_norm)):
-        width = bar.get_width()
-        ax2.text(width + 2, bar.get_y() + bar.get_height()/2,
-                f'{val:.1f}%',
-                ha='left', va='center', fontsize=9)
-    
-    # ========== Plot 3: Roster 2 Strengths ==========
-    ax3 = fig.add_subplot(gs[1, 1])
-    
-    strength_names2 = [s[0] for s in roster2_strengths]
-    strength_values2 = [s[1] for s in roster2_strengths]
-    
-    # Normalize for better visualization
-    max_val2 = max(strength_values2) if strength_values2 else 1
-    strength_values_norm2 = [v / max_val2 * 100 for v in strength_values2]
-    
-    bars3 = ax3.barh(range(len(strength_names2)), strength_values_norm2,
-                     color=color2, alpha=0.7, edgecolor='black', linewidth=1.5)
-    
-    ax3.set_yticks(range(len(strength_names2)))
-    ax3.set_yticklabels(strength_names2, fontsize=10)
-    ax3.set_xlabel('Relative Impact (%)', fontsize=10, fontweight='bold')
-    ax3.set_title(f'{roster2_name}\nTop Strengths', fontsize=12, fontweight='bold')
-    ax3.set_xlim(0, 110)
-    ax3.grid(axis='x', alpha=0.3, linestyle='-', linewidth=0.5)
-    ax3.spines['top'].set_visible(False)
-    ax3.spines['right'].set_visible(False)
-    
-    # Add value labels
-    for i, (bar, val) in enumerate(zip(bars3, strength_values_norm2)):
-        width = bar.get_width()
-        ax3.text(width + 2, bar.get_y() + bar.get_height()/2,
-                f'{val:.1f}%',
-                ha='left', va='center', fontsize=9)
-    
-    # Add overall title
-    fig.suptitle('NBA Roster Comparison Analysis', 
-                 fontsize=18, fontweight='bold', y=0.98)    #THIS ONE
-    
+    if show is None:
+        show = not HEADLESS
+
+    figure = ComparisonFigure(n_strengths=max(len(roster1_strengths), len(roster2_strengths), 1), pyplot=show)
+    figure.update(roster1_name, roster1_wins, roster1_strengths,
+                  roster2_name, roster2_wins, roster2_strengths)
+
     # Save figure
-    plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+    figure.save(save_path, dpi=dpi, fmt=fmt)
     print(f"\nVisualization saved to: {save_path}")
     
-    # Display
-    plt.show()
-
-    # fig.savefig("figure.png")
-    # plt.savefig("plot.png")
+    # Display, then free the figure so repeated calls don't pile up
+    if show:
+        plt.show()
+        plt.close(figure.fig)
     
-    return fig
+    return figure.fig
+
+
+def _safe_filename(text: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in str(text)).strip("_")[:40] or "roster"
+
+
+def _comparison_filename(index: int, comparison: dict, fmt: str) -> str:
+    return f"{index:04d}_{_safe_filename(comparison['roster1_name'])}_vs_{_safe_filename(comparison['roster2_name'])}.{fmt}"
+
+
+#Per-process figure template for the process pool
+_worker_figure = {}
+
+
+def _render_chunk(chunk, output_dir, fmt, dpi, n_strengths, tight):
+    """Renders (index, comparison) pairs to files with one reused figure, returns the paths"""
+    figure = _worker_figure.get(n_strengths)
+    if figure is None:
+        figure = _worker_figure[n_strengths] = ComparisonFigure(n_strengths)
+
+    paths = []
+    for index, comparison in chunk:
+        path = os.path.join(output_dir, _comparison_filename(index, comparison, fmt))
+        figure.update(**comparison).save(path, dpi=dpi, fmt=fmt, tight=tight)
+        paths.append(path)
+    return paths
+
+
+def render_comparisons(comparisons: Iterable[dict], output: str, dpi: int = 100, fmt: str = "png",
+                       n_strengths: int = 3, workers: int = 1, chunk_size: int = 25,
+                       tight: bool = False) -> List[str]:
+    """
+    Renders many roster comparisons without opening any windows.
+
+    Each comparison is a dict of visualize_roster_comparison's roster arguments
+    (roster1_name, roster1_wins, roster1_strengths, roster2_name, ...).
+    output ending in .pdf writes one multi-page PDF (one page per comparison),
+    anything else is a directory that gets one image per comparison in `fmt`.
+    Images can be rendered by `workers` processes, each reusing its own figure;
+    comparisons are consumed lazily and only a few chunks are in flight at a
+    time, so memory stays flat however many comparisons there are. Pages keep
+    the full 14x8 canvas unless tight=True (about twice as slow).
+    Returns the paths written.
+    """
+    comparisons = iter(comparisons)
+
+    if output.lower().endswith(".pdf"):
+        #A PDF is one file, so its pages are drawn in this process
+        figure = ComparisonFigure(n_strengths)
+        with PdfPages(output) as pdf:
+            for comparison in comparisons:
+                figure.update(**comparison).save(pdf, dpi=dpi, tight=tight)
+        return [output]
+
+    os.makedirs(output, exist_ok=True)
+    #Lists of (index, comparison), pulled from the input only as they're needed
+    indexed = enumerate(comparisons)
+    numbered = iter(lambda: list(itertools.islice(indexed, chunk_size)), [])
+
+    paths = []
+    if workers <= 1:
+        for chunk in numbered:
+            paths += _render_chunk(chunk, output, fmt, dpi, n_strengths, tight)
+        return paths
 
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in numbered:
+            pending.append(executor.submit(_render_chunk, chunk, output, fmt, dpi, n_strengths, tight))
+            #Only keep a couple of chunks per worker queued
+            if len(pending) >= 2 * workers:
+                paths += pending.popleft().result()
+        while pending:
+            paths += pending.popleft().result()
+    return paths